@@ -1,3 +1,15 @@
 """AgentWire - Multi-session voice web interface for AI coding agents."""
 
 __version__ = "1.0.0"
+
+# Heavy submodules (audio, web server, setup wizard) are only imported on
+# first attribute access so `import agentwire` stays cheap for the CLI.
+_LAZY_SUBMODULES = frozenset({"listen", "onboarding", "server", "voiceclone"})
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SUBMODULES:
+        import importlib
+
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
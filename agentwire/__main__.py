@@ -1,28 +1,34 @@
 """CLI entry point for AgentWire."""
 
-import argparse
-import base64
-import datetime
+from __future__ import annotations
+
 from dataclasses import dataclass
-import importlib.resources
+import functools
 import json
 import os
+import re
 import shlex
 import shutil
-import socket
+import signal
 import subprocess
 import sys
-import tempfile
 import time
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-from dotenv import load_dotenv
+if TYPE_CHECKING:
+    import argparse
 
-# Load .env files (project first, then global config)
-load_dotenv()  # .env in current directory
-load_dotenv(Path.home() / ".agentwire" / ".env")  # Global config
+# Resolved once; Path.home() does an environment/pwd lookup on every call
+HOME = Path.home()
+PROJECTS_DIR = HOME / "projects"
 
-from . import __version__, cli_safety, pane_manager
+from . import __version__
 from .project_config import (
     ProjectConfig,
     SessionType,
@@ -37,7 +43,12 @@ from .roles import RoleConfig, load_roles, merge_roles
 from .worktree import ensure_worktree, parse_session_name, remove_worktree
 
 # Default config directory
-CONFIG_DIR = Path.home() / ".agentwire"
+CONFIG_DIR = HOME / ".agentwire"
+MACHINES_FILE = CONFIG_DIR / "machines.json"
+
+# tmux binary, resolved once so each of the many tmux calls skips the PATH
+# search (falls back to a bare name, and the usual error, if not installed)
+_TMUX = shutil.which("tmux") or "tmux"
 
 
 def _check_tmux_installed() -> bool:
@@ -96,7 +107,7 @@ def _create_opencode_agent_file(role_names: list[str], instructions: str) -> str
     import hashlib
 
     # Create agents directory if needed
-    agents_dir = Path.home() / ".config" / "opencode" / "agents"
+    agents_dir = HOME / ".config" / "opencode" / "agents"
     agents_dir.mkdir(parents=True, exist_ok=True)
 
     # Generate name from sorted role names + content hash
@@ -271,8 +282,12 @@ def check_pip_environment() -> bool:
     return True
 
 
-def generate_certs() -> int:
-    """Generate self-signed SSL certificates."""
+def generate_certs(key_type: str = "ec") -> int:
+    """Generate self-signed SSL certificates.
+
+    Args:
+        key_type: "ec" (ECDSA P-256, default) or "rsa" (RSA-2048)
+    """
     cert_dir = CONFIG_DIR
     cert_dir.mkdir(parents=True, exist_ok=True)
 
@@ -288,33 +303,12 @@ def generate_certs() -> int:
 
     print(f"Generating self-signed certificates in {cert_dir}...")
 
+    from .utils.certs import generate_self_signed_cert
+
     try:
-        subprocess.run(
-            [
-                "openssl",
-                "req",
-                "-x509",
-                "-newkey",
-                "rsa:4096",
-                "-keyout",
-                str(key_path),
-                "-out",
-                str(cert_path),
-                "-days",
-                "365",
-                "-nodes",
-                "-subj",
-                "/CN=localhost",
-            ],
-            check=True,
-            capture_output=True,
-            text=True,
-        )
-    except subprocess.CalledProcessError as e:
-        print(f"Failed to generate certificates: {e.stderr}", file=sys.stderr)
-        return 1
-    except FileNotFoundError:
-        print("openssl not found. Please install OpenSSL.", file=sys.stderr)
+        generate_self_signed_cert(cert_path, key_path, key_type=key_type)
+    except RuntimeError as e:
+        print(f"Failed to generate certificates: {e}", file=sys.stderr)
         return 1
 
     print(f"Created: {cert_path}")
@@ -322,26 +316,123 @@ def generate_certs() -> int:
     return 0
 
 
-def tmux_session_exists(name: str) -> bool:
-    """Check if a tmux session exists (exact match)."""
+@functools.lru_cache(maxsize=1)
+def _tmux_sessions() -> frozenset[str]:
+    """Names of all local tmux sessions, fetched with one list-sessions call.
+
+    Cached so repeated existence checks in one command share a single tmux
+    spawn. Call ``_tmux_sessions.cache_clear()`` after creating or killing
+    a session.
+    """
     result = subprocess.run(
-        ["tmux", "has-session", "-t", f"={name}"],  # = prefix for exact match
+        [_TMUX, "list-sessions", "-F", "#{session_name}"],
         capture_output=True,
+        text=True,
     )
-    return result.returncode == 0
+    if result.returncode != 0:
+        return frozenset()  # No server running
+    return frozenset(result.stdout.splitlines())
+
+
+def tmux_session_exists(name: str) -> bool:
+    """Check if a tmux session exists (exact match)."""
+    return name in _tmux_sessions()
+
+
+def _tmux_new_session(
+    session_name: str,
+    command: str,
+    cwd: str | Path | None = None,
+    **run_kwargs,
+) -> subprocess.CompletedProcess:
+    """Create a detached tmux session and type a command into it.
+
+    Both steps go to tmux in a single invocation (";" chains commands, and
+    send-keys is skipped if new-session fails). The session keeps its shell
+    after the command exits, same as a separate send-keys.
+
+    Args:
+        session_name: Name for the new session
+        command: Shell command to run in the session
+        cwd: Starting directory (tmux default if None)
+        **run_kwargs: Passed to subprocess.run (e.g. check=True)
+    """
+    cmd = [_TMUX, "new-session", "-d", "-s", session_name]
+    if cwd is not None:
+        cmd += ["-c", str(cwd)]
+    cmd += [";", "send-keys", "-t", session_name, command, "Enter"]
+    try:
+        return subprocess.run(cmd, **run_kwargs)
+    finally:
+        _tmux_sessions.cache_clear()
+
+
+def _exec_tmux_attach(session_name: str) -> int:
+    """Replace this process with `tmux attach-session`.
+
+    Python drops out of the process tree for the whole interactive
+    session. Nothing runs after a successful exec (not even atexit), so
+    output is flushed first.
+
+    Returns:
+        1 if tmux couldn't be executed; otherwise never returns.
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        os.execv(_TMUX, ["tmux", "attach-session", "-t", session_name])
+    except OSError as e:
+        print(f"Failed to attach to '{session_name}': {e}", file=sys.stderr)
+    return 1
+
+
+_SHELL_COMMANDS = frozenset({"bash", "zsh", "sh", "dash", "fish", "ksh", "tcsh"})
+
+
+def _wait_for_pane_exit(target: str, timeout: float) -> None:
+    """Wait (up to timeout) for the agent in a tmux pane to exit after /exit.
+
+    Polls the pane's foreground command and returns as soon as it is back
+    to a shell or the pane is gone, instead of always sleeping the full
+    timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = subprocess.run(
+            [_TMUX, "display-message", "-p", "-t", target, "#{pane_current_command}"],
+            capture_output=True,
+            text=True,
+        )
+        command = result.stdout.strip()
+        # Unknown targets print nothing (and may still exit 0)
+        if result.returncode != 0 or not command or command in _SHELL_COMMANDS:
+            return
+        time.sleep(0.05)
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_config_file(path: Path, mtime_ns: int) -> dict:
+    """Parse config.yaml; cached per (path, mtime) so edits are picked up."""
+    try:
+        from .utils.file_io import read_yaml
+        return read_yaml(path)
+    except Exception:
+        return {}
 
 
 def load_config() -> dict:
-    """Load configuration from ~/.agentwire/config.yaml."""
+    """Load configuration from ~/.agentwire/config.yaml.
+
+    The parsed result is reused until the file's mtime changes (e.g. after
+    onboarding rewrites it), so repeated calls cost one stat(). Callers
+    must treat the returned dict as read-only.
+    """
     config_path = CONFIG_DIR / "config.yaml"
-    if config_path.exists():
-        try:
-            import yaml
-            with open(config_path) as f:
-                return yaml.safe_load(f) or {}
-        except Exception:
-            pass
-    return {}
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except OSError:
+        return {}
+    return _parse_config_file(config_path, mtime_ns)
 
 
 def get_source_dir() -> Path:
@@ -382,13 +473,12 @@ def _get_machine_config(machine_id: str) -> dict | None:
         Machine dict with id, host, user, projects_dir, etc.
         None if machine not found.
     """
-    machines_file = CONFIG_DIR / "machines.json"
+    machines_file = MACHINES_FILE
     if not machines_file.exists():
         return None
 
     try:
-        with open(machines_file) as f:
-            machines_data = json.load(f)
+        machines_data = _load_json(machines_file)
     except (json.JSONDecodeError, IOError):
         return None
 
@@ -414,6 +504,33 @@ def _parse_session_target(name: str) -> tuple[str, str | None]:
     return name, None
 
 
+def _remote_new_session_cmd(session_name: str, path: str, agent_cmd: str | None = None) -> str:
+    """Shell command that creates a remote tmux session in path.
+
+    Sends `cd path` (so the agent starts in the right directory) and then
+    agent_cmd, if given. Everything runs as one chained tmux invocation
+    (commands separated by ";"), not a tmux process per step.
+    """
+    # A leading ~/ stays unquoted so the remote shell expands it for -c
+    # and the session's shell expands it for the typed cd
+    if path.startswith("~/"):
+        shell_path = "~/" + shlex.quote(path[2:])
+    else:
+        shell_path = shlex.quote(path)
+    tmux_args = [
+        ";", "send-keys", "-t", session_name, f"cd {shell_path}", "Enter",
+    ]
+    if agent_cmd:
+        tmux_args += [
+            ";", "run-shell", "sleep 0.1",
+            ";", "send-keys", "-t", session_name, agent_cmd, "Enter",
+        ]
+    return (
+        f"tmux new-session -d -s {shlex.quote(session_name)} -c {shell_path} "
+        + shlex.join(tmux_args)
+    )
+
+
 def _run_remote(machine_id: str, command: str) -> subprocess.CompletedProcess:
     """Run command on remote machine via SSH.
 
@@ -469,18 +586,175 @@ def _run_remote(machine_id: str, command: str) -> subprocess.CompletedProcess:
 
 def _get_all_machines() -> list[dict]:
     """Get list of all registered machines from machines.json."""
-    machines_file = CONFIG_DIR / "machines.json"
+    machines_file = MACHINES_FILE
     if not machines_file.exists():
         return []
 
     try:
-        with open(machines_file) as f:
-            machines_data = json.load(f)
-            return machines_data.get("machines", [])
+        return _load_json(machines_file).get("machines", [])
     except (json.JSONDecodeError, IOError):
         return []
 
 
+def _load_json(path: Path):
+    """Load a JSON file with a single read (orjson when available)."""
+    raw = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Replace a file's contents atomically.
+
+    Writes to a hidden per-process temp file in the same directory and
+    renames it over the target, so readers never see a truncated file.
+    No fsync: these are user config files, not a database.
+    """
+    tmp_path = path.with_name(f".{path.name}.tmp.{os.getpid()}")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _dump_json(path: Path, data) -> None:
+    """Write JSON (2-space indent, trailing newline) atomically in one write."""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    else:
+        payload = (json.dumps(data, indent=2) + "\n").encode()
+    _atomic_write_bytes(path, payload)
+
+
+@functools.lru_cache(maxsize=1)
+def _insecure_ssl_context():
+    """SSL context for AgentWire's self-signed certs.
+
+    Built once and without loading the system CA bundle, since
+    verification is disabled anyway.
+    """
+    import ssl
+
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _json_body(data) -> bytes:
+    """Encode a JSON request body compactly (no spaces after separators)."""
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def _http_open(method: str, url: str, body: bytes | None = None, timeout: float = 10):
+    """Send an HTTP(S) request with http.client and return the open response.
+
+    Skips urllib's opener/handler chain; HTTPS uses _insecure_ssl_context().
+    Request bodies are sent as application/json. The caller reads the
+    response (all at once or in chunks) and must close the connection.
+
+    Args:
+        method: HTTP method
+        url: Full URL (http:// or https://)
+        body: Request body, or None for no body
+        timeout: Socket timeout in seconds
+
+    Returns:
+        (connection, response) - HTTP error statuses are returned, not raised
+
+    Raises:
+        OSError: Connection refused, DNS failure, timeout, etc.
+        http.client.HTTPException: Malformed response
+    """
+    import http.client
+    from urllib.parse import urlsplit
+
+    parts = urlsplit(url)
+    if parts.scheme == "https":
+        conn = http.client.HTTPSConnection(parts.netloc, timeout=timeout, context=_insecure_ssl_context())
+    else:
+        conn = http.client.HTTPConnection(parts.netloc, timeout=timeout)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    headers = _JSON_HEADERS if body is not None else {}
+    try:
+        conn.request(method, path, body=body, headers=headers)
+        return conn, conn.getresponse()
+    except BaseException:
+        conn.close()
+        raise
+
+
+def _http_request(method: str, url: str, body: bytes | None = None, timeout: float = 10) -> tuple[int, bytes]:
+    """Make a single HTTP(S) request and read the whole response.
+
+    See _http_open() for arguments and exceptions.
+
+    Returns:
+        (status code, response body)
+    """
+    conn, response = _http_open(method, url, body, timeout)
+    try:
+        return response.status, response.read()
+    finally:
+        conn.close()
+
+
+# Linux players that read a WAV from stdin, in order of preference
+_STDIN_AUDIO_PLAYERS = (
+    ["aplay"],
+    ["paplay"],
+    ["play", "-t", "wav", "-"],
+    ["ffplay", "-nodisp", "-autoexit", "-loglevel", "error", "-"],
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _stdin_audio_player() -> list[str] | None:
+    """First installed player from _STDIN_AUDIO_PLAYERS, resolved via PATH once."""
+    for cmd in _STDIN_AUDIO_PLAYERS:
+        path = shutil.which(cmd[0])
+        if path:
+            return [path, *cmd[1:]]
+    return None
+
+
+def _play_wav_stream(stream) -> bool:
+    """Play WAV audio by piping it into a Linux audio player's stdin.
+
+    Playback starts with the first chunk and no temp file is written.
+
+    Args:
+        stream: Binary file-like object to read from (e.g. an HTTP response)
+
+    Returns:
+        True if a player ran, False if none is installed.
+
+    Raises:
+        subprocess.CalledProcessError: If the player exits with an error.
+    """
+    cmd = _stdin_audio_player()
+    if cmd is None:
+        return False
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    try:
+        shutil.copyfileobj(stream, proc.stdin, 64 * 1024)
+        proc.stdin.close()
+    except BrokenPipeError:
+        pass  # Player exited early; its exit status says why
+    if proc.wait() != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+    return True
+
+
 def _output_json(data: dict) -> None:
     """Output JSON to stdout."""
     print(json.dumps(data, indent=2))
@@ -523,21 +797,8 @@ def _notify_portal_sessions_changed():
     This is fire-and-forget - failures are silently ignored since the portal
     may not be running.
     """
-    import ssl
-    import urllib.request
-
     try:
-        # Create SSL context that doesn't verify (localhost self-signed cert)
-        ctx = ssl.create_default_context()
-        ctx.check_hostname = False
-        ctx.verify_mode = ssl.CERT_NONE
-
-        req = urllib.request.Request(
-            "https://localhost:8765/api/sessions/refresh",
-            method="POST",
-            data=b"",
-        )
-        urllib.request.urlopen(req, timeout=2, context=ctx)
+        _http_request("POST", "https://localhost:8765/api/sessions/refresh", b"", timeout=2)
     except Exception:
         # Portal may not be running - that's fine
         pass
@@ -556,8 +817,7 @@ def _start_portal_local(args) -> int:
     if tmux_session_exists(session_name):
         print(f"Portal already running in tmux session '{session_name}'")
         print("Attaching... (Ctrl+B D to detach)")
-        subprocess.run(["tmux", "attach-session", "-t", session_name])
-        return 0
+        return _exec_tmux_attach(session_name)
 
     # Ensure required tunnels are up before starting portal
     ctx = NetworkContext.from_config()
@@ -603,24 +863,18 @@ def _start_portal_local(args) -> int:
     if args.config:
         cmd_parts.extend(["--config", str(args.config)])
 
-    server_cmd = " ".join(cmd_parts)
+    server_cmd = shlex.join(cmd_parts)
 
     # Create tmux session and start server
     mode = "dev mode (from source)" if getattr(args, 'dev', False) else "installed"
     print(f"Starting AgentWire portal ({mode}) in tmux session '{session_name}'...")
-    subprocess.run([
-        "tmux", "new-session", "-d", "-s", session_name,
-    ])
-    subprocess.run([
-        "tmux", "send-keys", "-t", session_name, server_cmd, "Enter",
-    ])
+    _tmux_new_session(session_name, server_cmd)
 
     # Install global tmux hooks for portal sync
     _install_global_tmux_hooks()
 
     print("Portal started. Attaching... (Ctrl+B D to detach)")
-    subprocess.run(["tmux", "attach-session", "-t", session_name])
-    return 0
+    return _exec_tmux_attach(session_name)
 
 
 def _start_portal_remote(ssh_target: str, machine_id: str, args) -> int:
@@ -658,10 +912,10 @@ def _start_portal_remote(ssh_target: str, machine_id: str, args) -> int:
     if args.no_stt:
         cmd_parts.append("--no-stt")
 
-    server_cmd = " ".join(cmd_parts)
+    server_cmd = shlex.join(cmd_parts)
 
     # Start remotely in tmux
-    remote_cmd = f"tmux new-session -d -s {session_name} && tmux send-keys -t {session_name} {shlex.quote(server_cmd)} Enter"
+    remote_cmd = shlex.join(["tmux", "new-session", "-d", "-s", session_name, ";", "send-keys", "-t", session_name, server_cmd, "Enter"])
     mode = "dev mode" if getattr(args, 'dev', False) else "installed"
     print(f"Starting AgentWire portal ({mode}) on {machine_id}...")
 
@@ -717,16 +971,9 @@ def _stop_portal_remote(ssh_target: str, machine_id: str) -> int:
 
 def _check_portal_health(url: str, timeout: int = 2) -> bool:
     """Check if portal is responding at URL."""
-    import ssl
-    import urllib.request
-
     try:
-        ctx = ssl.create_default_context()
-        ctx.check_hostname = False
-        ctx.verify_mode = ssl.CERT_NONE
-
-        req = urllib.request.urlopen(f"{url}/health", context=ctx, timeout=timeout)
-        return req.status == 200
+        status, _ = _http_request("GET", f"{url}/health", timeout=timeout)
+        return status == 200
     except Exception:
         return False
 
@@ -783,7 +1030,8 @@ def cmd_portal_stop(args) -> int:
             print("Portal is not running.")
             return 1
 
-        subprocess.run(["tmux", "kill-session", "-t", session_name])
+        subprocess.run([_TMUX, "kill-session", "-t", session_name])
+        _tmux_sessions.cache_clear()
         print("Portal stopped.")
         return 0
 
@@ -939,8 +1187,7 @@ def _start_tts_local(args, venv_override: str | None = None) -> int:
     if tmux_session_exists(session_name):
         print(f"TTS server already running in tmux session '{session_name}'")
         print("Attaching... (Ctrl+B D to detach)")
-        subprocess.run(["tmux", "attach-session", "-t", session_name])
-        return 0
+        return _exec_tmux_attach(session_name)
 
     # Get TTS config
     config = load_config()
@@ -975,16 +1222,10 @@ def _start_tts_local(args, venv_override: str | None = None) -> int:
     )
 
     print(f"Starting TTS server on {host}:{port} (backend: {backend}, venv: {venv})...")
-    subprocess.run([
-        "tmux", "new-session", "-d", "-s", session_name,
-    ])
-    subprocess.run([
-        "tmux", "send-keys", "-t", session_name, tts_cmd, "Enter",
-    ])
+    _tmux_new_session(session_name, tts_cmd)
 
     print("TTS server started. Attaching... (Ctrl+B D to detach)")
-    subprocess.run(["tmux", "attach-session", "-t", session_name])
-    return 0
+    return _exec_tmux_attach(session_name)
 
 
 def _start_tts_remote(ssh_target: str, machine_id: str, args) -> int:
@@ -1021,7 +1262,7 @@ def _start_tts_remote(ssh_target: str, machine_id: str, args) -> int:
     server_cmd = f"agentwire tts serve --host {host} --port {port}{backend_flag}"
 
     # Start remotely in tmux
-    remote_cmd = f"tmux new-session -d -s {session_name} && tmux send-keys -t {session_name} {shlex.quote(server_cmd)} Enter"
+    remote_cmd = shlex.join(["tmux", "new-session", "-d", "-s", session_name, ";", "send-keys", "-t", session_name, server_cmd, "Enter"])
     print(f"Starting TTS server on {machine_id}...")
 
     result = subprocess.run(
@@ -1080,11 +1321,11 @@ def _check_tts_health(url: str, timeout: int = 2) -> tuple[bool, list[str] | Non
     Returns:
         (is_healthy, voices_list or None)
     """
-    import urllib.request
-
     try:
-        req = urllib.request.urlopen(f"{url}/voices", timeout=timeout)
-        voices = json.loads(req.read().decode())
+        status, body = _http_request("GET", f"{url}/voices", timeout=timeout)
+        if status != 200:
+            return False, None
+        voices = json.loads(body)
         if isinstance(voices, list):
             return True, voices
         return True, None
@@ -1155,7 +1396,8 @@ def cmd_tts_stop(args) -> int:
             print("TTS server is not running.")
             return 1
 
-        subprocess.run(["tmux", "kill-session", "-t", session_name])
+        subprocess.run([_TMUX, "kill-session", "-t", session_name])
+        _tmux_sessions.cache_clear()
         print("TTS server stopped.")
         return 0
 
@@ -1191,7 +1433,8 @@ def cmd_tts_restart(args) -> int:
         # Stop if running
         if tmux_session_exists(session_name):
             print("Stopping TTS server...")
-            subprocess.run(["tmux", "kill-session", "-t", session_name])
+            subprocess.run([_TMUX, "kill-session", "-t", session_name])
+            _tmux_sessions.cache_clear()
             time.sleep(1)
 
         # Start with new venv
@@ -1383,14 +1626,8 @@ def cmd_stt_start(args) -> int:
     python_path = agentwire_dir / ".venv" / "bin" / "python"
     cmd = f"cd {agentwire_dir} && WHISPER_MODEL={model} WHISPER_DEVICE=cpu STT_PORT={port} STT_HOST={host} {python_path} -m agentwire.stt.stt_server"
 
-    # Create tmux session
-    subprocess.run([
-        "tmux", "new-session", "-d", "-s", session_name, "-c", str(agentwire_dir)
-    ], check=True)
-
-    subprocess.run([
-        "tmux", "send-keys", "-t", session_name, cmd, "Enter"
-    ], check=True)
+    # Create tmux session and start server
+    _tmux_new_session(session_name, cmd, cwd=agentwire_dir, check=True)
 
     print(f"STT server starting in tmux session '{session_name}'")
     print(f"  Model: {model}")
@@ -1428,7 +1665,8 @@ def cmd_stt_stop(args) -> int:
         print("STT server is not running.")
         return 1
 
-    subprocess.run(["tmux", "kill-session", "-t", session_name])
+    subprocess.run([_TMUX, "kill-session", "-t", session_name])
+    _tmux_sessions.cache_clear()
     print("STT server stopped.")
     return 0
 
@@ -1564,19 +1802,19 @@ def _install_global_tmux_hooks() -> None:
 
     # Check existing hooks
     result = subprocess.run(
-        ["tmux", "show-hooks", "-g"],
+        [_TMUX, "show-hooks", "-g"],
         capture_output=True,
         text=True,
     )
     existing = result.stdout
 
+    # Missing hooks are collected and set in one tmux invocation at the end
+    missing: list[tuple[str, str]] = []
+
     # Helper to install hook if not present
     def install_hook(hook_name: str, hook_cmd: str) -> None:
         if hook_name not in existing or agentwire_path not in existing:
-            subprocess.run(
-                ["tmux", "set-hook", "-g", hook_name, hook_cmd],
-                capture_output=True,
-            )
+            missing.append((hook_name, hook_cmd))
 
     # Session lifecycle hooks
     # All hooks suppress output and exit 0 (|| true) to avoid tmux showing error messages
@@ -1618,6 +1856,28 @@ def _install_global_tmux_hooks() -> None:
         f'run-shell -b "{agentwire_path} notify window_activity -s #{{session_name}} >/dev/null 2>&1 || true"'
     )
 
+    if not missing:
+        return
+    set_hooks: list[str] = []
+    for hook_name, hook_cmd in missing:
+        if set_hooks:
+            set_hooks.append(";")
+        set_hooks.extend(["set-hook", "-g", hook_name, hook_cmd])
+    result = subprocess.run(
+        [_TMUX, *set_hooks],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    if result.returncode != 0:
+        # tmux stops a ";" chain at the first failing command; set each
+        # hook on its own so one bad hook doesn't drop the rest
+        for hook_name, hook_cmd in missing:
+            subprocess.run(
+                [_TMUX, "set-hook", "-g", hook_name, hook_cmd],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+
 
 def _install_pane_hooks(session_name: str, pane_index: int) -> None:
     """Install tmux hooks to notify portal of pane state changes.
@@ -1632,7 +1892,7 @@ def _install_pane_hooks(session_name: str, pane_index: int) -> None:
 
     # Check existing hooks
     result = subprocess.run(
-        ["tmux", "show-hooks", "-t", session_name],
+        [_TMUX, "show-hooks", "-t", session_name],
         capture_output=True,
         text=True,
     )
@@ -1645,8 +1905,9 @@ def _install_pane_hooks(session_name: str, pane_index: int) -> None:
     if "after-kill-pane" not in existing:
         hook_cmd = f'run-shell -b "{agentwire_path} notify pane_died -s {session_name} >/dev/null 2>&1 || true"'
         subprocess.run(
-            ["tmux", "set-hook", "-t", session_name, "after-kill-pane", hook_cmd],
-            capture_output=True,
+            [_TMUX, "set-hook", "-t", session_name, "after-kill-pane", hook_cmd],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
 
     # Install pane-focus-in hook for active pane tracking
@@ -1655,8 +1916,9 @@ def _install_pane_hooks(session_name: str, pane_index: int) -> None:
     if "pane-focus-in" not in existing:
         hook_cmd = f'run-shell -b "{agentwire_path} notify pane_focused -s {session_name} --pane-id #{{pane_id}} >/dev/null 2>&1 || true"'
         subprocess.run(
-            ["tmux", "set-hook", "-t", session_name, "pane-focus-in", hook_cmd],
-            capture_output=True,
+            [_TMUX, "set-hook", "-t", session_name, "pane-focus-in", hook_cmd],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
 
 
@@ -1668,7 +1930,7 @@ def _get_current_tmux_session() -> str | None:
 
     try:
         result = subprocess.run(
-            ["tmux", "display-message", "-p", "#S"],
+            [_TMUX, "display-message", "-p", "#S"],
             capture_output=True,
             text=True,
             timeout=5,
@@ -1733,7 +1995,7 @@ def _infer_session_from_path() -> str | None:
     ~/projects/myapp-worktrees/feature -> myapp/feature
     """
     cwd = Path.cwd()
-    projects_dir = Path.home() / "projects"
+    projects_dir = PROJECTS_DIR
 
     try:
         rel = cwd.relative_to(projects_dir)
@@ -1763,6 +2025,7 @@ def _check_portal_connections(session: str, portal_url: str) -> tuple[bool, str]
         - has_connections: True if there are connections (audio should go to portal)
         - actual_session_name: The session name that has connections (may include @machine)
     """
+    import socket
     import ssl
     import urllib.request
 
@@ -1838,6 +2101,8 @@ def _local_say_runpod_api(
     tts_config: dict,
 ) -> int:
     """Generate TTS via RunPod serverless API and play locally."""
+    import base64
+    import io
     import tempfile
     import urllib.request
 
@@ -1862,7 +2127,7 @@ def _local_say_runpod_api(
     }
 
     try:
-        data = json.dumps(payload).encode()
+        data = _json_body(payload)
         req = urllib.request.Request(
             endpoint_url,
             data=data,
@@ -1894,22 +2159,17 @@ def _local_say_runpod_api(
 
             audio_data = base64.b64decode(audio_b64)
 
-        # Save to temp file and play
+        if sys.platform == "linux":
+            _play_wav_stream(io.BytesIO(audio_data))
+            return 0
+
+        # afplay can't read stdin: save to temp file and play
         with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
             f.write(audio_data)
             temp_path = f.name
 
-        # Play audio (cross-platform)
         if sys.platform == "darwin":
             subprocess.run(["afplay", temp_path], check=True)
-        elif sys.platform == "linux":
-            # Try various players
-            for player in ["aplay", "paplay", "play"]:
-                try:
-                    subprocess.run([player, temp_path], check=True)
-                    break
-                except FileNotFoundError:
-                    continue
         else:
             print(f"Audio saved to: {temp_path}")
             return 0
@@ -1997,6 +2257,8 @@ def cmd_alert(args) -> int:
         agentwire alert "Worker 1 completed task"
         agentwire alert --to agentwire "Build finished"
     """
+    from . import pane_manager
+
     text = " ".join(args.text) if args.text else ""
 
     if not text:
@@ -2059,6 +2321,8 @@ def _handle_voice_notifications(text: str, voice: str, args, session: str | None
         args: Command args (for --notify and --no-auto-notify flags)
         session: Current session name
     """
+    from . import pane_manager
+
     notify_session = getattr(args, 'notify', None)
     no_auto_notify = getattr(args, 'no_auto_notify', False)
 
@@ -2099,7 +2363,8 @@ def _restart_tts_local_for_venv(venv: str, backend: str) -> bool:
 
     # Stop existing server
     if tmux_session_exists(session_name):
-        subprocess.run(["tmux", "kill-session", "-t", session_name], capture_output=True)
+        subprocess.run([_TMUX, "kill-session", "-t", session_name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        _tmux_sessions.cache_clear()
         time.sleep(1)
 
     # Find source directory and venv
@@ -2122,8 +2387,7 @@ def _restart_tts_local_for_venv(venv: str, backend: str) -> bool:
         f"python -m agentwire tts serve --host {host} --port {port} --backend {backend} --venv {venv}"
     )
 
-    subprocess.run(["tmux", "new-session", "-d", "-s", session_name], capture_output=True)
-    subprocess.run(["tmux", "send-keys", "-t", session_name, tts_cmd, "Enter"], capture_output=True)
+    _tmux_new_session(session_name, tts_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
     # Wait for server to be ready
     import urllib.request
@@ -2156,7 +2420,7 @@ def _restart_tts_remote_for_venv(ssh_target: str, machine_id: str, venv: str, ba
 
     # Stop existing server
     kill_cmd = f"tmux kill-session -t {session_name} 2>/dev/null || true"
-    subprocess.run(["ssh", ssh_target, kill_cmd], capture_output=True)
+    subprocess.run(["ssh", ssh_target, kill_cmd], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     time.sleep(1)
 
     # Start with new backend (venv is determined by backend on remote)
@@ -2228,7 +2492,6 @@ def _local_say(
 ) -> int:
     """Generate TTS locally and play via system audio."""
     import tempfile
-    import urllib.request
 
     try:
         # Build request payload
@@ -2245,33 +2508,62 @@ def _local_say(
         if instruct:
             payload["instruct"] = instruct
 
-        data = json.dumps(payload).encode()
+        try:
+            conn, response = _http_open("POST", f"{tts_url}/tts", _json_body(payload), timeout=60)
+        except OSError as e:
+            print(f"TTS server not reachable: {e}", file=sys.stderr)
+            print("Start it with: agentwire tts start", file=sys.stderr)
+            return 1
 
-        req = urllib.request.Request(
-            f"{tts_url}/tts",
-            data=data,
-            headers={"Content-Type": "application/json"},
-        )
+        try:
+            if response.status < 400 and sys.platform == "linux":
+                # Pipe audio into the player as it arrives
+                _play_wav_stream(response)
+                return 0
+            status, audio_data = response.status, response.read()
+        finally:
+            conn.close()
 
-        with urllib.request.urlopen(req, timeout=60) as response:
-            audio_data = response.read()
+        if status >= 400:
+            # Try to read the actual error message from the response body
+            try:
+                error_body = json.loads(audio_data)
+            except Exception:
+                error_body = None
+
+            # Check for venv_mismatch error (422) - auto-restart TTS with correct venv
+            if status == 422 and not _retry and error_body:
+                if error_body.get("error") == "venv_mismatch":
+                    required_venv = error_body.get("required_venv")
+                    target_backend = error_body.get("backend", backend)
+                    print(f"Backend '{target_backend}' requires venv '{required_venv}'. Restarting TTS server...")
+
+                    if _restart_tts_for_venv(required_venv, target_backend):
+                        print("TTS server restarted. Retrying...")
+                        return _local_say(
+                            text, voice, exaggeration, cfg_weight, tts_url,
+                            backend=target_backend, instruct=instruct, language=language,
+                            stream=stream, _retry=True
+                        )
+                    else:
+                        print("Failed to restart TTS server.", file=sys.stderr)
+                        return 1
 
-        # Save to temp file and play
+            # Show the actual error message from the TTS server if available
+            if error_body:
+                detail = error_body.get("detail") or error_body.get("error") or error_body
+                print(f"TTS error: {detail}", file=sys.stderr)
+            else:
+                print(f"TTS request failed: HTTP {status}", file=sys.stderr)
+            return 1
+
+        # afplay can't read stdin: save to temp file and play
         with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
             f.write(audio_data)
             temp_path = f.name
 
-        # Play audio (cross-platform)
         if sys.platform == "darwin":
             subprocess.run(["afplay", temp_path], check=True)
-        elif sys.platform == "linux":
-            # Try various players
-            for player in ["aplay", "paplay", "play"]:
-                try:
-                    subprocess.run([player, temp_path], check=True)
-                    break
-                except FileNotFoundError:
-                    continue
         else:
             print(f"Audio saved to: {temp_path}")
 
@@ -2279,43 +2571,6 @@ def _local_say(
         Path(temp_path).unlink(missing_ok=True)
         return 0
 
-    except urllib.error.HTTPError as e:
-        # Try to read the actual error message from the response body
-        try:
-            error_body = json.loads(e.read().decode())
-        except Exception:
-            error_body = None
-
-        # Check for venv_mismatch error (422) - auto-restart TTS with correct venv
-        if e.code == 422 and not _retry and error_body:
-            if error_body.get("error") == "venv_mismatch":
-                required_venv = error_body.get("required_venv")
-                target_backend = error_body.get("backend", backend)
-                print(f"Backend '{target_backend}' requires venv '{required_venv}'. Restarting TTS server...")
-
-                if _restart_tts_for_venv(required_venv, target_backend):
-                    print("TTS server restarted. Retrying...")
-                    return _local_say(
-                        text, voice, exaggeration, cfg_weight, tts_url,
-                        backend=target_backend, instruct=instruct, language=language,
-                        stream=stream, _retry=True
-                    )
-                else:
-                    print("Failed to restart TTS server.", file=sys.stderr)
-                    return 1
-
-        # Show the actual error message from the TTS server if available
-        if error_body:
-            detail = error_body.get("detail") or error_body.get("error") or error_body
-            print(f"TTS error: {detail}", file=sys.stderr)
-        else:
-            print(f"TTS request failed: {e}", file=sys.stderr)
-        return 1
-
-    except urllib.error.URLError as e:
-        print(f"TTS server not reachable: {e}", file=sys.stderr)
-        print("Start it with: agentwire tts start", file=sys.stderr)
-        return 1
     except Exception as e:
         print(f"TTS failed: {e}", file=sys.stderr)
         return 1
@@ -2323,28 +2578,18 @@ def _local_say(
 
 def _remote_say(text: str, session: str, portal_url: str) -> int:
     """Send TTS to a session via the portal (for remote sessions)."""
-    import ssl
-    import urllib.request
-
     try:
-        # Create SSL context that doesn't verify (self-signed certs)
-        ctx = ssl.create_default_context()
-        ctx.check_hostname = False
-        ctx.verify_mode = ssl.CERT_NONE
-
-        data = json.dumps({"text": text}).encode()
-        req = urllib.request.Request(
-            f"{portal_url}/api/say/{session}",
-            data=data,
-            headers={"Content-Type": "application/json"},
-        )
-
+        data = _json_body({"text": text})
         # 90 second timeout to handle RunPod cold starts
-        with urllib.request.urlopen(req, context=ctx, timeout=90) as response:
-            result = json.loads(response.read().decode())
-            if result.get("error"):
-                print(f"Error: {result['error']}", file=sys.stderr)
-                return 1
+        status, body = _http_request("POST", f"{portal_url}/api/say/{session}", data, timeout=90)
+        if status >= 400:
+            print(f"Failed to send to portal: HTTP {status}", file=sys.stderr)
+            return 1
+
+        result = json.loads(body)
+        if result.get("error"):
+            print(f"Error: {result['error']}", file=sys.stderr)
+            return 1
 
         return 0
 
@@ -2399,6 +2644,12 @@ def store_session_metadata(session_name: str, metadata: dict) -> None:
         pass
 
 
+def cmd_email(args) -> int:
+    """Send a branded email notification (see notifications.cmd_email)."""
+    from .notifications import cmd_email as send_email
+    return send_email(args)
+
+
 def cmd_notify(args) -> int:
     """Send a notification to the portal about session/pane state changes.
 
@@ -2439,7 +2690,7 @@ def cmd_notify(args) -> int:
         # Use urllib to avoid requests dependency in core CLI
         import urllib.request
 
-        data = json.dumps(payload).encode()
+        data = _json_body(payload)
         req = urllib.request.Request(
             f"{portal_url}/api/notify",
             data=data,
@@ -2478,6 +2729,8 @@ def cmd_send(args) -> int:
     Supports remote sessions with session@machine format.
     Use --pane N to send to a specific pane in the current session.
     """
+    from . import pane_manager
+
     session_full = getattr(args, 'session', None)
     pane_index = getattr(args, 'pane', None)
     prompt = " ".join(args.prompt) if args.prompt else ""
@@ -2567,8 +2820,9 @@ def cmd_send(args) -> int:
     # Local: existing logic
     # Check if session exists
     result = subprocess.run(
-        ["tmux", "has-session", "-t", session],
-        capture_output=True
+        [_TMUX, "has-session", "-t", session],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
     )
     if result.returncode != 0:
         if json_mode:
@@ -2579,7 +2833,7 @@ def cmd_send(args) -> int:
 
     # Send the prompt via tmux send-keys (text first, then Enter after delay)
     subprocess.run(
-        ["tmux", "send-keys", "-t", session, prompt],
+        [_TMUX, "send-keys", "-t", session, prompt],
         check=True
     )
 
@@ -2587,7 +2841,7 @@ def cmd_send(args) -> int:
     time.sleep(0.5)
 
     subprocess.run(
-        ["tmux", "send-keys", "-t", session, "Enter"],
+        [_TMUX, "send-keys", "-t", session, "Enter"],
         check=True
     )
 
@@ -2596,7 +2850,7 @@ def cmd_send(args) -> int:
     if "\n" in prompt or len(prompt) > 200:
         time.sleep(0.5)
         subprocess.run(
-            ["tmux", "send-keys", "-t", session, "Enter"],
+            [_TMUX, "send-keys", "-t", session, "Enter"],
             check=True
         )
 
@@ -2613,6 +2867,8 @@ def cmd_list(args) -> int:
     When inside a tmux session, shows panes by default.
     Use --sessions to show sessions instead.
     """
+    from . import pane_manager
+
     json_mode = getattr(args, 'json', False)
 
     if not _check_tmux_installed():
@@ -2661,7 +2917,7 @@ def cmd_list(args) -> int:
     local_sessions = []
     if not remote_only:
         result = subprocess.run(
-            ["tmux", "list-sessions", "-F", "#{session_name}:#{session_windows}:#{pane_current_path}"],
+            [_TMUX, "list-sessions", "-F", "#{session_name}:#{session_windows}:#{pane_current_path}"],
             capture_output=True,
             text=True
         )
@@ -2932,19 +3188,7 @@ def cmd_new(args) -> int:
                 print(f"Warning: Failed to write system prompt to remote: {e}", file=sys.stderr)
 
         # Create session - Agent starts immediately if not bare
-        if agent_cmd:
-            create_cmd = (
-                f"tmux new-session -d -s {shlex.quote(session_name)} -c {shlex.quote(remote_path)} && "
-                f"tmux send-keys -t {shlex.quote(session_name)} 'cd {shlex.quote(remote_path)}' Enter && "
-                f"sleep 0.1 && "
-                f"tmux send-keys -t {shlex.quote(session_name)} {shlex.quote(agent_cmd)} Enter"
-            )
-        else:
-            # Bare session - just create tmux
-            create_cmd = (
-                f"tmux new-session -d -s {shlex.quote(session_name)} -c {shlex.quote(remote_path)} && "
-                f"tmux send-keys -t {shlex.quote(session_name)} 'cd {shlex.quote(remote_path)}' Enter"
-            )
+        create_cmd = _remote_new_session_cmd(session_name, remote_path, agent_cmd)
 
         result = _run_remote(machine_id, create_cmd)
         if result.returncode != 0:
@@ -3017,30 +3261,19 @@ def cmd_new(args) -> int:
             return _output_result(False, json_mode, f"Path does not exist: {session_path}")
 
     # Check if session already exists
-    result = subprocess.run(
-        ["tmux", "has-session", "-t", f"={session_name}"],
-        capture_output=True
-    )
-    if result.returncode == 0:
+    if tmux_session_exists(session_name):
         if args.force:
             # Kill existing session
-            subprocess.run(["tmux", "send-keys", "-t", session_name, "/exit", "Enter"])
-            time.sleep(2)
-            subprocess.run(["tmux", "kill-session", "-t", session_name], capture_output=True)
+            subprocess.run([_TMUX, "send-keys", "-t", session_name, "/exit", "Enter"])
+            _wait_for_pane_exit(session_name, 2)
+            subprocess.run([_TMUX, "kill-session", "-t", session_name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            _tmux_sessions.cache_clear()
         else:
             return _output_result(False, json_mode, f"Session '{session_name}' already exists. Use -f to replace.")
 
     # Create new tmux session
-    subprocess.run(
-        ["tmux", "new-session", "-d", "-s", session_name, "-c", str(session_path)],
-        check=True
-    )
-
     # Ensure Claude starts in correct directory
-    subprocess.run(
-        ["tmux", "send-keys", "-t", session_name, f"cd {shlex.quote(str(session_path))}", "Enter"],
-        check=True
-    )
+    _tmux_new_session(session_name, f"cd {shlex.quote(str(session_path))}", cwd=session_path, check=True)
     time.sleep(0.1)
 
     # Determine agent type and normalize session type
@@ -3087,7 +3320,7 @@ def cmd_new(args) -> int:
     # Start agent command if not bare
     if agent_cmd:
         subprocess.run(
-            ["tmux", "send-keys", "-t", session_name, agent_cmd, "Enter"],
+            [_TMUX, "send-keys", "-t", session_name, agent_cmd, "Enter"],
             check=True
         )
 
@@ -3135,6 +3368,8 @@ def cmd_output(args) -> int:
     Supports remote sessions with session@machine format.
     Use --pane N to read from a specific pane in the current session.
     """
+    from . import pane_manager
+
     session_full = getattr(args, 'session', None)
     pane_index = getattr(args, 'pane', None)
     lines = args.lines or 50
@@ -3204,8 +3439,9 @@ def cmd_output(args) -> int:
 
     # Local: existing logic
     result = subprocess.run(
-        ["tmux", "has-session", "-t", session],
-        capture_output=True
+        [_TMUX, "has-session", "-t", session],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
     )
     if result.returncode != 0:
         if json_mode:
@@ -3215,7 +3451,7 @@ def cmd_output(args) -> int:
         return 1
 
     result = subprocess.run(
-        ["tmux", "capture-pane", "-t", session, "-p", "-S", f"-{lines}"],
+        [_TMUX, "capture-pane", "-t", session, "-p", "-S", f"-{lines}"],
         capture_output=True,
         text=True
     )
@@ -3280,7 +3516,7 @@ def cmd_info(args) -> int:
 
         # Get working directory
         result = subprocess.run(
-            ["tmux", "display-message", "-t", session, "-p", "#{pane_current_path}:#{window_panes}"],
+            [_TMUX, "display-message", "-t", session, "-p", "#{pane_current_path}:#{window_panes}"],
             capture_output=True,
             text=True,
         )
@@ -3294,7 +3530,7 @@ def cmd_info(args) -> int:
 
         # Get pane details
         panes_result = subprocess.run(
-            ["tmux", "list-panes", "-t", session, "-F", "#{pane_index}:#{pane_current_command}:#{pane_active}"],
+            [_TMUX, "list-panes", "-t", session, "-F", "#{pane_index}:#{pane_current_command}:#{pane_active}"],
             capture_output=True,
             text=True,
         )
@@ -3339,6 +3575,8 @@ def cmd_kill(args) -> int:
     Supports remote sessions with session@machine format.
     Use --pane N to kill a specific pane in the current session.
     """
+    from . import pane_manager
+
     session_full = getattr(args, 'session', None)
     pane_index = getattr(args, 'pane', None)
     json_mode = getattr(args, 'json', False)
@@ -3356,8 +3594,8 @@ def cmd_kill(args) -> int:
             # Send /exit for clean shutdown (use send_to_pane for proper timing)
             pane_manager.send_to_pane(session, pane_index, "/exit")
             if not json_mode:
-                print(f"Sent /exit to pane {pane_index}, waiting 3s...")
-            time.sleep(3)
+                print(f"Sent /exit to pane {pane_index}, waiting up to 3s...")
+            _wait_for_pane_exit(f"{session}:0.{pane_index}", 3)
 
             # Kill the pane
             pane_manager.kill_pane(session, pane_index)
@@ -3414,8 +3652,9 @@ def cmd_kill(args) -> int:
 
     # Local: existing logic
     result = subprocess.run(
-        ["tmux", "has-session", "-t", session],
-        capture_output=True
+        [_TMUX, "has-session", "-t", session],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
     )
     if result.returncode != 0:
         return _output_result(False, json_mode, f"Session '{session}' not found")
@@ -3423,15 +3662,17 @@ def cmd_kill(args) -> int:
     # Send /exit to Claude first for clean shutdown
     # Target pane 0 specifically and capture output to avoid terminal noise
     subprocess.run(
-        ["tmux", "send-keys", "-t", f"{session}:0.0", "/exit", "Enter"],
-        capture_output=True
+        [_TMUX, "send-keys", "-t", f"{session}:0.0", "/exit", "Enter"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
     )
     if not json_mode:
-        print(f"Sent /exit to {session}, waiting 3s...")
-    time.sleep(3)
+        print(f"Sent /exit to {session}, waiting up to 3s...")
+    _wait_for_pane_exit(f"{session}:0.0", 3)
 
     # Kill the session
-    subprocess.run(["tmux", "kill-session", "-t", session], capture_output=True)
+    subprocess.run([_TMUX, "kill-session", "-t", session], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _tmux_sessions.cache_clear()
     if not json_mode:
         print(f"Killed session '{session}'")
 
@@ -3466,7 +3707,7 @@ def _wait_for_worker_ready(session: str, pane_index: int, timeout: int = 30, age
         try:
             # Use :0.N to target pane N in window 0 (not :N which targets window N)
             result = subprocess.run(
-                ["tmux", "capture-pane", "-t", f"{session}:0.{pane_index}", "-p", "-S", "-20"],
+                [_TMUX, "capture-pane", "-t", f"{session}:0.{pane_index}", "-p", "-S", "-20"],
                 capture_output=True, text=True
             )
             if result.returncode == 0:
@@ -3497,6 +3738,8 @@ def cmd_spawn(args) -> int:
     By default, waits for the worker to be ready before returning.
     Use --no-wait to return immediately after spawning.
     """
+    from . import pane_manager
+
     json_mode = getattr(args, 'json', False)
     cwd = getattr(args, 'cwd', None)
     roles_arg = getattr(args, 'roles', 'worker')
@@ -3510,7 +3753,7 @@ def cmd_spawn(args) -> int:
         target_session = session or pane_manager.get_current_session()
         if target_session:
             result = subprocess.run(
-                ["tmux", "display", "-t", f"{target_session}:0.0", "-p", "#{pane_current_path}"],
+                [_TMUX, "display", "-t", f"{target_session}:0.0", "-p", "#{pane_current_path}"],
                 capture_output=True, text=True
             )
             if result.returncode == 0 and result.stdout.strip():
@@ -3598,6 +3841,8 @@ def cmd_spawn(args) -> int:
 
 def cmd_split(args) -> int:
     """Add terminal pane(s) to current session with even vertical layout."""
+    from . import pane_manager
+
     count = getattr(args, 'count', 1)
     cwd = getattr(args, 'cwd', None) or os.getcwd()
     session = getattr(args, 'session', None)
@@ -3608,7 +3853,7 @@ def cmd_split(args) -> int:
         if session:
             # We're in tmux, get session name
             result = subprocess.run(
-                ["tmux", "display-message", "-p", "#{session_name}"],
+                [_TMUX, "display-message", "-p", "#{session_name}"],
                 capture_output=True, text=True
             )
             if result.returncode == 0:
@@ -3623,12 +3868,12 @@ def cmd_split(args) -> int:
     # Add panes
     for _ in range(count):
         subprocess.run([
-            "tmux", "split-window", "-v", "-t", session, "-c", cwd
-        ], capture_output=True)
+            _TMUX, "split-window", "-v", "-t", session, "-c", cwd
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
     # Apply main-top layout: orchestrator (pane 0) at top with 60%, workers below
     pane_manager._apply_main_top_layout(session)
-    subprocess.run(["tmux", "select-pane", "-t", f"{session}:0.0"], capture_output=True)
+    subprocess.run([_TMUX, "select-pane", "-t", f"{session}:0.0"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
     pane_count = 1 + count  # original + new
     print(f"Added {count} pane(s) - now {pane_count} panes")
@@ -3637,6 +3882,8 @@ def cmd_split(args) -> int:
 
 def cmd_detach(args) -> int:
     """Move a pane to its own session and re-align remaining panes."""
+    from . import pane_manager
+
     pane_index = getattr(args, 'pane', None)
     new_session = getattr(args, 'session', None)
     source_session = getattr(args, 'source', None)
@@ -3648,7 +3895,7 @@ def cmd_detach(args) -> int:
     # Get source session if not specified
     if not source_session:
         result = subprocess.run(
-            ["tmux", "display-message", "-p", "#{session_name}"],
+            [_TMUX, "display-message", "-p", "#{session_name}"],
             capture_output=True, text=True
         )
         if result.returncode == 0:
@@ -3659,8 +3906,9 @@ def cmd_detach(args) -> int:
 
     # Check if target session already exists
     result = subprocess.run(
-        ["tmux", "has-session", "-t", new_session],
-        capture_output=True
+        [_TMUX, "has-session", "-t", new_session],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
     )
     session_exists = result.returncode == 0
 
@@ -3668,17 +3916,17 @@ def cmd_detach(args) -> int:
     if session_exists:
         # Move to existing session
         subprocess.run([
-            "tmux", "move-pane", "-s", f"{source_session}:{pane_index}", "-t", f"{new_session}:"
-        ], capture_output=True)
+            _TMUX, "move-pane", "-s", f"{source_session}:{pane_index}", "-t", f"{new_session}:"
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
     else:
         # Break pane into new session
         subprocess.run([
-            "tmux", "break-pane", "-d", "-s", f"{source_session}:{pane_index}", "-t", f"{new_session}:"
-        ], capture_output=True)
+            _TMUX, "break-pane", "-d", "-s", f"{source_session}:{pane_index}", "-t", f"{new_session}:"
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
     # Re-align remaining panes with main-top layout
     pane_manager._apply_main_top_layout(source_session)
-    subprocess.run(["tmux", "select-pane", "-t", f"{source_session}:0.0"], capture_output=True)
+    subprocess.run([_TMUX, "select-pane", "-t", f"{source_session}:0.0"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
     print(f"Moved pane {pane_index} to session '{new_session}'")
     return 0
@@ -3686,6 +3934,8 @@ def cmd_detach(args) -> int:
 
 def cmd_jump(args) -> int:
     """Jump to (focus) a specific pane."""
+    from . import pane_manager
+
     json_mode = getattr(args, 'json', False)
     pane_index = getattr(args, 'pane', None)
     session = getattr(args, 'session', None)
@@ -3713,6 +3963,8 @@ def cmd_jump(args) -> int:
 
 def cmd_resize(args) -> int:
     """Resize tmux window to fit the largest attached client."""
+    from . import pane_manager
+
     json_mode = getattr(args, 'json', False)
     session = getattr(args, 'session', None)
 
@@ -3724,7 +3976,7 @@ def cmd_resize(args) -> int:
 
     try:
         result = subprocess.run(
-            ["tmux", "resize-window", "-A", "-t", session],
+            [_TMUX, "resize-window", "-A", "-t", session],
             capture_output=True,
             text=True,
         )
@@ -3798,8 +4050,9 @@ def cmd_send_keys(args) -> int:
     # Local: existing logic
     # Check if session exists
     result = subprocess.run(
-        ["tmux", "has-session", "-t", session],
-        capture_output=True
+        [_TMUX, "has-session", "-t", session],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
     )
     if result.returncode != 0:
         print(f"Session '{session}' not found", file=sys.stderr)
@@ -3808,7 +4061,7 @@ def cmd_send_keys(args) -> int:
     # Send each key group with a pause between
     for i, key in enumerate(keys):
         subprocess.run(
-            ["tmux", "send-keys", "-t", session, key],
+            [_TMUX, "send-keys", "-t", session, key],
             check=True
         )
         # Brief pause between key groups (not after last one)
@@ -3834,6 +4087,8 @@ def cmd_recreate(args) -> int:
 
     Supports remote sessions with session@machine format.
     """
+    import datetime
+
     session_full = args.session
     json_mode = getattr(args, 'json', False)
 
@@ -3909,12 +4164,7 @@ def cmd_recreate(args) -> int:
         agent = build_agent_command(session_type_str)
         agent_cmd = agent.command
 
-        create_cmd = (
-            f"tmux new-session -d -s {shlex.quote(session_name)} -c {shlex.quote(session_path)} && "
-            f"tmux send-keys -t {shlex.quote(session_name)} 'cd {shlex.quote(session_path)}' Enter && "
-            f"sleep 0.1 && "
-            f"tmux send-keys -t {shlex.quote(session_name)} {shlex.quote(agent_cmd)} Enter"
-        )
+        create_cmd = _remote_new_session_cmd(session_name, session_path, agent_cmd)
 
         result = _run_remote(machine_id, create_cmd)
         if result.returncode != 0:
@@ -3935,14 +4185,11 @@ def cmd_recreate(args) -> int:
 
     # Local recreate
     # Step 1: Kill existing session
-    result = subprocess.run(
-        ["tmux", "has-session", "-t", f"={session_name}"],
-        capture_output=True
-    )
-    if result.returncode == 0:
-        subprocess.run(["tmux", "send-keys", "-t", session_name, "/exit", "Enter"])
-        time.sleep(2)
-        subprocess.run(["tmux", "kill-session", "-t", session_name], capture_output=True)
+    if tmux_session_exists(session_name):
+        subprocess.run([_TMUX, "send-keys", "-t", session_name, "/exit", "Enter"])
+        _wait_for_pane_exit(session_name, 2)
+        subprocess.run([_TMUX, "kill-session", "-t", session_name], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        _tmux_sessions.cache_clear()
 
     # Determine paths
     project_path = projects_dir / project
@@ -3963,7 +4210,8 @@ def cmd_recreate(args) -> int:
         subprocess.run(
             ["git", "pull", "origin", "main"],
             cwd=project_path,
-            capture_output=True
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
 
     # Step 4: Create new worktree with timestamp branch
@@ -4029,22 +4277,14 @@ def cmd_recreate(args) -> int:
     agent_cmd = agent.command
 
     # Step 5: Create new session
-    subprocess.run(
-        ["tmux", "new-session", "-d", "-s", session_name, "-c", str(session_path)],
-        check=True
-    )
-
     # Ensure agent starts in correct directory
-    subprocess.run(
-        ["tmux", "send-keys", "-t", session_name, f"cd {shlex.quote(str(session_path))}", "Enter"],
-        check=True
-    )
+    _tmux_new_session(session_name, f"cd {shlex.quote(str(session_path))}", cwd=session_path, check=True)
     time.sleep(0.1)
 
     # Start the agent with appropriate command
     if agent_cmd:
         subprocess.run(
-            ["tmux", "send-keys", "-t", session_name, agent_cmd, "Enter"],
+            [_TMUX, "send-keys", "-t", session_name, agent_cmd, "Enter"],
             check=True
         )
 
@@ -4178,12 +4418,7 @@ def cmd_fork(args) -> int:
 
         agent_cmd = agent.command
 
-        create_session_cmd = (
-            f"tmux new-session -d -s {shlex.quote(target_session)} -c {shlex.quote(target_path)} && "
-            f"tmux send-keys -t {shlex.quote(target_session)} 'cd {shlex.quote(target_path)}' Enter && "
-            f"sleep 0.1 && "
-            f"tmux send-keys -t {shlex.quote(target_session)} {shlex.quote(agent_cmd)} Enter"
-        )
+        create_session_cmd = _remote_new_session_cmd(target_session, target_path, agent_cmd)
 
         result = _run_remote(machine_id, create_session_cmd)
         if result.returncode != 0:
@@ -4218,31 +4453,25 @@ def cmd_fork(args) -> int:
 
         # Check if source session exists
         check_source = subprocess.run(
-            ["tmux", "has-session", "-t", source_session],
-            capture_output=True
+            [_TMUX, "has-session", "-t", source_session],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
         if check_source.returncode != 0:
             return _output_result(False, json_mode, f"Source session '{source_session}' does not exist")
 
         # Check if target session already exists
         check_target = subprocess.run(
-            ["tmux", "has-session", "-t", target_session],
-            capture_output=True
+            [_TMUX, "has-session", "-t", target_session],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
         )
         if check_target.returncode == 0:
             return _output_result(False, json_mode, f"Target session '{target_session}' already exists")
 
         # Create new tmux session in same directory
-        subprocess.run(
-            ["tmux", "new-session", "-d", "-s", target_session, "-c", str(fork_path)],
-            check=True
-        )
-
         # Ensure Claude starts in correct directory
-        subprocess.run(
-            ["tmux", "send-keys", "-t", target_session, f"cd {shlex.quote(str(fork_path))}", "Enter"],
-            check=True
-        )
+        _tmux_new_session(target_session, f"cd {shlex.quote(str(fork_path))}", cwd=fork_path, check=True)
         time.sleep(0.1)
 
         # Determine session type from --type flag or source config
@@ -4279,7 +4508,7 @@ def cmd_fork(args) -> int:
         agent_cmd = agent.command
         if agent_cmd:
             subprocess.run(
-                ["tmux", "send-keys", "-t", target_session, agent_cmd, "Enter"],
+                [_TMUX, "send-keys", "-t", target_session, agent_cmd, "Enter"],
                 check=True
             )
 
@@ -4334,16 +4563,8 @@ def cmd_fork(args) -> int:
         return _output_result(False, json_mode, f"Failed to create worktree for branch '{target_branch}'")
 
     # Create new session
-    subprocess.run(
-        ["tmux", "new-session", "-d", "-s", target_session, "-c", str(target_path)],
-        check=True
-    )
-
     # Ensure agent starts in correct directory
-    subprocess.run(
-        ["tmux", "send-keys", "-t", target_session, f"cd {shlex.quote(str(target_path))}", "Enter"],
-        check=True
-    )
+    _tmux_new_session(target_session, f"cd {shlex.quote(str(target_path))}", cwd=target_path, check=True)
     time.sleep(0.1)
 
     # Determine session type from --type flag or source config
@@ -4381,7 +4602,7 @@ def cmd_fork(args) -> int:
     agent_cmd = agent.command
     if agent_cmd:
         subprocess.run(
-            ["tmux", "send-keys", "-t", target_session, agent_cmd, "Enter"],
+            [_TMUX, "send-keys", "-t", target_session, agent_cmd, "Enter"],
             check=True
         )
 
@@ -4565,6 +4786,8 @@ def cmd_history_resume(args) -> int:
 
     Flags are applied based on the project's .agentwire.yml config.
     """
+    import tempfile
+
     session_id = args.session_id
     name = getattr(args, 'name', None)
     machine_id = getattr(args, 'machine', 'local')
@@ -4601,11 +4824,7 @@ def cmd_history_resume(args) -> int:
         counter = 1
         while True:
             # Check if session exists locally
-            check_result = subprocess.run(
-                ["tmux", "has-session", "-t", f"={name}"],
-                capture_output=True
-            )
-            if check_result.returncode != 0:
+            if not tmux_session_exists(name):
                 break  # Session doesn't exist, use this name
             counter += 1
             name = f"{base_name}-fork-{counter}"
@@ -4673,12 +4892,7 @@ def cmd_history_resume(args) -> int:
             return _output_result(False, json_mode, f"Session '{name}' already exists on {machine_id}")
 
         # Create remote tmux session and send claude command
-        create_cmd = (
-            f"tmux new-session -d -s {shlex.quote(name)} -c {shlex.quote(remote_path)} && "
-            f"tmux send-keys -t {shlex.quote(name)} 'cd {shlex.quote(remote_path)}' Enter && "
-            f"sleep 0.1 && "
-            f"tmux send-keys -t {shlex.quote(name)} {shlex.quote(agent_cmd)} Enter"
-        )
+        create_cmd = _remote_new_session_cmd(name, remote_path, agent_cmd)
 
         result = _run_remote(machine_id, create_cmd)
         if result.returncode != 0:
@@ -4706,29 +4920,17 @@ def cmd_history_resume(args) -> int:
         return _output_result(False, json_mode, f"Project path does not exist: {project_path}")
 
     # Check if session already exists
-    result = subprocess.run(
-        ["tmux", "has-session", "-t", f"={name}"],
-        capture_output=True
-    )
-    if result.returncode == 0:
+    if tmux_session_exists(name):
         return _output_result(False, json_mode, f"Session '{name}' already exists. Choose a different name with --name.")
 
     # Create new tmux session
-    subprocess.run(
-        ["tmux", "new-session", "-d", "-s", name, "-c", str(project_path)],
-        check=True
-    )
-
     # Ensure Claude starts in correct directory
-    subprocess.run(
-        ["tmux", "send-keys", "-t", name, f"cd {shlex.quote(str(project_path))}", "Enter"],
-        check=True
-    )
+    _tmux_new_session(name, f"cd {shlex.quote(str(project_path))}", cwd=project_path, check=True)
     time.sleep(0.1)
 
     # Send the claude resume command
     subprocess.run(
-        ["tmux", "send-keys", "-t", name, agent_cmd, "Enter"],
+        [_TMUX, "send-keys", "-t", name, agent_cmd, "Enter"],
         check=True
     )
 
@@ -4759,15 +4961,14 @@ def cmd_machine_add(args) -> int:
     user = args.user
     projects_dir = args.projects_dir
 
-    machines_file = CONFIG_DIR / "machines.json"
+    machines_file = MACHINES_FILE
     machines_file.parent.mkdir(parents=True, exist_ok=True)
 
     # Load existing machines
     machines = []
     if machines_file.exists():
         try:
-            with open(machines_file) as f:
-                machines = json.load(f).get("machines", [])
+            machines = _load_json(machines_file).get("machines", [])
         except (json.JSONDecodeError, IOError):
             pass
 
@@ -4786,9 +4987,7 @@ def cmd_machine_add(args) -> int:
     machines.append(new_machine)
 
     # Save
-    with open(machines_file, "w") as f:
-        json.dump({"machines": machines}, f, indent=2)
-        f.write("\n")
+    _dump_json(machines_file, {"machines": machines})
 
     print(f"Added machine '{machine_id}'")
     print(f"  Host: {host}")
@@ -4807,11 +5006,89 @@ def cmd_machine_add(args) -> int:
     return 0
 
 
+# Matches an autossh command line, capturing everything after "autossh"
+_AUTOSSH_RE = re.compile(rb"autossh(.*)", re.DOTALL)
+
+
+def _iter_process_cmdlines():
+    """Yield (pid, command line bytes) for every running process.
+
+    Reads /proc directly on Linux; falls back to a single `ps` call elsewhere
+    (macOS has no /proc).
+    """
+    if os.path.isdir("/proc"):
+        with os.scandir("/proc") as it:
+            pids = [int(e.name) for e in it if e.name.isdigit()]
+        for pid in pids:
+            try:
+                with open(f"/proc/{pid}/cmdline", "rb") as f:
+                    yield pid, f.read().replace(b"\0", b" ")
+            except OSError:
+                continue  # Process exited or is not readable
+        return
+
+    result = subprocess.run(["ps", "-axo", "pid=,command="], capture_output=True)
+    for line in result.stdout.splitlines():
+        pid, _, command = line.strip().partition(b" ")
+        yield int(pid), command
+
+
+def _scan_autossh_tunnels(keys) -> dict[str, list[int]]:
+    """Find running autossh processes for each machine id/host.
+
+    Scans the process table once (instead of one pgrep/pkill per key) and
+    matches the same way as `pgrep -f "autossh.*<key>"`.
+
+    Returns:
+        Dict mapping each key to the PIDs of matching autossh processes.
+    """
+    tunnels: dict[str, list[int]] = {key: [] for key in keys}
+    needles = [(key.encode(), pids) for key, pids in tunnels.items()]
+    own_pid = os.getpid()
+    for pid, cmdline in _iter_process_cmdlines():
+        match = _AUTOSSH_RE.search(cmdline)
+        if match is None or pid == own_pid:
+            continue
+        tail = match.group(1)
+        for needle, pids in needles:
+            if needle in tail:
+                pids.append(pid)
+    return tunnels
+
+
+_MACHINE_REMOVAL_STEPS = """
+==================================================
+MANUAL STEPS REQUIRED:
+==================================================
+
+1. Remove SSH config entry:
+   Edit ~/.ssh/config and remove the 'Host {machine_id}' block
+
+2. Remove from tunnel startup script (if using):
+   Edit ~/.local/bin/agentwire-tunnels
+   Remove '{machine_id}' from the MACHINES list
+
+3. Delete GitHub deploy keys:
+   gh repo deploy-key list --repo <user>/<repo>
+   # Find keys titled '{machine_id}' and delete them:
+   gh repo deploy-key delete <key-id> --repo <user>/<repo>
+
+4. Destroy remote machine:
+   Option A: Delete user only
+     ssh root@<ip> 'pkill -u agentwire; userdel -r agentwire'
+   Option B: Destroy the VM entirely via provider console
+
+5. Restart portal to pick up changes:
+   agentwire portal stop && agentwire portal start
+
+"""
+
+
 def cmd_machine_remove(args) -> int:
     """Remove a machine from the AgentWire network."""
     machine_id = args.machine_id
 
-    machines_file = CONFIG_DIR / "machines.json"
+    machines_file = MACHINES_FILE
 
     # Step 1: Load and check machines.json
     if not machines_file.exists():
@@ -4819,8 +5096,7 @@ def cmd_machine_remove(args) -> int:
         return 1
 
     try:
-        with open(machines_file) as f:
-            machines_data = json.load(f)
+        machines_data = _load_json(machines_file)
     except json.JSONDecodeError as e:
         print(f"Invalid machines.json: {e}", file=sys.stderr)
         return 1
@@ -4838,62 +5114,30 @@ def cmd_machine_remove(args) -> int:
     print(f"Removing machine '{machine_id}' (host: {host})...")
     print()
 
-    # Step 2: Kill autossh tunnel
+    # Step 2: Kill autossh tunnel (match by id, then by host if different)
     print("Stopping tunnel...")
-    result = subprocess.run(
-        ["pkill", "-f", f"autossh.*{machine_id}"],
-        capture_output=True,
-    )
-    if result.returncode == 0:
-        print(f"  ✓ Killed autossh tunnel for {machine_id}")
+    tunnels = _scan_autossh_tunnels([machine_id, host])
+    tunnel_key = machine_id if tunnels[machine_id] else host
+    killed = False
+    for pid in tunnels[tunnel_key]:
+        try:
+            os.kill(pid, signal.SIGTERM)
+            killed = True
+        except OSError:
+            pass  # Exited between the scan and the kill, or not ours to kill
+    if killed:
+        print(f"  ✓ Killed autossh tunnel for {tunnel_key}")
     else:
-        # Also try by host if different from id
-        if host != machine_id:
-            result = subprocess.run(
-                ["pkill", "-f", f"autossh.*{host}"],
-                capture_output=True,
-            )
-            if result.returncode == 0:
-                print(f"  ✓ Killed autossh tunnel for {host}")
-            else:
-                print("  - No tunnel running (or already stopped)")
-        else:
-            print("  - No tunnel running (or already stopped)")
+        print("  - No tunnel running (or already stopped)")
 
     # Step 3: Remove from machines.json
     print("Updating machines.json...")
     machines_data["machines"] = [m for m in machines if m.get("id") != machine_id]
-    with open(machines_file, "w") as f:
-        json.dump(machines_data, f, indent=2)
-        f.write("\n")
+    _dump_json(machines_file, machines_data)
     print(f"  ✓ Removed '{machine_id}' from machines.json")
 
     # Step 4: Print manual steps
-    print()
-    print("=" * 50)
-    print("MANUAL STEPS REQUIRED:")
-    print("=" * 50)
-    print()
-    print("1. Remove SSH config entry:")
-    print(f"   Edit ~/.ssh/config and remove the 'Host {machine_id}' block")
-    print()
-    print("2. Remove from tunnel startup script (if using):")
-    print("   Edit ~/.local/bin/agentwire-tunnels")
-    print(f"   Remove '{machine_id}' from the MACHINES list")
-    print()
-    print("3. Delete GitHub deploy keys:")
-    print("   gh repo deploy-key list --repo <user>/<repo>")
-    print(f"   # Find keys titled '{machine_id}' and delete them:")
-    print("   gh repo deploy-key delete <key-id> --repo <user>/<repo>")
-    print()
-    print("4. Destroy remote machine:")
-    print("   Option A: Delete user only")
-    print("     ssh root@<ip> 'pkill -u agentwire; userdel -r agentwire'")
-    print("   Option B: Destroy the VM entirely via provider console")
-    print()
-    print("5. Restart portal to pick up changes:")
-    print("   agentwire portal stop && agentwire portal start")
-    print()
+    sys.stdout.write(_MACHINE_REMOVAL_STEPS.format(machine_id=machine_id))
 
     return 0
 
@@ -4901,7 +5145,7 @@ def cmd_machine_remove(args) -> int:
 def cmd_machine_list(args) -> int:
     """List registered machines."""
     json_mode = getattr(args, 'json', False)
-    machines_file = CONFIG_DIR / "machines.json"
+    machines_file = MACHINES_FILE
 
     if not machines_file.exists():
         if json_mode:
@@ -4912,8 +5156,7 @@ def cmd_machine_list(args) -> int:
         return 0
 
     try:
-        with open(machines_file) as f:
-            machines_data = json.load(f)
+        machines_data = _load_json(machines_file)
     except json.JSONDecodeError as e:
         if json_mode:
             _output_json({"success": False, "error": f"Invalid machines.json: {e}"})
@@ -4930,7 +5173,8 @@ def cmd_machine_list(args) -> int:
             print("No machines registered.")
         return 0
 
-    # Enrich with tunnel status
+    # Enrich with tunnel status (one process scan for all machines)
+    tunnels = _scan_autossh_tunnels(m.get("id", "?") for m in machines)
     result_machines = []
     for m in machines:
         machine_id = m.get("id", "?")
@@ -4938,12 +5182,7 @@ def cmd_machine_list(args) -> int:
         user = m.get("user", "")
         projects_dir = m.get("projects_dir", "~")
 
-        # Check if tunnel is running
-        result = subprocess.run(
-            ["pgrep", "-f", f"autossh.*{machine_id}"],
-            capture_output=True,
-        )
-        has_tunnel = result.returncode == 0
+        has_tunnel = bool(tunnels[machine_id])
 
         result_machines.append({
             "id": machine_id,
@@ -4956,15 +5195,17 @@ def cmd_machine_list(args) -> int:
     if json_mode:
         _output_json({"success": True, "machines": result_machines})
     else:
-        print(f"Registered machines ({len(machines)}):")
-        print()
+        lines = [f"Registered machines ({len(machines)}):", ""]
         for m in result_machines:
             tunnel_status = "✓ tunnel" if m["status"] == "tunnel" else "✗ no tunnel"
-            print(f"  {m['id']}")
-            print(f"    Host: {m['host']}")
-            print(f"    Projects: {m['projects_dir']}")
-            print(f"    Status: {tunnel_status}")
-            print()
+            lines += [
+                f"  {m['id']}",
+                f"    Host: {m['host']}",
+                f"    Projects: {m['projects_dir']}",
+                f"    Status: {tunnel_status}",
+                "",
+            ]
+        sys.stdout.write("\n".join(lines) + "\n")
 
     return 0
 
@@ -4978,8 +5219,7 @@ def cmd_dev(args) -> int:
 
     if tmux_session_exists(session_name):
         print(f"Dev session exists. Attaching to '{session_name}'...")
-        subprocess.run(["tmux", "attach-session", "-t", session_name])
-        return 0
+        return _exec_tmux_attach(session_name)
 
     if not project_dir.exists():
         print(f"Project directory not found: {project_dir}", file=sys.stderr)
@@ -5007,21 +5247,24 @@ def cmd_dev(args) -> int:
 
     agent_cmd = agent.command
 
-    # Create session
-    print(f"Creating dev session '{session_name}' in {project_dir}...")
-    subprocess.run([
-        "tmux", "new-session", "-d", "-s", session_name, "-c", str(project_dir),
-    ])
-
-    # Start agent with agentwire config
+    # Create session and start agent in a single tmux invocation (";"
+    # separates commands that the tmux server runs in order). If the session
+    # was created since the check above, new-session fails and tmux skips
+    # the rest of the chain; attach to it instead.
+    print(f"Starting dev session '{session_name}' in {project_dir}...")
+    tmux_cmd = [_TMUX, "new-session", "-d", "-s", session_name, "-c", str(project_dir)]
     if agent_cmd:
-        subprocess.run([
-            "tmux", "send-keys", "-t", session_name, agent_cmd, "Enter",
-        ])
+        tmux_cmd += [";", "send-keys", "-t", session_name, agent_cmd, "Enter"]
 
-    print("Attaching... (Ctrl+B D to detach)")
-    subprocess.run(["tmux", "attach-session", "-t", session_name])
-    return 0
+    result = subprocess.run(tmux_cmd, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        if "duplicate session" not in result.stderr:
+            print(result.stderr, end="", file=sys.stderr)
+            return 1
+        print(f"Dev session exists. Attaching to '{session_name}'...")
+    else:
+        print("Attaching... (Ctrl+B D to detach)")
+    return _exec_tmux_attach(session_name)
 
 
 # === Init Command ===
@@ -5055,7 +5298,7 @@ def cmd_init(args) -> int:
 
 def cmd_generate_certs(args) -> int:
     """Generate SSL certificates."""
-    return generate_certs()
+    return generate_certs("rsa" if getattr(args, "rsa", False) else "ec")
 
 
 # === Listen Commands ===
@@ -5095,6 +5338,8 @@ def cmd_listen_toggle(args) -> int:
 
 def cmd_network_status(args) -> int:
     """Show complete network health at a glance."""
+    import socket
+
     from .network import NetworkContext
     from .tunnels import TunnelManager, test_service_health, test_ssh_connectivity
 
@@ -5199,7 +5444,7 @@ def cmd_network_status(args) -> int:
 
     # Local sessions
     result = subprocess.run(
-        ["tmux", "list-sessions", "-F", "#{session_name}"],
+        [_TMUX, "list-sessions", "-F", "#{session_name}"],
         capture_output=True,
         text=True,
     )
@@ -5280,28 +5525,34 @@ def cmd_network_status(args) -> int:
 
 def cmd_safety_check(args) -> int:
     """CLI command: agentwire safety check"""
+    from .cli_safety import safety_check_cmd
+
     command = args.command
     verbose = getattr(args, 'verbose', False)
-    return cli_safety.safety_check_cmd(command, verbose)
+    return safety_check_cmd(command, verbose)
 
 
 def cmd_safety_status(args) -> int:
     """CLI command: agentwire safety status"""
-    return cli_safety.safety_status_cmd()
+    from .cli_safety import safety_status_cmd
+    return safety_status_cmd()
 
 
 def cmd_safety_logs(args) -> int:
     """CLI command: agentwire safety logs"""
+    from .cli_safety import safety_logs_cmd
+
     tail = getattr(args, 'tail', None)
     session = getattr(args, 'session', None)
     today = getattr(args, 'today', False)
     pattern = getattr(args, 'pattern', None)
-    return cli_safety.safety_logs_cmd(tail, session, today, pattern)
+    return safety_logs_cmd(tail, session, today, pattern)
 
 
 def cmd_safety_install(args) -> int:
     """CLI command: agentwire safety install"""
-    return cli_safety.safety_install_cmd()
+    from .cli_safety import safety_install_cmd
+    return safety_install_cmd()
 
 
 def cmd_doctor(args) -> int:
@@ -5391,7 +5642,7 @@ def cmd_doctor(args) -> int:
 
     # Check OpenCode plugin
     print("\nChecking OpenCode plugin...")
-    opencode_plugin = Path.home() / ".config" / "opencode" / "plugin" / "agentwire-notify.ts"
+    opencode_plugin = HOME / ".config" / "opencode" / "plugin" / "agentwire-notify.ts"
     if opencode_plugin.exists():
         print(f"  [ok] OpenCode plugin: {opencode_plugin}")
     else:
@@ -5399,7 +5650,7 @@ def cmd_doctor(args) -> int:
         print("     Copy from agentwire source or install manually.")
 
     # Check queue processor
-    queue_processor = Path.home() / ".agentwire" / "queue-processor.sh"
+    queue_processor = CONFIG_DIR / "queue-processor.sh"
     if queue_processor.exists():
         print(f"  [ok] Queue processor: {queue_processor}")
     else:
@@ -5521,13 +5772,11 @@ def cmd_doctor(args) -> int:
                             if tmux_session_exists(session_name):
                                 print("[ok] already running in tmux")
                             else:
-                                subprocess.run(
-                                    ["tmux", "new-session", "-d", "-s", session_name],
-                                    capture_output=True,
-                                )
-                                subprocess.run(
-                                    ["tmux", "send-keys", "-t", session_name, "agentwire portal serve", "Enter"],
-                                    capture_output=True,
+                                _tmux_new_session(
+                                    session_name,
+                                    "agentwire portal serve",
+                                    stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL,
                                 )
                                 print("[ok] started")
                                 issues_fixed += 1
@@ -5537,13 +5786,11 @@ def cmd_doctor(args) -> int:
                             if tmux_session_exists(session_name):
                                 print("[ok] already running in tmux")
                             else:
-                                subprocess.run(
-                                    ["tmux", "new-session", "-d", "-s", session_name],
-                                    capture_output=True,
-                                )
-                                subprocess.run(
-                                    ["tmux", "send-keys", "-t", session_name, "agentwire tts serve", "Enter"],
-                                    capture_output=True,
+                                _tmux_new_session(
+                                    session_name,
+                                    "agentwire tts serve",
+                                    stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL,
                                 )
                                 print("[ok] started")
                                 issues_fixed += 1
@@ -5764,7 +6011,24 @@ def cmd_voiceclone_delete(args) -> int:
 
 # === Rebuild/Uninstall Commands ===
 
-UV_CACHE_DIR = Path.home() / ".cache" / "uv"
+UV_CACHE_DIR = HOME / ".cache" / "uv"
+
+
+def _async_rmtree(path: Path) -> None:
+    """Move a directory aside and delete it in a detached background process.
+
+    The rename is a single syscall, so the caller returns immediately
+    while the (potentially huge) tree is unlinked in the background.
+    """
+    trash = path.parent / f".{path.name}.trash-{os.getpid()}-{time.time_ns()}"
+    os.rename(path, trash)
+    subprocess.Popen(
+        ["rm", "-rf", str(trash)],
+        start_new_session=True,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
 
 
 def cmd_rebuild(args) -> int:
@@ -5779,7 +6043,7 @@ def cmd_rebuild(args) -> int:
     # Step 1: Clear uv cache
     if UV_CACHE_DIR.exists():
         print(f"Clearing uv cache ({UV_CACHE_DIR})...")
-        shutil.rmtree(UV_CACHE_DIR)
+        _async_rmtree(UV_CACHE_DIR)
         print("  ✓ Cache cleared")
     else:
         print("  - No cache to clear")
@@ -5788,8 +6052,8 @@ def cmd_rebuild(args) -> int:
     print("Uninstalling agentwire-dev...")
     result = subprocess.run(
         ["uv", "tool", "uninstall", "agentwire-dev"],
-        capture_output=True,
-        text=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
     )
     if result.returncode == 0:
         print("  ✓ Uninstalled")
@@ -5805,8 +6069,9 @@ def cmd_rebuild(args) -> int:
         project_root = get_source_dir()
 
     print(f"Installing from {project_root}...")
+    # Compile bytecode at install time so the first CLI run doesn't pay for it
     result = subprocess.run(
-        ["uv", "tool", "install", "."],
+        ["uv", "tool", "install", "--compile-bytecode", "."],
         cwd=project_root,
         capture_output=True,
         text=True,
@@ -5829,7 +6094,7 @@ def cmd_uninstall(args) -> int:
     # Step 1: Clear uv cache
     if UV_CACHE_DIR.exists():
         print(f"Clearing uv cache ({UV_CACHE_DIR})...")
-        shutil.rmtree(UV_CACHE_DIR)
+        _async_rmtree(UV_CACHE_DIR)
         print("  ✓ Cache cleared")
     else:
         print("  - No cache to clear")
@@ -5848,7 +6113,7 @@ def cmd_uninstall(args) -> int:
 
     print()
     print("Uninstall complete.")
-    print(f"To reinstall: cd {get_source_dir()} && uv tool install .")
+    print(f"To reinstall: cd {get_source_dir()} && uv tool install --compile-bytecode .")
     return 0
 
 
@@ -5868,7 +6133,7 @@ def cmd_mcp(args) -> int:
 
 # === Hooks Commands ===
 
-CLAUDE_HOOKS_DIR = Path.home() / ".claude" / "hooks"
+CLAUDE_HOOKS_DIR = HOME / ".claude" / "hooks"
 
 
 # =============================================================================
@@ -5876,6 +6141,19 @@ CLAUDE_HOOKS_DIR = Path.home() / ".claude" / "hooks"
 # =============================================================================
 
 
+def _scan_md_files(directory: Path) -> list[Path]:
+    """List *.md files in a directory with a single scandir pass.
+
+    Returns an empty list if the directory doesn't exist.
+    """
+    try:
+        with os.scandir(directory) as it:
+            names = sorted(e.name for e in it if e.name.endswith(".md") and e.is_file())
+    except FileNotFoundError:
+        return []
+    return [directory / name for name in names]
+
+
 def cmd_roles_list(args) -> int:
     """List available roles from all sources."""
     from .roles import parse_role_file
@@ -5886,38 +6164,37 @@ def cmd_roles_list(args) -> int:
     roles_data = []
 
     # User roles (~/.agentwire/roles/)
-    user_roles_dir = Path.home() / ".agentwire" / "roles"
-    if user_roles_dir.exists():
-        for role_file in user_roles_dir.glob("*.md"):
+    user_roles_dir = CONFIG_DIR / "roles"
+    for role_file in _scan_md_files(user_roles_dir):
+        role = parse_role_file(role_file)
+        if role:
+            roles_data.append({
+                "name": role.name,
+                "description": role.description,
+                "source": "user",
+                "path": str(role_file),
+                "disallowed_tools": role.disallowed_tools,
+                "model": role.model,
+            })
+
+    # Bundled roles (agentwire/roles/)
+    try:
+        bundled_dir = Path(__file__).parent / "roles"
+        user_role_names = {r["name"] for r in roles_data}
+        for role_file in _scan_md_files(bundled_dir):
+            # Skip if user already has this role
+            if role_file.stem in user_role_names:
+                continue
             role = parse_role_file(role_file)
             if role:
                 roles_data.append({
                     "name": role.name,
                     "description": role.description,
-                    "source": "user",
+                    "source": "bundled",
                     "path": str(role_file),
                     "disallowed_tools": role.disallowed_tools,
                     "model": role.model,
                 })
-
-    # Bundled roles (agentwire/roles/)
-    try:
-        bundled_dir = Path(__file__).parent / "roles"
-        if bundled_dir.exists():
-            for role_file in bundled_dir.glob("*.md"):
-                # Skip if user already has this role
-                if any(r["name"] == role_file.stem for r in roles_data):
-                    continue
-                role = parse_role_file(role_file)
-                if role:
-                    roles_data.append({
-                        "name": role.name,
-                        "description": role.description,
-                        "source": "bundled",
-                        "path": str(role_file),
-                        "disallowed_tools": role.disallowed_tools,
-                        "model": role.model,
-                    })
     except Exception:
         pass
 
@@ -6039,8 +6316,11 @@ def cmd_roles_show(args) -> int:
     return 0
 
 
+@functools.lru_cache(maxsize=1)
 def get_hooks_source() -> Path:
     """Get the path to the hooks directory in the installed package."""
+    import importlib.resources
+
     # First try: hooks directory inside the agentwire package
     package_dir = Path(__file__).parent
     hooks_dir = package_dir / "hooks"
@@ -6077,7 +6357,7 @@ def register_hook_in_settings() -> bool:
       }
     }
     """
-    settings_file = Path.home() / ".claude" / "settings.json"
+    settings_file = HOME / ".claude" / "settings.json"
     # Use ~ for portability
     hook_command = "~/.claude/hooks/agentwire-permission.sh"
 
@@ -6146,8 +6426,9 @@ def install_permission_hook(force: bool = False, copy: bool = False) -> bool:
     file_updated = False
     if target_hook.exists():
         if target_hook.is_symlink():
-            current_target = target_hook.resolve()
-            if current_target == source_hook.resolve() and not force:
+            # We always create absolute links, so compare the raw link target
+            # instead of canonicalizing both paths
+            if os.readlink(target_hook) == str(source_hook) and not force:
                 file_updated = False  # File already correctly installed
             else:
                 target_hook.unlink()
@@ -6192,7 +6473,7 @@ def unregister_hook_from_settings() -> bool:
 
     Returns True if settings were updated, False if not found.
     """
-    settings_file = Path.home() / ".claude" / "settings.json"
+    settings_file = HOME / ".claude" / "settings.json"
     hook_command = "~/.claude/hooks/agentwire-permission.sh"
 
     if not settings_file.exists():
@@ -6236,7 +6517,7 @@ def unregister_hook_from_settings() -> bool:
 
 def is_hook_registered() -> bool:
     """Check if the permission hook is registered in Claude's settings.json."""
-    settings_file = Path.home() / ".claude" / "settings.json"
+    settings_file = HOME / ".claude" / "settings.json"
     hook_command = "~/.claude/hooks/agentwire-permission.sh"
 
     if not settings_file.exists():
@@ -6289,7 +6570,7 @@ def cmd_hooks_status(args) -> int:
 
     if hook_installed:
         if hook_file.is_symlink():
-            source = hook_file.resolve()
+            source = os.readlink(hook_file)
             print("Status: installed (symlink)")
             print(f"  Location: {hook_file} -> {source}")
         else:
@@ -6308,7 +6589,7 @@ def cmd_hooks_status(args) -> int:
     try:
         # Check global hooks first
         global_result = subprocess.run(
-            ["tmux", "show-hooks", "-g"],
+            [_TMUX, "show-hooks", "-g"],
             capture_output=True,
             text=True,
         )
@@ -6330,7 +6611,7 @@ def cmd_hooks_status(args) -> int:
 
         # Get list of sessions for per-session hooks
         result = subprocess.run(
-            ["tmux", "list-sessions", "-F", "#{session_name}"],
+            [_TMUX, "list-sessions", "-F", "#{session_name}"],
             capture_output=True,
             text=True,
         )
@@ -6344,7 +6625,7 @@ def cmd_hooks_status(args) -> int:
             print("\nPer-session hooks:")
             for session in sessions:
                 hooks_result = subprocess.run(
-                    ["tmux", "show-hooks", "-t", session],
+                    [_TMUX, "show-hooks", "-t", session],
                     capture_output=True,
                     text=True,
                 )
@@ -6764,6 +7045,7 @@ def _run_ensure_task(args, session, task, ctx, shell, project_path, timeout, jso
     4. Wait for completion signal file
     5. Read and parse summary
     """
+    from . import pane_manager
     from .completion import (
         CompletionTimeout,
         clear_task_context,
@@ -6786,7 +7068,8 @@ def _run_ensure_task(args, session, task, ctx, shell, project_path, timeout, jso
         if not json_mode and max_attempts > 1:
             print(f"Attempt {attempt}/{max_attempts}")
 
-        # Ensure session exists
+        # Ensure session exists (it may have exited since the last attempt)
+        _tmux_sessions.cache_clear()
         if not tmux_session_exists(session):
             if not json_mode:
                 print(f"Creating session '{session}'...")
@@ -6908,7 +7191,7 @@ def _run_ensure_task(args, session, task, ctx, shell, project_path, timeout, jso
 
         # Capture output
         output_result = subprocess.run(
-            ["tmux", "capture-pane", "-t", session, "-p", "-S", f"-{task.output.capture}"],
+            [_TMUX, "capture-pane", "-t", session, "-p", "-S", f"-{task.output.capture}"],
             capture_output=True,
             text=True,
         )
@@ -6974,6 +7257,8 @@ def _run_ensure_task(args, session, task, ctx, shell, project_path, timeout, jso
 
 def _handle_task_notification(notify_config: str, ctx, session: str, json_mode: bool) -> None:
     """Handle task notification based on config."""
+    import datetime
+
     from .templating import expand_all, expand_env_vars
 
     if notify_config == "voice":
@@ -6981,14 +7266,14 @@ def _handle_task_notification(notify_config: str, ctx, session: str, json_mode:
         message = f"Task {ctx.task} {ctx.status}"
         if ctx.summary:
             message += f": {ctx.summary}"
-        subprocess.run(["agentwire", "say", "-s", session, message], capture_output=True)
+        subprocess.run(["agentwire", "say", "-s", session, message], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
     elif notify_config == "alert":
         # Send text alert
         message = f"Task {ctx.task} {ctx.status}"
         if ctx.summary:
             message += f": {ctx.summary}"
-        subprocess.run(["agentwire", "alert", "--to", session, message], capture_output=True)
+        subprocess.run(["agentwire", "alert", "--to", session, message], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
     elif notify_config.startswith("webhook "):
         # POST to webhook URL
@@ -7019,7 +7304,7 @@ def _handle_task_notification(notify_config: str, ctx, session: str, json_mode:
         cmd = notify_config[8:].strip()
         try:
             expanded = expand_all(cmd, ctx)
-            subprocess.run(expanded, shell=True, capture_output=True, timeout=30)
+            subprocess.run(expanded, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30)
         except Exception as e:
             if not json_mode:
                 print(f"Warning: Notification command failed: {e}")
@@ -7311,54 +7596,35 @@ def cmd_lock(args) -> int:
     return 0
 
 
-class VersionAction(argparse.Action):
-    """Custom version action that checks Python version and pip environment."""
-
-    def __init__(self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS, help=None):
-        super().__init__(option_strings, dest=dest, default=default, nargs=0, help=help)
-
-    def __call__(self, parser, namespace, values, option_string=None):
-        # Print version
-        print(f"agentwire {__version__}")
-        print(f"Python {sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}")
+def _print_version() -> None:
+    """Print version info and check Python version and pip environment."""
+    print(f"agentwire {__version__}")
+    print(f"Python {sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}")
 
-        # Check version compatibility
-        version_ok = check_python_version()
-        env_ok = check_pip_environment()
+    # Check version compatibility
+    version_ok = check_python_version()
+    env_ok = check_pip_environment()
 
-        if version_ok and env_ok:
-            print("\n✓ System is ready for AgentWire")
-        else:
-            print("\n⚠️  Please resolve the issues above before installing/running AgentWire")
-
-        parser.exit()
-
-
-def main() -> int:
-    """Main entry point."""
-    parser = argparse.ArgumentParser(
-        prog="agentwire",
-        description="Multi-session voice web interface for AI coding agents.",
-    )
-    parser.add_argument(
-        "--version",
-        action=VersionAction,
-        help="Show version and check system compatibility",
-    )
+    if version_ok and env_ok:
+        print("\n✓ System is ready for AgentWire")
+    else:
+        print("\n⚠️  Please resolve the issues above before installing/running AgentWire")
 
-    subparsers = parser.add_subparsers(dest="command", help="Commands")
 
-    # === init command ===
+def _build_init_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `init` command."""
     init_parser = subparsers.add_parser("init", help="Interactive setup wizard")
     init_parser.add_argument(
         "--quick", action="store_true",
         help="Quick mode: skip agentwire setup at end"
     )
-    init_parser.set_defaults(func=cmd_init)
+    return init_parser
+
 
-    # === portal command group ===
+def _build_portal_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `portal` command."""
     portal_parser = subparsers.add_parser("portal", help="Manage the web portal")
-    portal_subparsers = portal_parser.add_subparsers(dest="portal_command")
+    portal_subparsers = portal_parser.add_subparsers(dest="portal_command", prog=portal_parser.prog)
 
     # portal start
     portal_start = portal_subparsers.add_parser(
@@ -7371,7 +7637,6 @@ def main() -> int:
     portal_start.add_argument("--no-stt", action="store_true", help="Disable STT")
     portal_start.add_argument("--dev", action="store_true",
                               help="Run from source (uv run) - picks up code changes")
-    portal_start.set_defaults(func=cmd_portal_start)
 
     # portal serve (run in foreground)
     portal_serve = portal_subparsers.add_parser(
@@ -7382,16 +7647,13 @@ def main() -> int:
     portal_serve.add_argument("--host", type=str, help="Override host")
     portal_serve.add_argument("--no-tts", action="store_true", help="Disable TTS")
     portal_serve.add_argument("--no-stt", action="store_true", help="Disable STT")
-    portal_serve.set_defaults(func=cmd_portal_serve)
 
     # portal stop
-    portal_stop = portal_subparsers.add_parser("stop", help="Stop the portal")
-    portal_stop.set_defaults(func=cmd_portal_stop)
+    portal_subparsers.add_parser("stop", help="Stop the portal")
 
     # portal status
     portal_status = portal_subparsers.add_parser("status", help="Check portal status")
     portal_status.add_argument("--json", action="store_true", help="Output JSON")
-    portal_status.set_defaults(func=cmd_portal_status)
 
     # portal restart
     portal_restart = portal_subparsers.add_parser("restart", help="Restart the portal (stop + start)")
@@ -7402,17 +7664,22 @@ def main() -> int:
     portal_restart.add_argument("--no-stt", action="store_true", help="Disable STT")
     portal_restart.add_argument("--dev", action="store_true",
                                 help="Run from source (uv run) - picks up code changes")
-    portal_restart.set_defaults(func=cmd_portal_restart)
 
     # portal generate-certs
     portal_certs = portal_subparsers.add_parser(
         "generate-certs", help="Generate SSL certificates"
     )
-    portal_certs.set_defaults(func=cmd_generate_certs)
+    portal_certs.add_argument(
+        "--rsa", action="store_true",
+        help="Use an RSA-2048 key instead of ECDSA P-256"
+    )
+    return portal_parser
+
 
-    # === tts command group ===
+def _build_tts_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `tts` command."""
     tts_parser = subparsers.add_parser("tts", help="Manage TTS server")
-    tts_subparsers = tts_parser.add_subparsers(dest="tts_command")
+    tts_subparsers = tts_parser.add_subparsers(dest="tts_command", prog=tts_parser.prog)
 
     # tts start
     tts_start = tts_subparsers.add_parser("start", help="Start TTS server in tmux")
@@ -7421,7 +7688,6 @@ def main() -> int:
     tts_start.add_argument("--backend", type=str,
                            choices=["chatterbox", "chatterbox-streaming", "qwen-base-0.6b", "qwen-base-1.7b", "qwen-design", "qwen-custom"],
                            help="TTS backend (default: chatterbox)")
-    tts_start.set_defaults(func=cmd_tts_start)
 
     # tts serve (run in foreground)
     tts_serve = tts_subparsers.add_parser("serve", help="Run TTS server in foreground")
@@ -7433,11 +7699,9 @@ def main() -> int:
     tts_serve.add_argument("--venv", type=str,
                            choices=["chatterbox", "qwen"],
                            help="Which venv family is running (for hot-swap detection)")
-    tts_serve.set_defaults(func=cmd_tts_serve)
 
     # tts stop
-    tts_stop = tts_subparsers.add_parser("stop", help="Stop TTS server")
-    tts_stop.set_defaults(func=cmd_tts_stop)
+    tts_subparsers.add_parser("stop", help="Stop TTS server")
 
     # tts restart
     tts_restart = tts_subparsers.add_parser("restart", help="Restart TTS server (with optional venv switch)")
@@ -7449,61 +7713,60 @@ def main() -> int:
     tts_restart.add_argument("--venv", type=str,
                              choices=["chatterbox", "qwen"],
                              help="Force specific venv family")
-    tts_restart.set_defaults(func=cmd_tts_restart)
 
     # tts status
     tts_status = tts_subparsers.add_parser("status", help="Check TTS status")
     tts_status.add_argument("--json", action="store_true", help="Output JSON")
-    tts_status.set_defaults(func=cmd_tts_status)
+    return tts_parser
 
-    # === stt command group ===
+
+def _build_stt_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `stt` command."""
     stt_parser = subparsers.add_parser("stt", help="Manage STT server (native Whisper)")
-    stt_subparsers = stt_parser.add_subparsers(dest="stt_command")
+    stt_subparsers = stt_parser.add_subparsers(dest="stt_command", prog=stt_parser.prog)
 
     # stt start
     stt_start = stt_subparsers.add_parser("start", help="Start STT server in tmux")
     stt_start.add_argument("--port", type=int, help="Server port (default: 8100)")
     stt_start.add_argument("--host", type=str, help="Server host (default: 0.0.0.0)")
     stt_start.add_argument("--model", type=str, help="Whisper model (tiny/base/small/medium/large-v3)")
-    stt_start.set_defaults(func=cmd_stt_start)
 
     # stt serve
     stt_serve = stt_subparsers.add_parser("serve", help="Run STT server in foreground")
     stt_serve.add_argument("--port", type=int, help="Server port (default: 8100)")
     stt_serve.add_argument("--host", type=str, help="Server host (default: 0.0.0.0)")
     stt_serve.add_argument("--model", type=str, help="Whisper model (tiny/base/small/medium/large-v3)")
-    stt_serve.set_defaults(func=cmd_stt_serve)
 
     # stt stop
-    stt_stop = stt_subparsers.add_parser("stop", help="Stop STT server")
-    stt_stop.set_defaults(func=cmd_stt_stop)
+    stt_subparsers.add_parser("stop", help="Stop STT server")
 
     # stt status
     stt_status = stt_subparsers.add_parser("status", help="Check STT status")
     stt_status.add_argument("--json", action="store_true", help="Output JSON")
-    stt_status.set_defaults(func=cmd_stt_status)
+    return stt_parser
+
 
-    # === tunnels command group ===
+def _build_tunnels_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `tunnels` command."""
     tunnels_parser = subparsers.add_parser("tunnels", help="Manage SSH tunnels for service routing")
-    tunnels_subparsers = tunnels_parser.add_subparsers(dest="tunnels_command")
+    tunnels_subparsers = tunnels_parser.add_subparsers(dest="tunnels_command", prog=tunnels_parser.prog)
 
     # tunnels up
-    tunnels_up = tunnels_subparsers.add_parser("up", help="Create all required tunnels")
-    tunnels_up.set_defaults(func=cmd_tunnels_up)
+    tunnels_subparsers.add_parser("up", help="Create all required tunnels")
 
     # tunnels down
-    tunnels_down = tunnels_subparsers.add_parser("down", help="Tear down all tunnels")
-    tunnels_down.set_defaults(func=cmd_tunnels_down)
+    tunnels_subparsers.add_parser("down", help="Tear down all tunnels")
 
     # tunnels status
-    tunnels_status = tunnels_subparsers.add_parser("status", help="Show tunnel health")
-    tunnels_status.set_defaults(func=cmd_tunnels_status)
+    tunnels_subparsers.add_parser("status", help="Show tunnel health")
 
     # tunnels check
-    tunnels_check = tunnels_subparsers.add_parser("check", help="Verify tunnels are working")
-    tunnels_check.set_defaults(func=cmd_tunnels_check)
+    tunnels_subparsers.add_parser("check", help="Verify tunnels are working")
+    return tunnels_parser
 
-    # === say command ===
+
+def _build_say_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `say` command."""
     say_parser = subparsers.add_parser("say", help="Speak text via TTS")
     say_parser.add_argument("text", nargs="*", help="Text to speak")
     say_parser.add_argument("-v", "--voice", type=str, help="Voice name")
@@ -7516,17 +7779,20 @@ def main() -> int:
     say_parser.add_argument("--stream", action="store_true", help="Use streaming mode (if backend supports)")
     say_parser.add_argument("--notify", type=str, metavar="SESSION", help="Also notify this session (sends message as input)")
     say_parser.add_argument("--no-auto-notify", action="store_true", help="Disable auto-notify to pane 0 when in worker pane")
-    say_parser.set_defaults(func=cmd_say)
+    return say_parser
+
 
-    # === alert command ===
+def _build_alert_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `alert` command."""
     alert_parser = subparsers.add_parser("alert", help="Send text notification to parent (no audio)")
     alert_parser.add_argument("text", nargs="*", help="Message to send")
     alert_parser.add_argument("--to", type=str, metavar="SESSION", help="Target session (default: parent from .agentwire.yml)")
     alert_parser.add_argument("-q", "--quiet", action="store_true", help="Suppress output")
-    alert_parser.set_defaults(func=cmd_alert)
+    return alert_parser
+
 
-    # === email command ===
-    from agentwire.notifications import cmd_email
+def _build_email_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `email` command."""
     email_parser = subparsers.add_parser("email", help="Send branded email notification via Resend")
     email_parser.add_argument("--to", type=str, help="Recipient email (default: from config)")
     email_parser.add_argument("--subject", "-s", type=str, help="Email subject")
@@ -7534,9 +7800,11 @@ def main() -> int:
     email_parser.add_argument("--attach", "-a", type=str, action="append", help="Attach file (can use multiple times)")
     email_parser.add_argument("--plain", action="store_true", help="Send plain text only (no HTML template)")
     email_parser.add_argument("-q", "--quiet", action="store_true", help="Suppress success output")
-    email_parser.set_defaults(func=cmd_email)
+    return email_parser
 
-    # === notify command ===
+
+def _build_notify_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `notify` command."""
     notify_parser = subparsers.add_parser("notify", help="Notify portal of session/pane state changes")
     notify_parser.add_argument(
         "event",
@@ -7549,34 +7817,42 @@ def main() -> int:
     notify_parser.add_argument("--old-name", help="Old session name (for session_renamed)")
     notify_parser.add_argument("--new-name", help="New session name (for session_renamed)")
     notify_parser.add_argument("--json", action="store_true", help="Output as JSON")
-    notify_parser.set_defaults(func=cmd_notify)
+    return notify_parser
+
 
-    # === send command ===
+def _build_send_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `send` command."""
     send_parser = subparsers.add_parser("send", help="Send prompt to a session or pane (adds Enter)")
     send_parser.add_argument("-s", "--session", help="Target session (supports session@machine)")
     send_parser.add_argument("--pane", type=int, help="Target pane index (auto-detects session)")
     send_parser.add_argument("prompt", nargs="*", help="Prompt to send")
     send_parser.add_argument("--json", action="store_true", help="Output as JSON")
-    send_parser.set_defaults(func=cmd_send)
+    return send_parser
 
-    # === send-keys command ===
+
+def _build_send_keys_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `send-keys` command."""
     send_keys_parser = subparsers.add_parser(
         "send-keys", help="Send raw keys to a session (with pause between groups)"
     )
     send_keys_parser.add_argument("-s", "--session", required=True, help="Target session (supports session@machine)")
     send_keys_parser.add_argument("keys", nargs="*", help="Key groups to send (e.g., 'hello world' Enter)")
-    send_keys_parser.set_defaults(func=cmd_send_keys)
+    return send_keys_parser
+
 
-    # === list command (top-level) ===
+def _build_list_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `list` command."""
     list_parser = subparsers.add_parser("list", help="List panes (in tmux) or sessions")
     list_parser.add_argument("--json", action="store_true", help="Output as JSON")
     list_parser.add_argument("--local", action="store_true", help="Only show local sessions")
     list_parser.add_argument("--remote", action="store_true", help="Only show remote sessions")
     list_parser.add_argument("--machine", help="Filter by specific machine ID")
     list_parser.add_argument("--sessions", action="store_true", help="Show sessions instead of panes")
-    list_parser.set_defaults(func=cmd_list)
+    return list_parser
 
-    # === new command (top-level) ===
+
+def _build_new_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `new` command."""
     new_parser = subparsers.add_parser("new", help="Create new Claude Code session")
     new_parser.add_argument("-s", "--session", required=True, help="Session name (project, project/branch, or project/branch@machine)")
     new_parser.add_argument("-p", "--path", help="Working directory (default: ~/projects/<name>)")
@@ -7586,31 +7862,39 @@ def main() -> int:
     # Roles
     new_parser.add_argument("--roles", help="Comma-separated list of roles (preserves existing config, defaults to agentwire for new projects)")
     new_parser.add_argument("--json", action="store_true", help="Output as JSON")
-    new_parser.set_defaults(func=cmd_new)
+    return new_parser
+
 
-    # === output command (top-level) ===
+def _build_output_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `output` command."""
     output_parser = subparsers.add_parser("output", help="Read session or pane output")
     output_parser.add_argument("-s", "--session", help="Session name (supports session@machine)")
     output_parser.add_argument("--pane", type=int, help="Target pane index (auto-detects session)")
     output_parser.add_argument("-n", "--lines", type=int, default=50, help="Lines to show (default: 50)")
     output_parser.add_argument("--json", action="store_true", help="Output as JSON")
-    output_parser.set_defaults(func=cmd_output)
+    return output_parser
+
 
-    # === info command (top-level) ===
+def _build_info_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `info` command."""
     info_parser = subparsers.add_parser("info", help="Get session information (cwd, panes, etc.)")
     info_parser.add_argument("-s", "--session", required=True, help="Session name (supports session@machine)")
     info_parser.add_argument("--json", action="store_true", default=True, help="Output as JSON (default)")
     info_parser.add_argument("--no-json", dest="json", action="store_false", help="Human-readable output")
-    info_parser.set_defaults(func=cmd_info)
+    return info_parser
 
-    # === kill command (top-level) ===
+
+def _build_kill_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `kill` command."""
     kill_parser = subparsers.add_parser("kill", help="Kill a session or pane (clean shutdown)")
     kill_parser.add_argument("-s", "--session", help="Session name (supports session@machine)")
     kill_parser.add_argument("--pane", type=int, help="Target pane index (auto-detects session)")
     kill_parser.add_argument("--json", action="store_true", help="Output as JSON")
-    kill_parser.set_defaults(func=cmd_kill)
+    return kill_parser
+
 
-    # === spawn command (top-level) ===
+def _build_spawn_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `spawn` command."""
     spawn_parser = subparsers.add_parser("spawn", help="Spawn a worker pane in current session")
     spawn_parser.add_argument("-s", "--session", help="Target session (default: auto-detect)")
     spawn_parser.add_argument("--cwd", help="Working directory (default: current)")
@@ -7620,59 +7904,75 @@ def main() -> int:
     spawn_parser.add_argument("--no-wait", action="store_true", help="Don't wait for worker to be ready (default: wait up to 30s)")
     spawn_parser.add_argument("--timeout", type=int, default=30, help="Seconds to wait for worker ready (default: 30)")
     spawn_parser.add_argument("--json", action="store_true", help="Output as JSON")
-    spawn_parser.set_defaults(func=cmd_spawn)
+    return spawn_parser
 
-    # === split command (top-level) ===
+
+def _build_split_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `split` command."""
     split_parser = subparsers.add_parser("split", help="Add terminal pane(s) with even vertical layout")
     split_parser.add_argument("-n", "--count", type=int, default=1, help="Number of panes to add (default: 1)")
     split_parser.add_argument("-s", "--session", help="Target session (default: auto-detect)")
     split_parser.add_argument("--cwd", help="Working directory (default: current)")
-    split_parser.set_defaults(func=cmd_split)
+    return split_parser
+
 
-    # === detach command (top-level) ===
+def _build_detach_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `detach` command."""
     detach_parser = subparsers.add_parser("detach", help="Move a pane to its own session")
     detach_parser.add_argument("--pane", type=int, required=True, help="Pane index to detach")
     detach_parser.add_argument("-s", "--session", required=True, help="Target session name (created if doesn't exist)")
     detach_parser.add_argument("--source", help="Source session (default: auto-detect)")
-    detach_parser.set_defaults(func=cmd_detach)
+    return detach_parser
 
-    # === jump command (top-level) ===
+
+def _build_jump_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `jump` command."""
     jump_parser = subparsers.add_parser("jump", help="Jump to (focus) a specific pane")
     jump_parser.add_argument("-s", "--session", help="Target session (default: auto-detect)")
     jump_parser.add_argument("--pane", type=int, required=True, help="Pane index to focus")
     jump_parser.add_argument("--json", action="store_true", help="Output as JSON")
-    jump_parser.set_defaults(func=cmd_jump)
+    return jump_parser
+
 
-    # === resize command (top-level) ===
+def _build_resize_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `resize` command."""
     resize_parser = subparsers.add_parser("resize", help="Resize window to fit largest client")
     resize_parser.add_argument("-s", "--session", help="Target session (default: auto-detect)")
     resize_parser.add_argument("--json", action="store_true", help="Output as JSON")
-    resize_parser.set_defaults(func=cmd_resize)
+    return resize_parser
+
 
-    # === recreate command (top-level) ===
+def _build_recreate_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `recreate` command."""
     recreate_parser = subparsers.add_parser("recreate", help="Destroy and recreate session with fresh worktree")
     recreate_parser.add_argument("-s", "--session", required=True, help="Session name (project/branch or project/branch@machine)")
     # Session type (supports Claude Code, OpenCode, and universal types)
     recreate_parser.add_argument("--type", help="Session type (bare, claude-bypass, claude-prompted, claude-restricted, opencode-bypass, opencode-prompted, opencode-restricted, standard, worker, voice)")
     recreate_parser.add_argument("--json", action="store_true", help="Output as JSON")
-    recreate_parser.set_defaults(func=cmd_recreate)
+    return recreate_parser
 
-    # === fork command (top-level) ===
+
+def _build_fork_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `fork` command."""
     fork_parser = subparsers.add_parser("fork", help="Fork a session into a new worktree")
     fork_parser.add_argument("-s", "--source", required=True, help="Source session (project or project/branch)")
     fork_parser.add_argument("-t", "--target", required=True, help="Target session (must include branch: project/new-branch)")
     # Session type (supports Claude Code, OpenCode, and universal types)
     fork_parser.add_argument("--type", help="Session type (bare, claude-bypass, claude-prompted, claude-restricted, opencode-bypass, opencode-prompted, opencode-restricted, standard, worker, voice)")
     fork_parser.add_argument("--json", action="store_true", help="Output as JSON")
-    fork_parser.set_defaults(func=cmd_fork)
+    return fork_parser
+
 
-    # === dev command ===
+def _build_dev_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `dev` command."""
     dev_parser = subparsers.add_parser(
         "dev", help="Start/attach to dev agentwire session"
     )
-    dev_parser.set_defaults(func=cmd_dev)
+    return dev_parser
 
-    # === listen command group ===
+
+def _build_listen_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `listen` command."""
     listen_parser = subparsers.add_parser("listen", help="Voice input recording")
     listen_parser.add_argument(
         "--session", "-s", type=str, default="agentwire",
@@ -7682,73 +7982,68 @@ def main() -> int:
         "--no-prompt", action="store_true",
         help="Don't prepend voice prompt hint"
     )
-    listen_subparsers = listen_parser.add_subparsers(dest="listen_command")
+    listen_subparsers = listen_parser.add_subparsers(dest="listen_command", prog=listen_parser.prog)
 
     # listen start
-    listen_start = listen_subparsers.add_parser("start", help="Start recording")
-    listen_start.set_defaults(func=cmd_listen_start)
+    listen_subparsers.add_parser("start", help="Start recording")
 
     # listen stop
     listen_stop = listen_subparsers.add_parser("stop", help="Stop and send")
     listen_stop.add_argument("--session", "-s", type=str, help="Target session")
     listen_stop.add_argument("--no-prompt", action="store_true")
     listen_stop.add_argument("--type", action="store_true", help="Type at cursor instead of sending to session")
-    listen_stop.set_defaults(func=cmd_listen_stop)
 
     # listen cancel
-    listen_cancel = listen_subparsers.add_parser("cancel", help="Cancel recording")
-    listen_cancel.set_defaults(func=cmd_listen_cancel)
+    listen_subparsers.add_parser("cancel", help="Cancel recording")
+
+    return listen_parser
 
-    # Default listen (no subcommand) = toggle
-    listen_parser.set_defaults(func=cmd_listen_toggle)
 
-    # === voiceclone command group ===
+def _build_voiceclone_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `voiceclone` command."""
     voiceclone_parser = subparsers.add_parser(
         "voiceclone", help="Record and upload voice clones"
     )
-    voiceclone_subparsers = voiceclone_parser.add_subparsers(dest="voiceclone_command")
+    voiceclone_subparsers = voiceclone_parser.add_subparsers(dest="voiceclone_command", prog=voiceclone_parser.prog)
 
     # voiceclone start
-    voiceclone_start = voiceclone_subparsers.add_parser(
+    voiceclone_subparsers.add_parser(
         "start", help="Start recording for voice clone"
     )
-    voiceclone_start.set_defaults(func=cmd_voiceclone_start)
 
     # voiceclone stop <name>
     voiceclone_stop = voiceclone_subparsers.add_parser(
         "stop", help="Stop recording and upload as voice clone"
     )
     voiceclone_stop.add_argument("name", help="Name for the voice clone")
-    voiceclone_stop.set_defaults(func=cmd_voiceclone_stop)
 
     # voiceclone cancel
-    voiceclone_cancel = voiceclone_subparsers.add_parser(
+    voiceclone_subparsers.add_parser(
         "cancel", help="Cancel current recording"
     )
-    voiceclone_cancel.set_defaults(func=cmd_voiceclone_cancel)
 
     # voiceclone list
     voiceclone_list = voiceclone_subparsers.add_parser(
         "list", help="List available voices"
     )
     voiceclone_list.add_argument("--json", action="store_true", help="Output JSON")
-    voiceclone_list.set_defaults(func=cmd_voiceclone_list)
 
     # voiceclone delete <name>
     voiceclone_delete = voiceclone_subparsers.add_parser(
         "delete", help="Delete a voice clone"
     )
     voiceclone_delete.add_argument("name", help="Name of voice to delete")
-    voiceclone_delete.set_defaults(func=cmd_voiceclone_delete)
+    return voiceclone_parser
 
-    # === machine command group ===
+
+def _build_machine_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `machine` command."""
     machine_parser = subparsers.add_parser("machine", help="Manage remote machines")
-    machine_subparsers = machine_parser.add_subparsers(dest="machine_command")
+    machine_subparsers = machine_parser.add_subparsers(dest="machine_command", prog=machine_parser.prog)
 
     # machine list
     machine_list = machine_subparsers.add_parser("list", help="List registered machines")
     machine_list.add_argument("--json", action="store_true", help="Output JSON")
-    machine_list.set_defaults(func=cmd_machine_list)
 
     # machine add <id>
     machine_add = machine_subparsers.add_parser(
@@ -7758,18 +8053,19 @@ def main() -> int:
     machine_add.add_argument("--host", help="SSH host (defaults to machine_id)")
     machine_add.add_argument("--user", help="SSH user")
     machine_add.add_argument("--projects-dir", dest="projects_dir", help="Projects directory on remote")
-    machine_add.set_defaults(func=cmd_machine_add)
 
     # machine remove <id>
     machine_remove = machine_subparsers.add_parser(
         "remove", help="Remove a machine from the network"
     )
     machine_remove.add_argument("machine_id", help="Machine ID to remove")
-    machine_remove.set_defaults(func=cmd_machine_remove)
+    return machine_parser
+
 
-    # === history command group ===
+def _build_history_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `history` command."""
     history_parser = subparsers.add_parser("history", help="Claude Code session history")
-    history_subparsers = history_parser.add_subparsers(dest="history_command")
+    history_subparsers = history_parser.add_subparsers(dest="history_command", prog=history_parser.prog)
 
     # history list
     history_list = history_subparsers.add_parser("list", help="List conversation history")
@@ -7777,14 +8073,12 @@ def main() -> int:
     history_list.add_argument("--machine", "-m", default="local", help="Machine ID")
     history_list.add_argument("--limit", "-n", type=int, default=20, help="Max results")
     history_list.add_argument("--json", action="store_true", help="JSON output")
-    history_list.set_defaults(func=cmd_history_list)
 
     # history show <session_id>
     history_show = history_subparsers.add_parser("show", help="Show session details")
     history_show.add_argument("session_id", help="Session ID to show")
     history_show.add_argument("--machine", "-m", default="local", help="Machine ID")
     history_show.add_argument("--json", action="store_true", help="JSON output")
-    history_show.set_defaults(func=cmd_history_show)
 
     # history resume <session_id>
     history_resume = history_subparsers.add_parser("resume", help="Resume a session (always forks)")
@@ -7793,42 +8087,47 @@ def main() -> int:
     history_resume.add_argument("--machine", "-m", default="local", help="Machine ID")
     history_resume.add_argument("--project", "-p", required=True, help="Project path")
     history_resume.add_argument("--json", action="store_true", help="JSON output")
-    history_resume.set_defaults(func=cmd_history_resume)
+    return history_parser
 
-    # === roles command group ===
+
+def _build_roles_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `roles` command."""
     roles_parser = subparsers.add_parser(
         "roles", help="Manage composable roles"
     )
-    roles_subparsers = roles_parser.add_subparsers(dest="roles_command")
+    roles_subparsers = roles_parser.add_subparsers(dest="roles_command", prog=roles_parser.prog)
 
     # roles list
     roles_list = roles_subparsers.add_parser("list", help="List available roles")
     roles_list.add_argument("--json", action="store_true", help="Output as JSON")
-    roles_list.set_defaults(func=cmd_roles_list)
 
     # roles show <name>
     roles_show = roles_subparsers.add_parser("show", help="Show role details")
     roles_show.add_argument("name", help="Role name")
     roles_show.add_argument("--json", action="store_true", help="Output as JSON")
-    roles_show.set_defaults(func=cmd_roles_show)
+    return roles_parser
+
 
-    # === projects command group ===
+def _build_projects_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `projects` command."""
     projects_parser = subparsers.add_parser(
         "projects", help="Discover and list projects"
     )
-    projects_subparsers = projects_parser.add_subparsers(dest="projects_command")
+    projects_subparsers = projects_parser.add_subparsers(dest="projects_command", prog=projects_parser.prog)
 
     # projects list
     projects_list = projects_subparsers.add_parser("list", help="List discovered projects")
     projects_list.add_argument("--machine", help="Filter by machine ID (e.g., 'local', 'mac-studio')")
     projects_list.add_argument("--json", action="store_true", help="Output as JSON")
-    projects_list.set_defaults(func=cmd_projects_list)
+    return projects_parser
 
-    # === hooks command group ===
+
+def _build_hooks_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `hooks` command."""
     hooks_parser = subparsers.add_parser(
         "hooks", help="Manage Claude Code permission hook"
     )
-    hooks_subparsers = hooks_parser.add_subparsers(dest="hooks_command")
+    hooks_subparsers = hooks_parser.add_subparsers(dest="hooks_command", prog=hooks_parser.prog)
 
     # hooks install
     hooks_install = hooks_subparsers.add_parser(
@@ -7840,37 +8139,39 @@ def main() -> int:
     hooks_install.add_argument(
         "--copy", action="store_true", help="Copy files instead of symlinking"
     )
-    hooks_install.set_defaults(func=cmd_hooks_install)
 
     # hooks uninstall
-    hooks_uninstall = hooks_subparsers.add_parser(
+    hooks_subparsers.add_parser(
         "uninstall", help="Remove Claude Code permission hook"
     )
-    hooks_uninstall.set_defaults(func=cmd_hooks_uninstall)
 
     # hooks status
-    hooks_status = hooks_subparsers.add_parser(
+    hooks_subparsers.add_parser(
         "status", help="Check hook installation status"
     )
-    hooks_status.set_defaults(func=cmd_hooks_status)
+    return hooks_parser
+
 
-    # === network command group ===
+def _build_network_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `network` command."""
     network_parser = subparsers.add_parser(
         "network", help="Network diagnostics and status"
     )
-    network_subparsers = network_parser.add_subparsers(dest="network_command")
+    network_subparsers = network_parser.add_subparsers(dest="network_command", prog=network_parser.prog)
 
     # network status
-    network_status = network_subparsers.add_parser(
+    network_subparsers.add_parser(
         "status", help="Show complete network health at a glance"
     )
-    network_status.set_defaults(func=cmd_network_status)
+    return network_parser
 
-    # === safety command group ===
+
+def _build_safety_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `safety` command."""
     safety_parser = subparsers.add_parser(
         "safety", help="Damage control security commands"
     )
-    safety_subparsers = safety_parser.add_subparsers(dest="safety_command")
+    safety_subparsers = safety_parser.add_subparsers(dest="safety_command", prog=safety_parser.prog)
 
     # safety check <command>
     safety_check = safety_subparsers.add_parser(
@@ -7880,13 +8181,11 @@ def main() -> int:
     safety_check.add_argument(
         "--verbose", "-v", action="store_true", help="Verbose output"
     )
-    safety_check.set_defaults(func=cmd_safety_check)
 
     # safety status
-    safety_status = safety_subparsers.add_parser(
+    safety_subparsers.add_parser(
         "status", help="Show safety status and pattern counts"
     )
-    safety_status.set_defaults(func=cmd_safety_status)
 
     # safety logs
     safety_logs = safety_subparsers.add_parser(
@@ -7904,15 +8203,16 @@ def main() -> int:
     safety_logs.add_argument(
         "--pattern", "-p", help="Filter by pattern (regex or substring)"
     )
-    safety_logs.set_defaults(func=cmd_safety_logs)
 
     # safety install
-    safety_install = safety_subparsers.add_parser(
+    safety_subparsers.add_parser(
         "install", help="Install damage control hooks (interactive)"
     )
-    safety_install.set_defaults(func=cmd_safety_install)
+    return safety_parser
+
 
-    # === doctor command (top-level) ===
+def _build_doctor_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `doctor` command."""
     doctor_parser = subparsers.add_parser(
         "doctor", help="Auto-diagnose and fix common issues"
     )
@@ -7924,35 +8224,49 @@ def main() -> int:
         "-y", "--yes", action="store_true",
         help="Auto-confirm all fixes without prompting"
     )
-    doctor_parser.set_defaults(func=cmd_doctor)
+    return doctor_parser
 
-    # === generate-certs (top-level shortcut) ===
+
+def _build_generate_certs_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `generate-certs` command."""
     certs_parser = subparsers.add_parser(
         "generate-certs", help="Generate SSL certificates"
     )
-    certs_parser.set_defaults(func=cmd_generate_certs)
+    certs_parser.add_argument(
+        "--rsa", action="store_true",
+        help="Use an RSA-2048 key instead of ECDSA P-256"
+    )
+    return certs_parser
+
 
-    # === rebuild command ===
+def _build_rebuild_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `rebuild` command."""
     rebuild_parser = subparsers.add_parser(
         "rebuild", help="Clear uv cache and reinstall from source (for development)"
     )
-    rebuild_parser.set_defaults(func=cmd_rebuild)
+    return rebuild_parser
 
-    # === uninstall command ===
+
+def _build_uninstall_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `uninstall` command."""
     uninstall_parser = subparsers.add_parser(
         "uninstall", help="Clear uv cache and uninstall the tool"
     )
-    uninstall_parser.set_defaults(func=cmd_uninstall)
+    return uninstall_parser
+
 
-    # === mcp command ===
+def _build_mcp_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `mcp` command."""
     mcp_parser = subparsers.add_parser(
         "mcp",
         help="Run MCP server for external agent integration",
         description="Expose AgentWire as an MCP server for tools like MoltBot, Claude Desktop, etc.",
     )
-    mcp_parser.set_defaults(func=cmd_mcp)
+    return mcp_parser
 
-    # === ensure command (scheduled workloads) ===
+
+def _build_ensure_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `ensure` command."""
     ensure_parser = subparsers.add_parser(
         "ensure",
         help="Run named task with reliable session management",
@@ -7966,131 +8280,243 @@ def main() -> int:
     ensure_parser.add_argument("--wait-lock", action="store_true", help="Wait for lock instead of failing if locked")
     ensure_parser.add_argument("--lock-timeout", type=int, default=60, help="Max time to wait for lock (default: 60s)")
     ensure_parser.add_argument("--json", action="store_true", help="Output JSON")
-    ensure_parser.set_defaults(func=cmd_ensure)
+    return ensure_parser
+
 
-    # === task command group ===
+def _build_task_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `task` command."""
     task_parser = subparsers.add_parser(
         "task",
         help="Manage scheduled tasks",
         description="List, show, and validate tasks defined in .agentwire.yml.",
     )
-    task_subparsers = task_parser.add_subparsers(dest="task_command")
+    task_subparsers = task_parser.add_subparsers(dest="task_command", prog=task_parser.prog)
 
     # task list
     task_list = task_subparsers.add_parser("list", help="List tasks for session/project")
     task_list.add_argument("session", nargs="?", help="Session name (default: current directory)")
     task_list.add_argument("--json", action="store_true", help="Output JSON")
-    task_list.set_defaults(func=cmd_task_list)
 
     # task show
     task_show = task_subparsers.add_parser("show", help="Show task definition details")
     task_show.add_argument("task", help="Task name (session/task or just task)")
     task_show.add_argument("--json", action="store_true", help="Output JSON")
-    task_show.set_defaults(func=cmd_task_show)
 
     # task validate
     task_validate = task_subparsers.add_parser("validate", help="Validate task configuration")
     task_validate.add_argument("task", help="Task name (session/task or just task)")
     task_validate.add_argument("--json", action="store_true", help="Output JSON")
-    task_validate.set_defaults(func=cmd_task_validate)
+    return task_parser
 
-    # === lock command group ===
+
+def _build_lock_parser(subparsers) -> argparse.ArgumentParser:
+    """Register the `lock` command."""
     lock_parser = subparsers.add_parser(
         "lock",
         help="Manage session locks",
         description="List, clean, and remove session locks.",
     )
-    lock_subparsers = lock_parser.add_subparsers(dest="lock_command")
-    lock_parser.set_defaults(func=cmd_lock)
+    lock_subparsers = lock_parser.add_subparsers(dest="lock_command", prog=lock_parser.prog)
 
     # lock list
     lock_list_parser = lock_subparsers.add_parser("list", help="List all locks")
     lock_list_parser.add_argument("--json", action="store_true", help="Output JSON")
-    lock_list_parser.set_defaults(func=cmd_lock_list)
 
     # lock clean
     lock_clean_parser = lock_subparsers.add_parser("clean", help="Remove stale locks")
     lock_clean_parser.add_argument("--dry-run", action="store_true", help="Show what would be removed")
     lock_clean_parser.add_argument("--json", action="store_true", help="Output JSON")
-    lock_clean_parser.set_defaults(func=cmd_lock_clean)
 
     # lock remove
     lock_remove_parser = lock_subparsers.add_parser("remove", help="Force-remove a lock")
     lock_remove_parser.add_argument("session", help="Session name")
     lock_remove_parser.add_argument("--json", action="store_true", help="Output JSON")
-    lock_remove_parser.set_defaults(func=cmd_lock_remove)
-
-    args = parser.parse_args()
-
-    if args.command is None:
-        parser.print_help()
-        return 0
-
-    if args.command == "portal" and getattr(args, "portal_command", None) is None:
-        portal_parser.print_help()
-        return 0
-
-    if args.command == "tts" and getattr(args, "tts_command", None) is None:
-        tts_parser.print_help()
-        return 0
+    return lock_parser
+
+
+# Handler for each (command, subcommand) pair; subcommand is None for
+# commands without one. Commands with subcommands that are invoked bare
+# fall through to their help text.
+DISPATCH = {
+    ("init", None): cmd_init,
+    ("portal", "start"): cmd_portal_start,
+    ("portal", "serve"): cmd_portal_serve,
+    ("portal", "stop"): cmd_portal_stop,
+    ("portal", "status"): cmd_portal_status,
+    ("portal", "restart"): cmd_portal_restart,
+    ("portal", "generate-certs"): cmd_generate_certs,
+    ("tts", "start"): cmd_tts_start,
+    ("tts", "serve"): cmd_tts_serve,
+    ("tts", "stop"): cmd_tts_stop,
+    ("tts", "restart"): cmd_tts_restart,
+    ("tts", "status"): cmd_tts_status,
+    ("stt", "start"): cmd_stt_start,
+    ("stt", "serve"): cmd_stt_serve,
+    ("stt", "stop"): cmd_stt_stop,
+    ("stt", "status"): cmd_stt_status,
+    ("tunnels", "up"): cmd_tunnels_up,
+    ("tunnels", "down"): cmd_tunnels_down,
+    ("tunnels", "status"): cmd_tunnels_status,
+    ("tunnels", "check"): cmd_tunnels_check,
+    ("say", None): cmd_say,
+    ("alert", None): cmd_alert,
+    ("email", None): cmd_email,
+    ("notify", None): cmd_notify,
+    ("send", None): cmd_send,
+    ("send-keys", None): cmd_send_keys,
+    ("list", None): cmd_list,
+    ("new", None): cmd_new,
+    ("output", None): cmd_output,
+    ("info", None): cmd_info,
+    ("kill", None): cmd_kill,
+    ("spawn", None): cmd_spawn,
+    ("split", None): cmd_split,
+    ("detach", None): cmd_detach,
+    ("jump", None): cmd_jump,
+    ("resize", None): cmd_resize,
+    ("recreate", None): cmd_recreate,
+    ("fork", None): cmd_fork,
+    ("dev", None): cmd_dev,
+    ("listen", "start"): cmd_listen_start,
+    ("listen", "stop"): cmd_listen_stop,
+    ("listen", "cancel"): cmd_listen_cancel,
+    ("voiceclone", "start"): cmd_voiceclone_start,
+    ("voiceclone", "stop"): cmd_voiceclone_stop,
+    ("voiceclone", "cancel"): cmd_voiceclone_cancel,
+    ("voiceclone", "list"): cmd_voiceclone_list,
+    ("voiceclone", "delete"): cmd_voiceclone_delete,
+    ("machine", "list"): cmd_machine_list,
+    ("machine", "add"): cmd_machine_add,
+    ("machine", "remove"): cmd_machine_remove,
+    ("history", "list"): cmd_history_list,
+    ("history", "show"): cmd_history_show,
+    ("history", "resume"): cmd_history_resume,
+    ("roles", "list"): cmd_roles_list,
+    ("roles", "show"): cmd_roles_show,
+    ("projects", "list"): cmd_projects_list,
+    ("hooks", "install"): cmd_hooks_install,
+    ("hooks", "uninstall"): cmd_hooks_uninstall,
+    ("hooks", "status"): cmd_hooks_status,
+    ("network", "status"): cmd_network_status,
+    ("safety", "check"): cmd_safety_check,
+    ("safety", "status"): cmd_safety_status,
+    ("safety", "logs"): cmd_safety_logs,
+    ("safety", "install"): cmd_safety_install,
+    ("doctor", None): cmd_doctor,
+    ("generate-certs", None): cmd_generate_certs,
+    ("rebuild", None): cmd_rebuild,
+    ("uninstall", None): cmd_uninstall,
+    ("mcp", None): cmd_mcp,
+    ("ensure", None): cmd_ensure,
+    ("task", "list"): cmd_task_list,
+    ("task", "show"): cmd_task_show,
+    ("task", "validate"): cmd_task_validate,
+    ("lock", "list"): cmd_lock_list,
+    ("lock", "clean"): cmd_lock_clean,
+    ("lock", "remove"): cmd_lock_remove,
+}
+
+# Commands that take a subcommand (stored by argparse as `<command>_command`)
+_GROUP_COMMANDS = frozenset(command for command, subcommand in DISPATCH if subcommand is not None)
+
+
+COMMAND_BUILDERS = {
+    "init": _build_init_parser,
+    "portal": _build_portal_parser,
+    "tts": _build_tts_parser,
+    "stt": _build_stt_parser,
+    "tunnels": _build_tunnels_parser,
+    "say": _build_say_parser,
+    "alert": _build_alert_parser,
+    "email": _build_email_parser,
+    "notify": _build_notify_parser,
+    "send": _build_send_parser,
+    "send-keys": _build_send_keys_parser,
+    "list": _build_list_parser,
+    "new": _build_new_parser,
+    "output": _build_output_parser,
+    "info": _build_info_parser,
+    "kill": _build_kill_parser,
+    "spawn": _build_spawn_parser,
+    "split": _build_split_parser,
+    "detach": _build_detach_parser,
+    "jump": _build_jump_parser,
+    "resize": _build_resize_parser,
+    "recreate": _build_recreate_parser,
+    "fork": _build_fork_parser,
+    "dev": _build_dev_parser,
+    "listen": _build_listen_parser,
+    "voiceclone": _build_voiceclone_parser,
+    "machine": _build_machine_parser,
+    "history": _build_history_parser,
+    "roles": _build_roles_parser,
+    "projects": _build_projects_parser,
+    "hooks": _build_hooks_parser,
+    "network": _build_network_parser,
+    "safety": _build_safety_parser,
+    "doctor": _build_doctor_parser,
+    "generate-certs": _build_generate_certs_parser,
+    "rebuild": _build_rebuild_parser,
+    "uninstall": _build_uninstall_parser,
+    "mcp": _build_mcp_parser,
+    "ensure": _build_ensure_parser,
+    "task": _build_task_parser,
+    "lock": _build_lock_parser,
+}
 
-    if args.command == "stt" and getattr(args, "stt_command", None) is None:
-        stt_parser.print_help()
-        return 0
 
-    if args.command == "tunnels" and getattr(args, "tunnels_command", None) is None:
-        tunnels_parser.print_help()
+def main() -> int:
+    """Main entry point."""
+    # `agentwire --version` is probed by shells and tooling; answer it
+    # without loading .env files or building any parser
+    if sys.argv[1:] in (["--version"], ["-V"]):
+        _print_version()
         return 0
 
-    if args.command == "machine" and getattr(args, "machine_command", None) is None:
-        machine_parser.print_help()
-        return 0
+    # Load .env files (project first, then global config)
+    from dotenv import load_dotenv
 
-    if args.command == "history" and getattr(args, "history_command", None) is None:
-        history_parser.print_help()
-        return 0
+    load_dotenv()  # .env in current directory
+    load_dotenv(HOME / ".agentwire" / ".env")  # Global config
 
-    if args.command == "hooks" and getattr(args, "hooks_command", None) is None:
-        hooks_parser.print_help()
-        return 0
+    from .cli_parser import ArgumentParser, VersionAction
 
-    if args.command == "projects" and getattr(args, "projects_command", None) is None:
-        projects_parser.print_help()
-        return 0
-
-    if args.command == "safety" and getattr(args, "safety_command", None) is None:
-        safety_parser.print_help()
-        return 0
-
-    if args.command == "network" and getattr(args, "network_command", None) is None:
-        network_parser.print_help()
-        return 0
+    parser = ArgumentParser(
+        prog="agentwire",
+        description="Multi-session voice web interface for AI coding agents.",
+    )
+    parser.add_argument(
+        "-V", "--version",
+        action=VersionAction,
+        callback=_print_version,
+        help="Show version and check system compatibility",
+    )
 
-    if args.command == "listen" and getattr(args, "listen_command", None) is None:
-        listen_parser.print_help()
-        return 0
+    # Explicit prog skips argparse formatting a usage string to derive it
+    subparsers = parser.add_subparsers(dest="command", help="Commands", prog=parser.prog)
 
-    if args.command == "voiceclone" and getattr(args, "voiceclone_command", None) is None:
-        voiceclone_parser.print_help()
-        return 0
+    # Only build the subparser for the requested command; everything else
+    # (no args, --help, unknown commands) gets the full tree.
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command in COMMAND_BUILDERS:
+        parsers = {command: COMMAND_BUILDERS[command](subparsers)}
+        # Keep usage/error output listing every command, as with the full tree
+        subparsers.metavar = "{" + ",".join(COMMAND_BUILDERS) + "}"
+    else:
+        parsers = {name: build(subparsers) for name, build in COMMAND_BUILDERS.items()}
 
-    if args.command == "roles" and getattr(args, "roles_command", None) is None:
-        roles_parser.print_help()
-        return 0
+    args = parser.parse_args()
 
-    if args.command == "task" and getattr(args, "task_command", None) is None:
-        task_parser.print_help()
+    if args.command is None:
+        parser.print_help()
         return 0
 
-    if args.command == "lock" and getattr(args, "lock_command", None) is None:
-        lock_parser.print_help()
+    subcommand = getattr(args, f"{args.command}_command") if args.command in _GROUP_COMMANDS else None
+    handler = DISPATCH.get((args.command, subcommand))
+    if handler is None:
+        parsers[args.command].print_help()
         return 0
-
-    if hasattr(args, "func"):
-        return args.func(args)
-
-    parser.print_help()
-    return 0
+    return handler(args)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 """Abstract base class for agent backends."""
 
+import asyncio
 from abc import ABC, abstractmethod
 from pathlib import Path
 
@@ -46,6 +47,31 @@ class AgentBackend(ABC):
         """
         pass
 
+    def should_poll(self, name: str, now: float | None = None) -> bool:
+        """Whether a session's output is due to be polled again.
+
+        Backends can slow polling for idle sessions; the default polls
+        every time.
+
+        Args:
+            name: Session name
+            now: time.monotonic() value (default: current time)
+
+        Returns:
+            True if get_output should be called now
+        """
+        return True
+
+    def mark_active(self, name: str) -> None:
+        """Note that input was just sent to a session some other way.
+
+        Backends that slow polling for idle sessions go back to the fast
+        rate, since a reaction is expected. The default does nothing.
+
+        Args:
+            name: Session name
+        """
+
     @abstractmethod
     def send_keys(self, name: str, keys: str) -> bool:
         """Send keys to a session WITHOUT Enter.
@@ -94,3 +120,37 @@ class AgentBackend(ABC):
             List of session names
         """
         pass
+
+    def close(self) -> None:
+        """Release backend resources (connections, helper processes).
+
+        The default has nothing to release.
+        """
+
+    async def session_exists_async(self, name: str) -> bool:
+        """session_exists() for use on an event loop.
+
+        The default (like the other *_async methods here) runs the
+        blocking method in a worker thread; backends can override it with
+        natively async I/O.
+        """
+        return await asyncio.to_thread(self.session_exists, name)
+
+    async def send_keys_async(self, name: str, keys: str) -> bool:
+        """send_keys() for use on an event loop."""
+        return await asyncio.to_thread(self.send_keys, name, keys)
+
+    async def send_input_async(self, name: str, text: str) -> bool:
+        """send_input() for use on an event loop."""
+        return await asyncio.to_thread(self.send_input, name, text)
+
+    async def list_sessions_async(self) -> list[str]:
+        """list_sessions() for use on an event loop.
+
+        The default runs list_sessions() in a worker thread; backends can
+        override it with natively async I/O.
+
+        Returns:
+            List of session names
+        """
+        return await asyncio.to_thread(self.list_sessions)
@@ -1,24 +1,107 @@
 """Tmux-based agent backend."""
 
+import asyncio
 import json
 import logging
 import os
 import re
 import shlex
+import shutil
 import subprocess
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from .base import AgentBackend
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Absolute paths, resolved once. With a path (and close_fds=False), subprocess
+# can start children via posix_spawn instead of fork+exec.
+_TMUX = shutil.which("tmux") or "tmux"
+_SSH = shutil.which("ssh") or "ssh"
+
+# machines.json path -> (st_mtime_ns, machines list); shared by all instances
+_machines_cache: dict[Path, tuple[int, list]] = {}
+
+# Threads for querying remote machines concurrently (created on first use)
+_remote_pool: ThreadPoolExecutor | None = None
+
 # Pattern to match env var prefix: VAR='value' or VAR="value" or VAR=value
 ENV_VAR_PREFIX_PATTERN = re.compile(r'^([A-Z_][A-Z0-9_]*)=([\'"]?)(.+?)\2\s+(.+)$')
 
+# SSH connection sharing: the first ssh to a host becomes a background master
+# (kept for 10 minutes after last use) and later calls reuse its connection,
+# skipping the TCP/key-exchange/auth handshake. %C is a hash of
+# local host, remote host, port and user, keeping the socket path short.
+SSH_CONTROL_DIR = Path.home() / ".agentwire"
+SSH_CONTROL_OPTIONS = [
+    "-o", "ControlMaster=auto",
+    "-o", f"ControlPath={SSH_CONTROL_DIR}/ssh-%C",
+    "-o", "ControlPersist=600",
+    # Drop connections whose host stopped answering after ~30s instead of
+    # waiting on a dead TCP connection
+    "-o", "ServerAliveInterval=10",
+    "-o", "ServerAliveCountMax=3",
+]
+
+# How long a list-panes snapshot of a machine is reused (seconds)
+SNAPSHOT_TTL = 0.25
+# Session name last: it's the only field that may itself contain "|"
+SNAPSHOT_FORMAT = "#{pane_dead}|#{pane_current_command}|#{session_name}"
+
+# Pane state checked before re-capturing output. window_activity is bumped
+# (to the second) by any pane output; %s is the tmux server's current time,
+# expanded by display-message.
+PANE_STATE_FORMAT = "#{pane_id} #{history_size} #{window_activity} %s"
+
+# Output polling tiers: (interval seconds, quiet polls before demotion).
+# Sessions start hot, cool down while their output stays unchanged, and go
+# back to hot on new output or when input is sent to them.
+POLL_TIERS = (
+    (0.5, 6),    # hot: producing output
+    (2.5, 12),   # warm: quiet for ~3s
+    (10.0, None),  # cold: quiet for ~30s+
+)
+
+# Longest send_input text passed as a send-keys argument (characters, so
+# at most 64 KiB of UTF-8). Linux caps a single argv string at 128 KiB, and
+# remote text is inside the one ssh command argument.
+SEND_KEYS_MAX_TEXT = 16 * 1024
+
+# Seconds before a remote (ssh) or asyncio tmux call is killed, so a hung
+# host can't block a poll thread or handler indefinitely
+TMUX_CALL_TIMEOUT = 30.0
+
+# Initial size of new sessions' terminal grid (see AgentConfig)
+DEFAULT_PTY_COLS = 200
+DEFAULT_PTY_ROWS = 50
+
+# Pause between text and Enter in send_input (see AgentConfig.input_settle)
+DEFAULT_INPUT_SETTLE = 0.2
+
+# Placeholders substituted into agent.command. Plain str.replace rather than
+# str.format: commands may contain literal braces (e.g. JSON in env vars).
+AGENT_COMMAND_PLACEHOLDERS = ("{name}", "{path}", "{model}")
+
 # Base command without permission flags - flags added based on bypass_permissions option
 DEFAULT_AGENT_COMMAND = "claude"
 
 
+def _get_remote_pool() -> ThreadPoolExecutor:
+    """Get the process-wide thread pool for concurrent SSH calls."""
+    global _remote_pool
+    if _remote_pool is None:
+        _remote_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="agentwire-ssh")
+    return _remote_pool
+
+
 def parse_env_var_prefix(command: str) -> tuple[str | None, str | None, str]:
     """Parse env var prefix from a command string.
 
@@ -36,14 +119,81 @@ def parse_env_var_prefix(command: str) -> tuple[str | None, str | None, str]:
     return None, None, command
 
 
+def _tmux_literal(arg: str) -> str:
+    """Escape an argv element for a ";"-chained tmux command line.
+
+    tmux treats an argument ending in ";" as a command separator, so a
+    trailing ";" in user text must be written as "\\;".
+    """
+    return arg[:-1] + "\\;" if arg.endswith(";") else arg
+
+
+def _parse_pane_state(line: str) -> tuple[tuple[str, str, int], int] | None:
+    """Parse a PANE_STATE_FORMAT line into ((pane_id, history_size, activity), now)."""
+    parts = line.split()
+    if len(parts) != 4:
+        return None
+    pane_id, history_size, activity, now = parts
+    try:
+        return (pane_id, history_size, int(activity)), int(now)
+    except ValueError:
+        return None
+
+
+def _parse_snapshot(stdout: str) -> dict[str, list[tuple[bool, str]]]:
+    """Parse `list-panes -a -F SNAPSHOT_FORMAT` output into a snapshot dict."""
+    snapshot: dict[str, list[tuple[bool, str]]] = {}
+    for line in stdout.splitlines():
+        parts = line.split("|", 2)
+        if len(parts) == 3:
+            dead, command, session = parts
+            snapshot.setdefault(session, []).append((dead == "1", command))
+    return snapshot
+
+
+def _is_complete_snapshot(result: subprocess.CompletedProcess) -> bool:
+    """Whether a list-panes result lists all of the machine's sessions.
+
+    True on success, and when no tmux server is running (no sessions at
+    all); False when tmux or the host couldn't be reached.
+    """
+    if result.returncode == 0:
+        return True
+    return "no server running" in result.stderr or "error connecting to" in result.stderr
+
+
+def _remote_tmux_command(tmux_args: list[str]) -> str:
+    """Remote shell command line running tmux with tmux_args.
+
+    Quoted with shlex.join, and exec'd so the remote shell is replaced by
+    tmux rather than forking it and waiting.
+    """
+    return "exec " + shlex.join(["tmux", *tmux_args])
+
+
+# tmux output is UTF-8 whatever the portal's locale; a stray invalid byte in
+# a pane must not make get_output() raise
+_TEXT_KWARGS = {"encoding": "utf-8", "errors": "replace"}
+
+
+def _output_kwargs(capture: bool, discard: bool) -> dict:
+    """subprocess.run() output arguments for _run_local/_run_remote."""
+    if discard:
+        # Status-only call: no stdout pipe, stderr kept for error messages
+        return {"stdout": subprocess.DEVNULL, "stderr": subprocess.PIPE}
+    return {"capture_output": capture}
+
+
 def tmux_session_exists(name: str) -> bool:
     """Check if a local tmux session exists (exact match).
 
     Module-level helper for use outside the TmuxAgent class.
     """
     result = subprocess.run(
-        ["tmux", "has-session", "-t", f"={name}"],
-        capture_output=True,
+        [_TMUX, "has-session", "-t", f"={name}"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=False,
     )
     return result.returncode == 0
 
@@ -58,68 +208,172 @@ class TmuxAgent(AgentBackend):
             config: Configuration dict with optional keys:
                 - agent.command: Command to start agent (default: claude --dangerously-skip-permissions)
                 - agent.model: Model to use (for {model} placeholder)
+                - agent.pty_cols / agent.pty_rows: Initial session size
+                - agent.input_settle: Pause before Enter in send_input (seconds)
                 - machines.file: Path to machines.json
         """
         self.config = config
         agent_config = config.get("agent", {})
         self.agent_command = agent_config.get("command", DEFAULT_AGENT_COMMAND)
         self.default_model = agent_config.get("model", "")
+        # Only the placeholders the command actually uses (usually none)
+        self._agent_placeholders = tuple(p for p in AGENT_COMMAND_PLACEHOLDERS if p in self.agent_command)
+        self.pty_cols = agent_config.get("pty_cols", DEFAULT_PTY_COLS)
+        self.pty_rows = agent_config.get("pty_rows", DEFAULT_PTY_ROWS)
+        self.input_settle = agent_config.get("input_settle", DEFAULT_INPUT_SETTLE)
+
+        # Fixed for the life of the process; looked up on every session name
+        import socket
+        hostname = socket.gethostname()
+        self._local_hostname = hostname.split('.')[0]
+        self._in_container = os.path.exists('/.dockerenv')
+        # Machine hosts that are this machine (reached without SSH). Not
+        # getfqdn(): it can block on a DNS lookup.
+        self._local_hosts = frozenset({"localhost", "127.0.0.1", "::1", hostname, self._local_hostname})
+        import getpass
+        try:
+            self._local_user = getpass.getuser()
+        except (KeyError, OSError):
+            self._local_user = None
+
+        # id/host -> machine, and session name -> _parse_session_name()
+        # result; both built from the self.machines list in _machine_index_of
+        self._machine_index_of: list | None = None
+        self._machine_index: dict[str, dict] = {}
+        self._parsed_names: dict[str, tuple[str, dict | None]] = {}
+
+        # machine id (None = local) -> (monotonic time taken, snapshot)
+        self._snapshot_cache: dict[str | None, tuple[float, dict[str, list[tuple[bool, str]]]]] = {}
+
+        # (name, lines) -> (pane state at capture, server time of capture, output)
+        self._output_cache: dict[tuple[str, int], tuple[tuple[str, str, int], int, str]] = {}
+
+        # name -> (POLL_TIERS index, quiet polls in this tier, next poll time)
+        self._poll_tiers: dict[str, tuple[int, int, float]] = {}
 
         # Load machines from file
         self._load_machines()
 
+        # ssh won't create the directory holding its control sockets
+        if self.machines:
+            SSH_CONTROL_DIR.mkdir(parents=True, exist_ok=True)
+
     def _load_machines(self):
-        """Load machines configuration from file."""
+        """Load machines configuration from file.
+
+        The parsed file is cached per path and only re-read when its mtime
+        changes.
+        """
         machines_config = self.config.get("machines", {})
         machines_file = machines_config.get("file")
 
         if machines_file:
             machines_path = Path(machines_file).expanduser()
-            logger.info(f"Loading machines from {machines_path}")
-            if machines_path.exists():
-                try:
-                    with open(machines_path) as f:
-                        data = json.load(f)
-                        self.machines = data.get("machines", [])
-                        machine_ids = [m.get("id") for m in self.machines]
-                        logger.info(f"Loaded {len(self.machines)} machines: {machine_ids}")
-                        return
-                except (json.JSONDecodeError, IOError) as e:
-                    logger.warning(f"Failed to load machines: {e}")
-            else:
+            try:
+                mtime_ns = machines_path.stat().st_mtime_ns
+            except OSError:
                 logger.warning(f"Machines file not found: {machines_path}")
+                self.machines = []
+                return
+
+            cached = _machines_cache.get(machines_path)
+            if cached and cached[0] == mtime_ns:
+                self.machines = cached[1]
+                return
+
+            logger.info(f"Loading machines from {machines_path}")
+            try:
+                raw = machines_path.read_bytes()
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+                self.machines = data.get("machines", [])
+                _machines_cache[machines_path] = (mtime_ns, self.machines)
+                machine_ids = [m.get("id") for m in self.machines]
+                logger.info(f"Loaded {len(self.machines)} machines: {machine_ids}")
+                return
+            except (ValueError, IOError) as e:
+                logger.warning(f"Failed to load machines: {e}")
         else:
             logger.info("No machines.file configured - using local tmux only")
 
         self.machines = []
 
-    def _run_local(self, cmd: list[str], capture: bool = True) -> subprocess.CompletedProcess:
+    def reload_machines(self) -> None:
+        """Re-read machines.json, bypassing the cache."""
+        machines_file = self.config.get("machines", {}).get("file")
+        if machines_file:
+            _machines_cache.pop(Path(machines_file).expanduser(), None)
+        self._load_machines()
+
+    def _run_local(
+        self, cmd: list[str], capture: bool = True, discard: bool = False, input: str | None = None
+    ) -> subprocess.CompletedProcess:
         """Run a command locally.
 
         Args:
             cmd: Command as list of strings
             capture: Whether to capture output
+            discard: Send stdout to /dev/null (only stderr is captured)
+            input: Text to write to the command's stdin
 
         Returns:
             CompletedProcess result
         """
         logger.debug(f"Running local: {' '.join(cmd)}")
+        # Python's own fds are non-inheritable, so nothing leaks with
+        # close_fds=False, and it lets subprocess use posix_spawn
         return subprocess.run(
             cmd,
-            capture_output=capture,
-            text=True,
+            **_output_kwargs(capture, discard),
+            input=input,
+            **_TEXT_KWARGS,
+            close_fds=False,
         )
 
-    def _run_remote(self, machine: dict, cmd: str, capture: bool = True) -> subprocess.CompletedProcess:
+    def _run_remote(
+        self,
+        machine: dict,
+        cmd: str,
+        capture: bool = True,
+        discard: bool = False,
+        input: str | None = None,
+    ) -> subprocess.CompletedProcess:
         """Run a command on a remote machine via SSH.
 
         Args:
             machine: Machine config dict with 'host' and optional 'user'
             cmd: Command string to run remotely
             capture: Whether to capture output
+            discard: Send stdout to /dev/null (only stderr is captured)
+            input: Text to write to the remote command's stdin
 
         Returns:
-            CompletedProcess result
+            CompletedProcess result (returncode -9 if it was killed after
+            TMUX_CALL_TIMEOUT)
+        """
+        logger.debug(f"Running remote on {machine.get('host', '')}: {cmd}")
+        ssh_cmd = self._ssh_command(machine, cmd)
+        try:
+            return subprocess.run(
+                ssh_cmd,
+                **_output_kwargs(capture, discard),
+                input=input,
+                **_TEXT_KWARGS,
+                close_fds=False,
+                timeout=TMUX_CALL_TIMEOUT,
+            )
+        except subprocess.TimeoutExpired:
+            # Same shape as a failed command: callers check returncode
+            logger.warning(f"Remote command on {machine.get('host', '')} timed out after {TMUX_CALL_TIMEOUT}s")
+            return subprocess.CompletedProcess(ssh_cmd, -9, "", f"timed out after {TMUX_CALL_TIMEOUT}s")
+
+    def _ssh_command(self, machine: dict, cmd: str, control: str | None = None) -> list[str]:
+        """Build the ssh argv that runs a command string on a machine.
+
+        Args:
+            machine: Machine config dict with 'host' and optional 'user'/'port'
+            cmd: Command string to run remotely (ignored with control)
+            control: Send this `ssh -O` request to the host's master
+                connection instead of running cmd (e.g. "exit")
         """
         host = machine.get("host", "")
         user = machine.get("user", "")
@@ -127,21 +381,168 @@ class TmuxAgent(AgentBackend):
         ssh_target = f"{user}@{host}" if user else host
         port = machine.get("port")
         ssh_cmd = [
-            "ssh",
+            _SSH,
             "-o", "BatchMode=yes",
             "-o", "ConnectTimeout=5",
+            *SSH_CONTROL_OPTIONS,
         ]
         if port:
             ssh_cmd.extend(["-p", str(port)])
-        ssh_cmd.extend([ssh_target, cmd])
+        if control:
+            ssh_cmd.extend(["-O", control, ssh_target])
+        else:
+            ssh_cmd.extend([ssh_target, cmd])
+        return ssh_cmd
+
+    def _run_tmux(
+        self,
+        machine: dict | None,
+        tmux_args: list[str],
+        discard: bool = False,
+        input: str | None = None,
+    ) -> subprocess.CompletedProcess:
+        """Run a tmux command line locally or on a remote machine.
 
-        logger.debug(f"Running remote on {ssh_target}: {cmd}")
-        return subprocess.run(
-            ssh_cmd,
-            capture_output=capture,
-            text=True,
+        Args:
+            machine: Machine config dict, or None for local tmux
+            tmux_args: tmux arguments (may chain commands with ";")
+            discard: Send stdout to /dev/null (only stderr is captured)
+            input: Text for tmux's stdin (e.g. for `load-buffer -`)
+
+        Returns:
+            CompletedProcess result
+        """
+        if machine:
+            return self._run_remote(machine, _remote_tmux_command(tmux_args), discard=discard, input=input)
+        return self._run_local([_TMUX, *tmux_args], discard=discard, input=input)
+
+    def _snapshot(self, machine: dict | None) -> dict[str, list[tuple[bool, str]]]:
+        """Get every session and pane on a machine from one `list-panes -a`.
+
+        Results are reused for SNAPSHOT_TTL seconds, so bursts of
+        session_exists/list_sessions calls (e.g. a poll tick over all
+        sessions) cost one tmux round trip per machine.
+
+        Args:
+            machine: Machine config dict, or None for local tmux
+
+        Returns:
+            Dict of session name -> [(pane_dead, pane_current_command), ...]
+            in tmux order. Empty if tmux isn't running or unreachable.
+        """
+        key = machine.get("id", machine.get("host")) if machine else None
+        cached = self._snapshot_cache.get(key)
+        now = time.monotonic()
+        if cached and now - cached[0] < SNAPSHOT_TTL:
+            return cached[1]
+
+        result = self._run_tmux(machine, ["list-panes", "-a", "-F", SNAPSHOT_FORMAT])
+        snapshot = _parse_snapshot(result.stdout) if result.returncode == 0 else {}
+        if _is_complete_snapshot(result):
+            self._prune_sessions(key, snapshot)
+
+        self._snapshot_cache[key] = (now, snapshot)
+        return snapshot
+
+    async def _run_tmux_async(
+        self,
+        machine: dict | None,
+        tmux_args: list[str],
+        discard: bool = False,
+        input: str | None = None,
+        timeout: float = TMUX_CALL_TIMEOUT,
+    ) -> subprocess.CompletedProcess:
+        """_run_tmux() for use on an event loop.
+
+        tmux (or ssh) runs as an asyncio subprocess: the loop waits on its
+        pipes, with no thread blocked per call, so calls to many sessions
+        and machines can be gathered concurrently.
+
+        Args:
+            machine: Machine config dict, or None for local tmux
+            tmux_args: tmux arguments (may chain commands with ";")
+            discard: Send stdout to /dev/null (only stderr is captured)
+            input: Text for tmux's stdin (e.g. for `load-buffer -`)
+            timeout: Seconds before the process is killed
+
+        Returns:
+            CompletedProcess with text stdout/stderr (returncode 127 if it
+            couldn't be started, negative if it was killed on timeout)
+        """
+        if machine:
+            argv = self._ssh_command(machine, _remote_tmux_command(tmux_args))
+        else:
+            argv = [_TMUX, *tmux_args]
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *argv,
+                stdin=asyncio.subprocess.DEVNULL if input is None else asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.DEVNULL if discard else asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                close_fds=False,  # posix_spawn, as in _run_local
+            )
+        except OSError as e:
+            return subprocess.CompletedProcess(argv, 127, "", str(e))
+        try:
+            stdin_bytes = input.encode() if input is not None else None
+            stdout, stderr = await asyncio.wait_for(proc.communicate(stdin_bytes), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return subprocess.CompletedProcess(argv, proc.returncode, "", f"timed out after {timeout}s")
+        return subprocess.CompletedProcess(
+            argv,
+            proc.returncode,
+            stdout.decode(errors="replace") if stdout else "",
+            stderr.decode(errors="replace"),
         )
 
+    async def _snapshot_async(self, machine: dict | None) -> dict[str, list[tuple[bool, str]]]:
+        """_snapshot() for use on an event loop (shares its SNAPSHOT_TTL cache)."""
+        key = machine.get("id", machine.get("host")) if machine else None
+        cached = self._snapshot_cache.get(key)
+        now = time.monotonic()
+        if cached and now - cached[0] < SNAPSHOT_TTL:
+            return cached[1]
+
+        result = await self._run_tmux_async(machine, ["list-panes", "-a", "-F", SNAPSHOT_FORMAT])
+        snapshot = _parse_snapshot(result.stdout) if result.returncode == 0 else {}
+        if _is_complete_snapshot(result):
+            self._prune_sessions(key, snapshot)
+
+        self._snapshot_cache[key] = (now, snapshot)
+        return snapshot
+
+    def _prune_sessions(self, key: str | None, snapshot: dict) -> None:
+        """Forget output and polling state of a machine's sessions that are gone.
+
+        Sessions can end without kill_session() (agentwire kill, the agent
+        exiting), so a fresh snapshot is the point where their state is
+        dropped.
+
+        Args:
+            key: Machine id/host of the snapshot (None = local)
+            snapshot: The machine's sessions, from a successful list-panes
+        """
+        names = {cache_key[0] for cache_key in self._output_cache}
+        names.update(self._poll_tiers)
+        for name in names:
+            session_name, machine = self._parse_session_name(name)
+            machine_key = machine.get("id", machine.get("host")) if machine else None
+            if machine_key == key and session_name not in snapshot:
+                self._forget_session(name)
+
+    def _forget_session(self, name: str) -> None:
+        """Drop a session's cached output and polling tier."""
+        for key in [key for key in self._output_cache if key[0] == name]:
+            self._output_cache.pop(key, None)
+        self._poll_tiers.pop(name, None)
+
+    def invalidate_snapshot(self, machine: dict | None = None) -> None:
+        """Drop the cached snapshot for a machine (None = local)."""
+        key = machine.get("id", machine.get("host")) if machine else None
+        self._snapshot_cache.pop(key, None)
+
     def _parse_session_name(self, name: str) -> tuple[str, dict | None]:
         """Parse session name to extract machine info.
 
@@ -151,28 +552,66 @@ class TmuxAgent(AgentBackend):
         Returns:
             Tuple of (session_name, machine_config or None for local)
         """
-        import socket
-        local_hostname = socket.gethostname().split('.')[0]
-        in_container = os.path.exists('/.dockerenv')
-
-        if "@" in name:
-            session, machine_id = name.rsplit("@", 1)
+        if "@" not in name:
+            return name, None
 
-            # Check if machine_id is the local hostname (only when not in container)
-            if not in_container and (machine_id == local_hostname or machine_id == "local"):
+        # Results are memoized until self.machines changes (reload or edit)
+        if self._machine_index_of is not self.machines:
+            self._build_machine_index()
+        parsed = self._parsed_names.get(name)
+        if parsed is None:
+            parsed = self._parsed_names[name] = self._resolve_machine(name)
+        return parsed
+
+    def _build_machine_index(self) -> None:
+        """Index self.machines by id and host, and reset parsed names."""
+        index: dict[str, dict] = {}
+        # Reversed so that, as with a list scan, the first match wins
+        for machine in reversed(self.machines):
+            for key in (machine.get("host"), machine.get("id")):
+                if key is not None:
+                    index[key] = machine
+        self._machine_index = index
+        self._machine_index_of = self.machines
+        self._parsed_names = {}
+
+    def _is_local_machine(self, machine: dict) -> bool:
+        """Whether a machine entry is this host's tmux server.
+
+        True when marked "local", or when the host is a loopback address or
+        our hostname and SSH would land as the current user on port 22. A
+        different port or user (e.g. a forwarded port into a VM or
+        container) reaches a different tmux server, so it stays remote.
+
+        Only meaningful outside a container: in Docker, "local" machines are
+        reached over SSH via host.docker.internal.
+        """
+        if machine.get("local"):
+            return True
+        if machine.get("host") not in self._local_hosts:
+            return False
+        port = machine.get("port")
+        user = machine.get("user")
+        return (not port or str(port) == "22") and (not user or user == self._local_user)
+
+    def _resolve_machine(self, name: str) -> tuple[str, dict | None]:
+        """Uncached _parse_session_name() for a name containing "@"."""
+        session, machine_id = name.rsplit("@", 1)
+
+        # Check if machine_id is the local hostname (only when not in container)
+        if not self._in_container and (machine_id == self._local_hostname or machine_id == "local"):
+            return session, None
+
+        machine = self._machine_index.get(machine_id)
+        if machine is not None:
+            # Check if this machine is marked as local (only when not in container)
+            # In Docker, we still need to SSH to "local" machines via host.docker.internal
+            if not self._in_container and self._is_local_machine(machine):
+                logger.debug(f"Resolved {name} -> session={session}, machine is local")
                 return session, None
-
-            for machine in self.machines:
-                if machine.get("id") == machine_id or machine.get("host") == machine_id:
-                    # Check if this machine is marked as local (only when not in container)
-                    # In Docker, we still need to SSH to "local" machines via host.docker.internal
-                    if not in_container and machine.get("local"):
-                        logger.debug(f"Resolved {name} -> session={session}, machine marked as local")
-                        return session, None
-                    logger.debug(f"Resolved {name} -> session={session}, machine_id={machine_id}")
-                    return session, machine
-            logger.warning(f"Unknown machine: {machine_id} (available: {[m.get('id') for m in self.machines]}), treating as local")
-            return name, None
+            logger.debug(f"Resolved {name} -> session={session}, machine_id={machine_id}")
+            return session, machine
+        logger.warning(f"Unknown machine: {machine_id} (available: {[m.get('id') for m in self.machines]}), treating as local")
         return name, None
 
     def _format_agent_command(self, name: str, path: Path, options: dict | None = None) -> str:
@@ -197,9 +636,10 @@ class TmuxAgent(AgentBackend):
         bypass_permissions = options.get("bypass_permissions", True)
 
         cmd = self.agent_command
-        cmd = cmd.replace("{name}", name)
-        cmd = cmd.replace("{path}", str(path))
-        cmd = cmd.replace("{model}", model)
+        if self._agent_placeholders:
+            values = {"{name}": name, "{path}": str(path), "{model}": model}
+            for placeholder in self._agent_placeholders:
+                cmd = cmd.replace(placeholder, values[placeholder])
 
         # Add permission bypass flag if requested
         if bypass_permissions:
@@ -219,98 +659,129 @@ class TmuxAgent(AgentBackend):
         return cmd
 
     def create_session(self, name: str, path: Path, options: dict | None = None) -> bool:
-        """Create a new tmux session and start the agent."""
+        """Create a new tmux session and start the agent.
+
+        Session creation and starting the agent are one ";"-chained tmux
+        invocation (locally, or over a single SSH call). tmux stops the
+        chain if new-session fails.
+        """
         options = options or {}
         session_name, machine = self._parse_session_name(name)
         agent_cmd = self._format_agent_command(session_name, path, options)
 
         if machine:
             projects_dir = machine.get("projects_dir", "~/projects")
-            remote_path = f"{projects_dir}/{path.name}" if not str(path).startswith("/") else str(path)
+            session_path = f"{projects_dir}/{path.name}" if not str(path).startswith("/") else str(path)
 
             # Parse env var prefix (e.g., OPENCODE_PERMISSION='...' opencode)
-            # Must use tmux set-environment for remote sessions since shlex.quote
-            # would break the env var assignment
-            env_var, env_val, actual_cmd = parse_env_var_prefix(agent_cmd)
-
-            cmd_parts = [
-                f"tmux new-session -d -s {shlex.quote(session_name)} -c {shlex.quote(remote_path)}"
-            ]
-
-            if env_var:
-                # Set env var in tmux session environment
-                cmd_parts.append(
-                    f"tmux set-environment -t {shlex.quote(session_name)} {env_var} {shlex.quote(env_val)}"
-                )
+            # Remote sessions get it via tmux set-environment instead
+            env_var, env_val, agent_cmd = parse_env_var_prefix(agent_cmd)
+        else:
+            session_path = str(path)
+            env_var = None
 
-            # Send the actual command (without env var prefix if it was extracted)
-            cmd_parts.append(
-                f"tmux send-keys -t {shlex.quote(session_name)} {shlex.quote(actual_cmd)} Enter"
-            )
+        tmux_args = [
+            "new-session", "-d", "-s", session_name, "-c", session_path,
+            "-x", str(self.pty_cols), "-y", str(self.pty_rows), ";",
+        ]
+        if env_var:
+            # Set env var in tmux session environment
+            tmux_args += ["set-environment", "-t", session_name, env_var, _tmux_literal(env_val), ";"]
+        # Send the actual command (without env var prefix if it was extracted)
+        tmux_args += ["send-keys", "-t", session_name, _tmux_literal(agent_cmd), "Enter"]
 
-            cmd = " && ".join(cmd_parts)
-            result = self._run_remote(machine, cmd)
-        else:
-            # Create session
-            result = self._run_local([
-                "tmux", "new-session", "-d",
-                "-s", session_name,
-                "-c", str(path),
-            ])
-
-            if result.returncode != 0:
-                logger.error(f"Failed to create session: {result.stderr}")
-                return False
-
-            # Start agent
-            result = self._run_local([
-                "tmux", "send-keys",
-                "-t", session_name,
-                agent_cmd, "Enter",
-            ])
+        result = self._run_tmux(machine, tmux_args, discard=True)
+        self.invalidate_snapshot(machine)
 
         if result.returncode != 0:
-            logger.error(f"Failed to start agent: {result.stderr}")
+            logger.error(f"Failed to create session: {result.stderr}")
             return False
 
         logger.info(f"Created session '{name}' at {path}")
         return True
 
     def session_exists(self, name: str) -> bool:
-        """Check if a tmux session exists."""
+        """Check if a tmux session exists (exact name match)."""
         session_name, machine = self._parse_session_name(name)
+        return session_name in self._snapshot(machine)
 
-        if machine:
-            cmd = f"tmux has-session -t {shlex.quote(session_name)} 2>/dev/null"
-            result = self._run_remote(machine, cmd)
-        else:
-            result = self._run_local([
-                "tmux", "has-session", "-t", session_name,
-            ])
+    async def session_exists_async(self, name: str) -> bool:
+        """session_exists() for use on an event loop."""
+        session_name, machine = self._parse_session_name(name)
+        return session_name in await self._snapshot_async(machine)
 
-        return result.returncode == 0
+    def should_poll(self, name: str, now: float | None = None) -> bool:
+        """Whether a session is due for another get_output poll.
+
+        Args:
+            name: Session name
+            now: time.monotonic() value (default: current time)
+        """
+        tier = self._poll_tiers.get(name)
+        if tier is None:
+            return True
+        return (time.monotonic() if now is None else now) >= tier[2]
+
+    def mark_active(self, name: str) -> None:
+        """Poll a session at the hot rate again (input was sent to it)."""
+        self._poll_tiers.pop(name, None)
+
+    def _record_poll(self, name: str, changed: bool) -> None:
+        """Update a session's polling tier after a get_output poll."""
+        level, quiet, _ = self._poll_tiers.get(name, (0, 0, 0.0))
+        if changed:
+            level, quiet = 0, 0
+        else:
+            quiet += 1
+            demote_after = POLL_TIERS[level][1]
+            if demote_after is not None and quiet >= demote_after:
+                level, quiet = level + 1, 0
+        self._poll_tiers[name] = (level, quiet, time.monotonic() + POLL_TIERS[level][0])
 
     def get_output(self, name: str, lines: int = 50) -> str:
-        """Get recent output from a tmux session with ANSI colors."""
+        """Get recent output from a tmux session with ANSI colors.
+
+        Idle panes are served from cache: a cheap display-message checks
+        the pane's history size and last-activity time, and capture-pane
+        only runs when something was written since the last capture.
+        Sessions whose last poll saw new output (or that were just sent
+        input) skip the check, since they most likely changed again, so
+        each poll is a single tmux call / SSH round trip either way.
+        """
         session_name, machine = self._parse_session_name(name)
-
-        if machine:
-            cmd = f"tmux capture-pane -t {shlex.quote(session_name)} -p -e -S -{lines}"
-            result = self._run_remote(machine, cmd)
-        else:
-            result = self._run_local([
-                "tmux", "capture-pane",
-                "-t", session_name,
-                "-p",  # Print to stdout
-                "-e",  # Include ANSI escape sequences
-                "-S", f"-{lines}",  # Start from N lines back
-            ])
+        cache_key = (name, lines)
+
+        cached = self._output_cache.get(cache_key)
+        tier = self._poll_tiers.get(name)
+        busy = tier is None or tier[:2] == (0, 0)
+        if cached and not busy:
+            result = self._run_tmux(machine, ["display-message", "-p", "-t", session_name, PANE_STATE_FORMAT])
+            state = _parse_pane_state(result.stdout) if result.returncode == 0 else None
+            # Activity in the same second as the capture may have come after it
+            if state and state[0] == cached[0] and state[0][2] < cached[1]:
+                self._record_poll(name, changed=False)
+                return cached[2]
+
+        result = self._run_tmux(machine, [
+            "display-message", "-p", "-t", session_name, PANE_STATE_FORMAT, ";",
+            "capture-pane",
+            "-t", session_name,
+            "-p",  # Print to stdout
+            "-e",  # Include ANSI escape sequences
+            "-S", f"-{lines}",  # Start from N lines back
+        ])
 
         if result.returncode != 0:
             logger.error(f"Failed to get output: {result.stderr}")
+            self._output_cache.pop(cache_key, None)
             return ""
 
-        return result.stdout
+        state_line, _, output = result.stdout.partition("\n")
+        state = _parse_pane_state(state_line)
+        if state:
+            self._output_cache[cache_key] = (state[0], state[1], output)
+        self._record_poll(name, changed=not cached or output != cached[2])
+        return output
 
     def send_keys(self, name: str, keys: str) -> bool:
         """Send keys to a tmux session WITHOUT Enter.
@@ -319,77 +790,88 @@ class TmuxAgent(AgentBackend):
         For text input followed by Enter, use send_input instead.
         """
         session_name, machine = self._parse_session_name(name)
+        result = self._run_tmux(machine, self._send_keys_args(session_name, keys), discard=True)
+        return self._sent(name, result, "keys")
 
-        if machine:
-            cmd = f"tmux send-keys -t {shlex.quote(session_name)} -l {shlex.quote(keys)}"
-            result = self._run_remote(machine, cmd)
-        else:
-            result = self._run_local([
-                "tmux", "send-keys",
-                "-t", session_name,
-                "-l", keys,
-            ])
+    async def send_keys_async(self, name: str, keys: str) -> bool:
+        """send_keys() for use on an event loop."""
+        session_name, machine = self._parse_session_name(name)
+        result = await self._run_tmux_async(machine, self._send_keys_args(session_name, keys), discard=True)
+        return self._sent(name, result, "keys")
+
+    def _send_keys_args(self, session_name: str, keys: str) -> list[str]:
+        """tmux arguments for send_keys (typed literally, no Enter)."""
+        return ["send-keys", "-t", session_name, "-l", "--", _tmux_literal(keys)]
+
+    def _sent(self, name: str, result: subprocess.CompletedProcess, what: str) -> bool:
+        """Finish a send_keys/send_input call: reset polling, report errors."""
+        self.mark_active(name)
 
         if result.returncode != 0:
-            logger.error(f"Failed to send keys: {result.stderr}")
+            logger.error(f"Failed to send {what}: {result.stderr}")
             return False
 
         return True
 
     def send_input(self, name: str, text: str) -> bool:
-        """Send input to a tmux session (text + Enter)."""
-        import time
+        """Send input to a tmux session (text + Enter).
+
+        Text, the input_settle pause, and Enter go to tmux as one chained
+        command (run-shell blocks the chain), so this is a single process
+        locally and a single tmux call over SSH.
+        """
         session_name, machine = self._parse_session_name(name)
+        tmux_args, stdin = self._send_input_args(session_name, text)
+        result = self._run_tmux(machine, tmux_args, discard=True, input=stdin)
+        return self._sent(name, result, "input")
 
-        if machine:
-            # Use base64 encoding for safe transmission of complex text
-            import base64
-            encoded = base64.b64encode(text.encode()).decode()
-            cmd = (
-                f"echo {shlex.quote(encoded)} | base64 -d | "
-                f"xargs -0 tmux send-keys -t {shlex.quote(session_name)} -l && "
-                f"sleep 0.2 && "
-                f"tmux send-keys -t {shlex.quote(session_name)} Enter"
-            )
-            result = self._run_remote(machine, cmd)
-        else:
-            # Send text literally (no special char interpretation)
-            result = self._run_local([
-                "tmux", "send-keys",
-                "-t", session_name,
-                "-l", text,
-            ])
-            if result.returncode != 0:
-                logger.error(f"Failed to send input: {result.stderr}")
-                return False
-
-            # Small delay before Enter
-            time.sleep(0.2)
-
-            # Send Enter separately
-            result = self._run_local([
-                "tmux", "send-keys",
-                "-t", session_name,
-                "Enter",
-            ])
+    async def send_input_async(self, name: str, text: str) -> bool:
+        """send_input() for use on an event loop (the pause doesn't block it)."""
+        session_name, machine = self._parse_session_name(name)
+        tmux_args, stdin = self._send_input_args(session_name, text)
+        result = await self._run_tmux_async(machine, tmux_args, discard=True, input=stdin)
+        return self._sent(name, result, "input")
 
-        if result.returncode != 0:
-            logger.error(f"Failed to send input: {result.stderr}")
-            return False
+    def _send_input_args(self, session_name: str, text: str) -> tuple[list[str], str | None]:
+        """tmux arguments and stdin for send_input (text, input_settle pause, Enter).
 
-        return True
+        Text longer than SEND_KEYS_MAX_TEXT goes through a tmux buffer
+        loaded from stdin instead of a send-keys argument. paste-buffer -r
+        delivers the same bytes as send-keys -l (newlines unchanged).
+        """
+        stdin = None
+        if len(text) > SEND_KEYS_MAX_TEXT:
+            # One buffer per call: concurrent sends to the same session
+            # would otherwise paste each other's text
+            buffer = f"agentwire-input-{uuid.uuid4().hex}"
+            tmux_args = [
+                "load-buffer", "-b", buffer, "-", ";",
+                "paste-buffer", "-d", "-r", "-b", buffer, "-t", session_name, ";",
+            ]
+            stdin = text
+        else:
+            tmux_args = ["send-keys", "-t", session_name, "-l", "--", _tmux_literal(text), ";"]
+        if self.input_settle > 0:
+            # Delay before Enter so the agent's TUI doesn't take it as part of a paste
+            tmux_args += ["run-shell", f"sleep {self.input_settle:g}", ";"]
+        tmux_args += ["send-keys", "-t", session_name, "Enter"]
+        return tmux_args, stdin
+
+    def send_input_many(self, name: str, chunks: list[str]) -> bool:
+        """Send several text fragments as one input (text + Enter).
+
+        Joins the fragments and sends them with a single send_input call
+        rather than one tmux round trip per fragment.
+        """
+        return self.send_input(name, "".join(chunks))
 
     def kill_session(self, name: str) -> bool:
         """Terminate a tmux session."""
         session_name, machine = self._parse_session_name(name)
 
-        if machine:
-            cmd = f"tmux kill-session -t {shlex.quote(session_name)}"
-            result = self._run_remote(machine, cmd)
-        else:
-            result = self._run_local([
-                "tmux", "kill-session", "-t", session_name,
-            ])
+        result = self._run_tmux(machine, ["kill-session", "-t", session_name], discard=True)
+        self.invalidate_snapshot(machine)
+        self._forget_session(name)
 
         if result.returncode != 0:
             logger.error(f"Failed to kill session: {result.stderr}")
@@ -398,41 +880,85 @@ class TmuxAgent(AgentBackend):
         logger.info(f"Killed session '{name}'")
         return True
 
-    def list_sessions(self) -> list[str]:
-        """List all tmux sessions (from configured machines via SSH)."""
-        sessions = []
+    def close(self) -> None:
+        """Shut down the SSH master connections to configured machines.
 
-        # Check if running in Docker container (portal-only mode)
-        in_container = os.path.exists('/.dockerenv')
+        Masters otherwise linger for ControlPersist after the last call
+        (see SSH_CONTROL_OPTIONS). Hosts without a running master are
+        skipped by ssh itself without touching the network.
+        """
+        procs = []
+        for machine in self.machines:
+            try:
+                procs.append(subprocess.Popen(
+                    self._ssh_command(machine, "", control="exit"),
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    close_fds=False,
+                ))
+            except OSError as e:
+                logger.debug(f"ssh -O exit failed to start: {e}")
+        for proc in procs:
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    def _session_sources(self) -> list[tuple[dict | None, str]]:
+        """Machines to list sessions from, as (machine or None, machine ID).
+
+        Local tmux comes first, as "local" in a container (portal-only mode)
+        and as the short hostname on a host.
+        """
+        in_container = self._in_container
+        local_machine_id = "local" if in_container else self._local_hostname
+        sources: list[tuple[dict | None, str]] = [(None, local_machine_id)]
 
-        # Always query local tmux
-        # Use "local" as machine ID in container, hostname on host
-        result = self._run_local([
-            "tmux", "list-sessions", "-F", "#{session_name}",
-        ])
-        if result.returncode == 0 and result.stdout.strip():
-            if in_container:
-                local_machine_id = "local"
-            else:
-                import socket
-                local_machine_id = socket.gethostname().split('.')[0]
-            for name in result.stdout.strip().split("\n"):
-                if name:
-                    sessions.append(f"{name}@{local_machine_id}")
-
-        # Remote sessions from configured machines
+        # Skip "local" machine when running on host (prevents duplication).
+        # Other entries for this host are listed from the local snapshot.
         for machine in self.machines:
             machine_id = machine.get("id", machine.get("host", ""))
+            if in_container:
+                sources.append((machine, machine_id))
+            elif machine_id != "local":
+                sources.append((None if self._is_local_machine(machine) else machine, machine_id))
+        return sources
 
-            # Skip "local" machine when running on host (prevents duplication)
-            if not in_container and machine_id == "local":
-                continue
+    def list_sessions(self) -> list[str]:
+        """List all tmux sessions (from configured machines via SSH).
 
-            cmd = "tmux list-sessions -F '#{session_name}' 2>/dev/null"
-            result = self._run_remote(machine, cmd)
-            if result.returncode == 0 and result.stdout.strip():
-                for name in result.stdout.strip().split("\n"):
-                    if name:
-                        sessions.append(f"{name}@{machine_id}")
+        Remote machines are queried concurrently, so the call takes about
+        as long as the slowest host rather than the sum of all of them.
+        Remote queries share one multiplexed SSH connection per host (see
+        SSH_CONTROL_OPTIONS), so repeated polling doesn't re-handshake.
+        """
+        sources = self._session_sources()
+        machines = [machine for machine, _ in sources]
+        # Thread pool only pays off with more than one remote next to local
+        if len(machines) > 2:
+            snapshots = _get_remote_pool().map(self._snapshot, machines)
+        else:
+            snapshots = map(self._snapshot, machines)
+
+        # map() keeps machine order, so output order is stable
+        return [
+            f"{name}@{machine_id}"
+            for (_, machine_id), snapshot in zip(sources, snapshots)
+            for name in snapshot
+        ]
 
-        return sessions
+    async def list_sessions_async(self) -> list[str]:
+        """list_sessions() for use on an event loop.
+
+        All machines are queried concurrently as asyncio subprocesses, with
+        no thread per SSH call.
+        """
+        sources = self._session_sources()
+        snapshots = await asyncio.gather(
+            *(self._snapshot_async(machine) for machine, _ in sources)
+        )
+        return [
+            f"{name}@{machine_id}"
+            for (_, machine_id), snapshot in zip(sources, snapshots)
+            for name in snapshot
+        ]
@@ -0,0 +1,48 @@
+"""argparse classes for the agentwire CLI.
+
+Kept out of __main__ so argparse is only imported once a parser is
+actually built (`agentwire --version` answers without it).
+"""
+
+import argparse
+import functools
+import shutil
+
+
+@functools.lru_cache(maxsize=1)
+def _terminal_columns() -> int:
+    """Terminal width, queried once per process."""
+    return shutil.get_terminal_size().columns
+
+
+class HelpFormatter(argparse.HelpFormatter):
+    """HelpFormatter that doesn't re-query the terminal size.
+
+    argparse creates a formatter for every add_argument() call (to validate
+    metavars) and for every add_subparsers() without an explicit prog, and
+    each one looks up the terminal width.
+    """
+
+    def __init__(self, prog, indent_increment=2, max_help_position=24, width=None):
+        if width is None:
+            width = _terminal_columns() - 2
+        super().__init__(prog, indent_increment, max_help_position, width)
+
+
+class ArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser defaulting to HelpFormatter; subparsers inherit the class."""
+
+    def __init__(self, *args, formatter_class=HelpFormatter, **kwargs):
+        super().__init__(*args, formatter_class=formatter_class, **kwargs)
+
+
+class VersionAction(argparse.Action):
+    """--version action that runs a callback (version and system checks), then exits."""
+
+    def __init__(self, option_strings, callback, dest=argparse.SUPPRESS, default=argparse.SUPPRESS, help=None):
+        super().__init__(option_strings, dest=dest, default=default, nargs=0, help=help)
+        self.callback = callback
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        self.callback()
+        parser.exit()
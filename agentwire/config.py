@@ -4,19 +4,30 @@ AgentWire configuration management.
 Loads config from YAML file with sensible defaults and env var overrides.
 """
 
+import copy
+import functools
 import os
-from dataclasses import dataclass, field
+from dataclasses import MISSING, dataclass, field, fields, is_dataclass, replace
 from pathlib import Path
-from typing import Optional
-
-import yaml
+from typing import Callable, Optional
 
 from agentwire.project_config import detect_default_agent_type
+from agentwire.utils.file_io import read_yaml
+
+# Home directory for the default paths, looked up once at import
+_HOME = Path.home()
+
+# config path -> (st_mtime_ns, st_size, st_ino, parsed YAML); see _read_config_file
+_config_file_cache: dict[Path, tuple[int, int, int, dict]] = {}
 
 
+@functools.lru_cache(maxsize=1)
 def _get_default_agent_command() -> str:
     """Get the default agent command based on detected agent type.
 
+    Detected once per process: it searches PATH and reads config.yaml, and
+    is only needed when the config doesn't set agent.command.
+
     Returns:
         Default command string for the detected agent.
     """
@@ -30,32 +41,53 @@ def _expand_path(path: str | Path | None) -> Path | None:
     """Expand ~ and resolve path."""
     if path is None:
         return None
+    path = os.fspath(path)
+    if not (path.startswith("~") or os.path.isabs(path)):
+        # Relative paths resolve against the cwd, so can't be cached
+        return Path(path).resolve()
+    return _expand_path_str(path)
+
+
+@functools.lru_cache(maxsize=128)
+def _expand_path_str(path: str) -> Path:
+    """Cached body of _expand_path() for absolute and ~ paths.
+
+    resolve() stats every path component, and the same handful of config
+    paths are expanded for each load_config() (and each default instance).
+    """
     return Path(path).expanduser().resolve()
 
 
-@dataclass
+@dataclass(slots=True)
 class SSLConfig:
     """SSL certificate configuration."""
 
     cert: Path | None = None
     key: Path | None = None
+    # SSL is enabled if both cert and key exist; checked once, see refresh()
+    enabled: bool = field(init=False, default=False)
 
     def __post_init__(self):
         self.cert = _expand_path(self.cert)
         self.key = _expand_path(self.key)
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Re-check whether the cert and key files exist.
 
-    @property
-    def enabled(self) -> bool:
-        """SSL is enabled if both cert and key exist."""
-        return (
+        Returns:
+            The updated enabled flag.
+        """
+        self.enabled = (
             self.cert is not None
             and self.key is not None
             and self.cert.exists()
             and self.key.exists()
         )
+        return self.enabled
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerConfig:
     """WebSocket server configuration."""
 
@@ -65,7 +97,7 @@ class ServerConfig:
     activity_threshold_seconds: float = 3.0  # Time in seconds before session is considered idle
 
 
-@dataclass
+@dataclass(slots=True)
 class WorktreesConfig:
     """Git worktrees configuration for parallel sessions."""
 
@@ -74,25 +106,25 @@ class WorktreesConfig:
     auto_create_branch: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectsConfig:
     """Projects directory configuration."""
 
-    dir: Path = field(default_factory=lambda: Path.home() / "projects")
+    dir: Path = field(default_factory=lambda: _HOME / "projects")
     worktrees: WorktreesConfig = field(default_factory=WorktreesConfig)
 
     def __post_init__(self):
-        self.dir = _expand_path(self.dir) or Path.home() / "projects"
+        self.dir = _expand_path(self.dir) or _HOME / "projects"
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSConfig:
     """Text-to-speech configuration."""
 
     backend: str = "chatterbox"  # chatterbox | runpod | none
     url: str | None = None  # TTS server URL (required for chatterbox backend)
     default_voice: str = "default"
-    voices_dir: Path = field(default_factory=lambda: Path.home() / ".agentwire" / "voices")
+    voices_dir: Path = field(default_factory=lambda: _HOME / ".agentwire" / "voices")
     # Voice parameters (applies to all backends)
     exaggeration: float = 0.5
     cfg_weight: float = 0.5
@@ -102,10 +134,10 @@ class TTSConfig:
     runpod_timeout: int = 120
 
     def __post_init__(self):
-        self.voices_dir = _expand_path(self.voices_dir) or Path.home() / ".agentwire" / "voices"
+        self.voices_dir = _expand_path(self.voices_dir) or _HOME / ".agentwire" / "voices"
 
 
-@dataclass
+@dataclass(slots=True)
 class STTConfig:
     """Speech-to-text configuration.
 
@@ -116,31 +148,40 @@ class STTConfig:
     timeout: int = 30
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentConfig:
     """Agent command configuration."""
 
     command: str = field(default_factory=_get_default_agent_command)
-
-
-@dataclass
+    # Initial terminal size for portal-created sessions (until a client
+    # attaches and resizes). tmux emulates every cell of the grid, so
+    # oversized values cost CPU on every burst of output.
+    pty_cols: int = 200
+    pty_rows: int = 50
+    # Pause between typed text and Enter in send_input (seconds). TUIs
+    # like Claude Code take text + Enter arriving together as a paste and
+    # insert a newline instead of submitting; 0 sends both at once.
+    input_settle: float = 0.2
+
+
+@dataclass(slots=True)
 class MachinesConfig:
     """Remote machines registry configuration."""
 
     file: Path = field(
-        default_factory=lambda: Path.home() / ".agentwire" / "machines.json"
+        default_factory=lambda: _HOME / ".agentwire" / "machines.json"
     )
 
     def __post_init__(self):
         self.file = _expand_path(self.file) or self.file
 
 
-@dataclass
+@dataclass(slots=True)
 class UploadsConfig:
     """Uploads directory for images shared across machines."""
 
     dir: Path = field(
-        default_factory=lambda: Path.home() / ".agentwire" / "uploads"
+        default_factory=lambda: _HOME / ".agentwire" / "uploads"
     )
     max_size_mb: int = 10
     cleanup_days: int = 7
@@ -149,14 +190,14 @@ class UploadsConfig:
         self.dir = _expand_path(self.dir) or self.dir
 
 
-@dataclass
+@dataclass(slots=True)
 class PortalConfig:
     """Portal connection settings (for remote machines)."""
 
     url: str = "https://localhost:8765"  # URL to reach the portal
 
 
-@dataclass
+@dataclass(slots=True)
 class ServiceConfig:
     """Configuration for a single service location."""
 
@@ -166,7 +207,7 @@ class ServiceConfig:
     scheme: str = "http"  # http or https
 
 
-@dataclass
+@dataclass(slots=True)
 class ServicesConfig:
     """Where each service runs in the network."""
 
@@ -174,14 +215,14 @@ class ServicesConfig:
     tts: ServiceConfig = field(default_factory=lambda: ServiceConfig(port=8100, scheme="http"))
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionConfig:
     """Default session configuration."""
 
     default_role: str = "leader"  # Default role for new sessions
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailConfig:
     """Email notification configuration (Resend)."""
 
@@ -195,14 +236,14 @@ class EmailConfig:
     logo_image_url: str = ""  # AgentWire text logo
 
 
-@dataclass
+@dataclass(slots=True)
 class NotificationsConfig:
     """Notification channels configuration."""
 
     email: EmailConfig = field(default_factory=EmailConfig)
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Root configuration for AgentWire."""
 
@@ -219,17 +260,6 @@ class Config:
     notifications: NotificationsConfig = field(default_factory=NotificationsConfig)
 
 
-def _merge_dict(base: dict, override: dict) -> dict:
-    """Deep merge override into base dict."""
-    result = base.copy()
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = _merge_dict(result[key], value)
-        else:
-            result[key] = value
-    return result
-
-
 def _apply_env_overrides(data: dict) -> dict:
     """Apply environment variable overrides.
 
@@ -237,13 +267,15 @@ def _apply_env_overrides(data: dict) -> dict:
     Example: AGENTWIRE_SERVER__PORT=9000
     """
     prefix = "AGENTWIRE_"
+    prefix_len = len(prefix)
 
-    for key, value in os.environ.items():
-        if not key.startswith(prefix):
-            continue
+    # Walk the keys only: os.environ decodes every value it hands out, and
+    # only a handful of (usually zero) variables are ours
+    for key in [key for key in os.environ if key.startswith(prefix)]:
+        value = os.environ[key]
 
         # Parse key: AGENTWIRE_SERVER__PORT -> ["server", "port"]
-        parts = key[len(prefix) :].lower().split("__")
+        parts = key[prefix_len:].lower().split("__")
 
         # Navigate to the right place in the dict
         current = data
@@ -259,12 +291,18 @@ def _apply_env_overrides(data: dict) -> dict:
     return data
 
 
+# Env override spellings of booleans (compared lowercased)
+_ENV_TRUE = frozenset({"true", "yes", "1"})
+_ENV_FALSE = frozenset({"false", "no", "0"})
+
+
 def _parse_env_value(value: str) -> str | int | float | bool:
     """Parse environment variable value to appropriate type."""
     # Boolean
-    if value.lower() in ("true", "yes", "1"):
+    lowered = value.lower()
+    if lowered in _ENV_TRUE:
         return True
-    if value.lower() in ("false", "no", "0"):
+    if lowered in _ENV_FALSE:
         return False
 
     # Integer
@@ -282,128 +320,89 @@ def _parse_env_value(value: str) -> str | int | float | bool:
     return value
 
 
-def _dict_to_config(data: dict) -> Config:
-    """Convert nested dict to Config dataclass."""
-    # Server
-    server_data = data.get("server", {})
-    ssl_data = server_data.get("ssl", {})
-    ssl = SSLConfig(
-        cert=ssl_data.get("cert"),
-        key=ssl_data.get("key"),
-    )
-    server = ServerConfig(
-        host=server_data.get("host", "0.0.0.0"),
-        port=server_data.get("port", 8765),
-        ssl=ssl,
-        activity_threshold_seconds=server_data.get("activity_threshold_seconds", 3.0),
-    )
-
-    # Projects
-    projects_data = data.get("projects", {})
-    worktrees_data = projects_data.get("worktrees", {})
-    worktrees = WorktreesConfig(
-        enabled=worktrees_data.get("enabled", True),
-        suffix=worktrees_data.get("suffix", "-worktrees"),
-        auto_create_branch=worktrees_data.get("auto_create_branch", True),
-    )
-    projects = ProjectsConfig(
-        dir=projects_data.get("dir", "~/projects"),
-        worktrees=worktrees,
-    )
+@functools.lru_cache(maxsize=None)
+def _config_fields(cls: type) -> tuple[tuple[str, type | None, Callable | None], ...]:
+    """Describe the fields of a config class for _bind().
 
-    # TTS
-    tts_data = data.get("tts", {})
-    tts = TTSConfig(
-        backend=tts_data.get("backend", "chatterbox"),
-        url=tts_data.get("url"),
-        default_voice=tts_data.get("default_voice", "default"),
-        runpod_endpoint_id=tts_data.get("runpod_endpoint_id", ""),
-        runpod_api_key=tts_data.get("runpod_api_key", ""),
-        runpod_timeout=tts_data.get("runpod_timeout", 120),
-    )
+    Returns:
+        (field name, nested dataclass or None, default factory) per field.
+        The factory is only given when it isn't just the nested class
+        itself, i.e. when it customizes the defaults.
+    """
+    described = []
+    for f in fields(cls):
+        if not f.init:
+            continue  # derived in __post_init__, not read from the file
+        nested_cls = f.type if is_dataclass(f.type) else None
+        factory = None
+        if nested_cls is not None and f.default_factory not in (MISSING, nested_cls):
+            factory = f.default_factory
+        described.append((f.name, nested_cls, factory))
+    return tuple(described)
 
-    # STT
-    stt_data = data.get("stt", {})
-    stt = STTConfig(
-        url=stt_data.get("url"),
-        timeout=stt_data.get("timeout", 30),
-    )
 
-    # Agent
-    agent_data = data.get("agent", {})
-    agent = AgentConfig(
-        command=agent_data.get("command", _get_default_agent_command()),
-    )
+def _bind(cls: type, data: dict | None, default=None):
+    """Build config dataclass cls from its section of the config dict.
 
-    # Machines
-    machines_data = data.get("machines", {})
-    machines = MachinesConfig(
-        file=machines_data.get("file", "~/.agentwire/machines.json"),
-    )
+    Keys map to fields by name, nested sections to nested config classes.
+    Missing keys keep the field's default (default factories only run for
+    fields that aren't set). Unknown keys are ignored.
 
-    # Uploads
-    uploads_data = data.get("uploads", {})
-    uploads = UploadsConfig(
-        dir=uploads_data.get("dir", "~/.agentwire/uploads"),
-        max_size_mb=uploads_data.get("max_size_mb", 10),
-        cleanup_days=uploads_data.get("cleanup_days", 7),
-    )
+    Args:
+        cls: Config dataclass
+        data: Config section (None/missing = all defaults)
+        default: Instance whose values replace cls's own defaults (e.g. a
+            default_factory result like ServiceConfig(port=8100))
+    """
+    kwargs = {}
+    if data:
+        for name, nested_cls, factory in _config_fields(cls):
+            if name not in data:
+                continue
+            value = data[name]
+            if nested_cls is not None:
+                if default is not None:
+                    nested_default = getattr(default, name)
+                else:
+                    nested_default = factory() if factory else None
+                value = _bind(nested_cls, value, nested_default)
+            kwargs[name] = value
+
+    if default is not None:
+        return replace(default, **kwargs) if kwargs else default
+
+    # Fields absent from data get their dataclass defaults
+    return cls(**kwargs)
 
-    # Portal
-    portal_data = data.get("portal", {})
-    portal = PortalConfig(
-        url=portal_data.get("url", "https://localhost:8765"),
-    )
 
-    # Services (network service locations)
-    services_data = data.get("services", {})
-    portal_service_data = services_data.get("portal", {})
-    tts_service_data = services_data.get("tts", {})
-    portal_service = ServiceConfig(
-        machine=portal_service_data.get("machine"),
-        port=portal_service_data.get("port", 8765),
-        health_endpoint=portal_service_data.get("health_endpoint", "/health"),
-        scheme=portal_service_data.get("scheme", "https"),  # Portal defaults to HTTPS
-    )
-    tts_service = ServiceConfig(
-        machine=tts_service_data.get("machine"),
-        port=tts_service_data.get("port", 8100),
-        health_endpoint=tts_service_data.get("health_endpoint", "/health"),
-        scheme=tts_service_data.get("scheme", "http"),  # TTS defaults to HTTP
-    )
-    services = ServicesConfig(
-        portal=portal_service,
-        tts=tts_service,
-    )
+def _dict_to_config(data: dict) -> Config:
+    """Convert nested dict to Config dataclass."""
+    config = _bind(Config, data)
 
-    # Notifications
-    notifications_data = data.get("notifications", {})
-    email_data = notifications_data.get("email", {})
     # Support RESEND_API_KEY env var as fallback
-    email_api_key = email_data.get("api_key") or os.environ.get("RESEND_API_KEY", "")
-    email_config = EmailConfig(
-        api_key=email_api_key,
-        from_address=email_data.get("from_address", ""),
-        default_to=email_data.get("default_to", ""),
-        banner_image_url=email_data.get("banner_image_url", ""),
-        echo_image_url=email_data.get("echo_image_url", ""),
-        echo_small_url=email_data.get("echo_small_url", ""),
-        logo_image_url=email_data.get("logo_image_url", ""),
-    )
-    notifications = NotificationsConfig(email=email_config)
-
-    return Config(
-        server=server,
-        projects=projects,
-        tts=tts,
-        stt=stt,
-        agent=agent,
-        machines=machines,
-        uploads=uploads,
-        portal=portal,
-        services=services,
-        notifications=notifications,
-    )
+    email = config.notifications.email
+    if not email.api_key:
+        email.api_key = os.environ.get("RESEND_API_KEY", "")
+
+    return config
+
+
+def _read_config_file(config_path: Path) -> dict:
+    """Parse the YAML config file, reusing the last parse while it's unchanged.
+
+    Returns a fresh copy every time, since env overrides are merged into it.
+    """
+    try:
+        st = config_path.stat()
+    except OSError:
+        return {}
+
+    cached = _config_file_cache.get(config_path)
+    if cached is None or cached[:3] != (st.st_mtime_ns, st.st_size, st.st_ino):
+        file_data = read_yaml(config_path)
+        cached = (st.st_mtime_ns, st.st_size, st.st_ino, file_data)
+        _config_file_cache[config_path] = cached
+    return copy.deepcopy(cached[3])
 
 
 def load_config(config_path: Optional[Path] = None) -> Config:
@@ -421,18 +420,13 @@ def load_config(config_path: Optional[Path] = None) -> Config:
         3. Applies environment variable overrides
     """
     if config_path is None:
-        config_path = Path.home() / ".agentwire" / "config.yaml"
+        config_path = _HOME / ".agentwire" / "config.yaml"
     else:
         config_path = Path(config_path).expanduser().resolve()
 
-    # Start with empty dict (defaults come from dataclasses)
-    data: dict = {}
-
-    # Load from file if it exists
-    if config_path.exists():
-        with open(config_path) as f:
-            file_data = yaml.safe_load(f) or {}
-            data = _merge_dict(data, file_data)
+    # File values (empty if there's no file; defaults come from the
+    # dataclasses). A private copy, so overrides are applied in place.
+    data = _read_config_file(config_path)
 
     # Apply environment variable overrides
     data = _apply_env_overrides(data)
@@ -9,6 +9,7 @@ Supports both local and remote machines via SSH for distributed setups.
 """
 
 import json
+from collections.abc import Iterator
 from pathlib import Path
 
 from .utils.file_io import load_json
@@ -41,13 +42,10 @@ def resolve_session_id(prefix: str, machine: str = "local") -> str | None:
     else:
         history_path = "~/.claude/history.jsonl"
 
-    content = _read_file_content(history_path, machine)
-    if not content:
-        return None
-
     matches = set()
-    for line in content.strip().split("\n"):
-        if not line:
+    for line in _iter_file_lines(history_path, machine):
+        # Cheap substring check before paying for a JSON parse
+        if prefix not in line:
             continue
         try:
             entry = json.loads(line)
@@ -159,6 +157,36 @@ def _read_file_content(filepath: str, machine: str = "local") -> str | None:
         return output if success else None
 
 
+def _iter_file_lines(filepath: str, machine: str = "local") -> Iterator[str]:
+    """Yield non-empty lines of a file, local or remote.
+
+    Local files are streamed line by line so large JSONL files (history.jsonl
+    grows without bound) are never held in memory all at once.
+
+    Args:
+        filepath: Path to file
+        machine: Machine ID or 'local'
+
+    Yields:
+        Lines without trailing newline, skipping blank lines
+    """
+    if machine == "local":
+        try:
+            with open(filepath) as f:
+                for line in f:
+                    line = line.rstrip("\n")
+                    if line:
+                        yield line
+        except IOError:
+            return
+    else:
+        content = _read_file_content(filepath, machine)
+        if content:
+            for line in content.strip().split("\n"):
+                if line:
+                    yield line
+
+
 def _list_directory(dirpath: str, machine: str = "local") -> list[str]:
     """List files in directory, local or remote.
 
@@ -237,16 +265,13 @@ def get_history(project_path: str, machine: str = "local", limit: int = 20) -> l
         history_path = "~/.claude/history.jsonl"
         projects_base = "~/.claude/projects"
 
-    # Read history.jsonl
-    content = _read_file_content(history_path, machine)
-    if not content:
-        return []
-
-    # Parse and filter by project
+    # Stream history.jsonl, filtering by project
     sessions: dict[str, dict] = {}  # sessionId -> session data
+    project_needle = json.dumps(project_path, ensure_ascii=False)[1:-1]
 
-    for line in content.strip().split("\n"):
-        if not line:
+    for line in _iter_file_lines(history_path, machine):
+        # Cheap substring check before paying for a JSON parse
+        if project_needle not in line:
             continue
         try:
             entry = json.loads(line)
@@ -323,16 +348,13 @@ def get_session_detail(session_id: str, machine: str = "local") -> dict | None:
         history_path = "~/.claude/history.jsonl"
         projects_base = "~/.claude/projects"
 
-    content = _read_file_content(history_path, machine)
-    if not content:
-        return None
-
     # Find messages for this session
     messages = []
     project_path = None
 
-    for line in content.strip().split("\n"):
-        if not line:
+    for line in _iter_file_lines(history_path, machine):
+        # Cheap substring check before paying for a JSON parse
+        if session_id not in line:
             continue
         try:
             entry = json.loads(line)
@@ -1515,24 +1515,14 @@ Stay focused on your project directory and commit frequently.
     if config["generate_certs"]:
         print()
         print("Generating SSL certificates...")
+        from .utils.certs import generate_self_signed_cert
+
         try:
-            subprocess.run(
-                [
-                    "openssl", "req", "-x509", "-newkey", "rsa:4096",
-                    "-keyout", str(CONFIG_DIR / "key.pem"),
-                    "-out", str(CONFIG_DIR / "cert.pem"),
-                    "-days", "365", "-nodes",
-                    "-subj", "/CN=localhost",
-                ],
-                check=True,
-                capture_output=True,
-            )
+            generate_self_signed_cert(CONFIG_DIR / "cert.pem", CONFIG_DIR / "key.pem")
             print_success(f"Created {CONFIG_DIR / 'cert.pem'}")
             print_success(f"Created {CONFIG_DIR / 'key.pem'}")
-        except subprocess.CalledProcessError as e:
-            print_error(f"Failed to generate certificates: {e.stderr.decode() if e.stderr else 'unknown error'}")
-        except FileNotFoundError:
-            print_error("openssl not found. Install OpenSSL to generate certificates.")
+        except RuntimeError as e:
+            print_error(f"Failed to generate certificates: {e}")
 
     # ─────────────────────────────────────────────────────────────
     # Summary
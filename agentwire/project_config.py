@@ -10,7 +10,7 @@ from enum import Enum
 from pathlib import Path
 from typing import Any, Optional
 
-import yaml
+from agentwire.utils.file_io import read_yaml
 
 
 class SessionType(str, Enum):
@@ -64,17 +64,16 @@ def detect_default_agent_type() -> str:
 
     # Check config first
     config_path = Path.home() / ".agentwire" / "config.yaml"
-    if config_path.exists():
-        try:
-            with open(config_path) as f:
-                config = yaml.safe_load(f) or {}
-                agent_command = config.get("agent", {}).get("command", "")
-                if "claude" in agent_command:
-                    return "claude"
-                elif "opencode" in agent_command:
-                    return "opencode"
-        except Exception:
-            pass
+    try:
+        config = read_yaml(config_path)
+        agent_command = config.get("agent", {}).get("command", "")
+        if "claude" in agent_command:
+            return "claude"
+        elif "opencode" in agent_command:
+            return "opencode"
+    except Exception:
+        # Includes a missing file
+        pass
 
     # Detect from PATH
     if shutil.which("claude"):
@@ -221,14 +220,14 @@ def load_project_config(path: Optional[Path] = None) -> Optional[ProjectConfig]:
     else:
         config_path = path
 
-    if config_path is None or not config_path.exists():
+    if config_path is None:
         return None
 
     try:
-        with open(config_path) as f:
-            data = yaml.safe_load(f) or {}
+        data = read_yaml(config_path)
         return ProjectConfig.from_dict(data)
     except Exception:
+        # Includes a missing file
         return None
 
 
@@ -246,6 +245,7 @@ def save_project_config(config: ProjectConfig, project_dir: Path) -> bool:
     config_file = project_dir / ".agentwire.yml"
 
     try:
+        import yaml
         with open(config_file, "w") as f:
             yaml.safe_dump(config.to_dict(), f, default_flow_style=False, sort_keys=False)
         return True
@@ -221,6 +221,9 @@ class AgentWireServer:
             },
             "agent": {
                 "command": self.config.agent.command,
+                "pty_cols": self.config.agent.pty_cols,
+                "pty_rows": self.config.agent.pty_rows,
+                "input_settle": self.config.agent.input_settle,
             },
             "machines": {
                 "file": str(self.config.machines.file),
@@ -253,6 +256,7 @@ class AgentWireServer:
         """Clean up backend resources."""
         if self._http_session:
             await self._http_session.close()
+        await asyncio.to_thread(self.agent.close)
 
     async def _tts_generate(
         self,
@@ -429,6 +433,8 @@ class AgentWireServer:
         import socket
 
         import yaml
+
+        from .utils.file_io import read_yaml, yaml_loader
         local_hostname = socket.gethostname().split('.')[0]
 
         is_local = machine_id is None or machine_id == "local" or machine_id == local_hostname
@@ -437,8 +443,7 @@ class AgentWireServer:
             yaml_path = Path(cwd) / ".agentwire.yml"
             if yaml_path.exists():
                 try:
-                    with open(yaml_path) as f:
-                        return yaml.safe_load(f) or {}
+                    return read_yaml(yaml_path)
                 except Exception:
                     pass
             return None
@@ -461,7 +466,7 @@ class AgentWireServer:
                     timeout=5,
                 )
                 if result.returncode == 0 and result.stdout.strip():
-                    return yaml.safe_load(result.stdout) or {}
+                    return yaml.load(result.stdout, Loader=yaml_loader()) or {}
             except (subprocess.TimeoutExpired, Exception):
                 pass
             return None
@@ -698,9 +703,9 @@ class AgentWireServer:
                 s["client_count"] = self.session_client_counts.get(name, 0)
 
             # Clean up stale state for sessions that no longer exist
-            stale = [k for k in self.session_client_counts if k not in session_names]
-            for k in stale:
-                del self.session_client_counts[k]
+            self.session_client_counts = {
+                k: v for k, v in self.session_client_counts.items() if k in session_names
+            }
 
             return sessions
         except Exception as e:
@@ -1346,6 +1351,12 @@ class AgentWireServer:
     async def _poll_output(self, session: Session):
         """Poll agent output and broadcast to session clients."""
         while session.clients:
+            # Idle sessions are polled less often (see AgentBackend.should_poll),
+            # but active -> idle transitions are still reported on time
+            if not self.agent.should_poll(session.name):
+                await self._update_activity_status(session)
+                await asyncio.sleep(0.5)
+                continue
             try:
                 # Run sync get_output in thread pool to avoid blocking
                 output = await asyncio.get_event_loop().run_in_executor(
@@ -1419,24 +1430,28 @@ class AgentWireServer:
                     await self._broadcast(session, {"type": "question_answered"})
 
                 # Check for activity status transitions
-                current_status = self._get_session_activity_status(session)
-                new_is_active = current_status == "active"
-
-                # Broadcast transition event if state changed
-                if new_is_active != session.is_active:
-                    session.is_active = new_is_active
-                    await self._broadcast(session, {
-                        "type": "session_activity",
-                        "session": session.name,
-                        "active": new_is_active
-                    })
-                    logger.info(f"[{session.name}] Activity transition: {'active' if new_is_active else 'idle'}")
+                await self._update_activity_status(session)
 
             except Exception as e:
                 logger.debug(f"Output poll error for {session.name}: {e}")
 
             await asyncio.sleep(0.5)
 
+    async def _update_activity_status(self, session: Session):
+        """Broadcast a session_activity event if the session went active/idle."""
+        current_status = self._get_session_activity_status(session)
+        new_is_active = current_status == "active"
+
+        # Broadcast transition event if state changed
+        if new_is_active != session.is_active:
+            session.is_active = new_is_active
+            await self._broadcast(session, {
+                "type": "session_activity",
+                "session": session.name,
+                "active": new_is_active
+            })
+            logger.info(f"[{session.name}] Activity transition: {'active' if new_is_active else 'idle'}")
+
     async def _broadcast(self, session: Session, message: dict):
         """Broadcast message to all session clients."""
         dead_clients = set()
@@ -1821,7 +1836,7 @@ class AgentWireServer:
             status = await self._check_machine_status(machine_config)
 
             # Count sessions for this machine
-            sessions = self.agent.list_sessions()
+            sessions = await self.agent.list_sessions_async()
             session_count = 0
             for name in sessions:
                 _, _, session_machine = parse_session_name(name)
@@ -2361,8 +2376,8 @@ class AgentWireServer:
                 json.dump({"machines": machines}, f, indent=2)
 
             # Reload agent backend to pick up new machines
-            if self.agent and hasattr(self.agent, '_load_machines'):
-                self.agent._load_machines()
+            if self.agent and hasattr(self.agent, 'reload_machines'):
+                self.agent.reload_machines()
 
             return web.json_response({"success": True, "machine": new_machine})
         except Exception as e:
@@ -2405,8 +2420,8 @@ class AgentWireServer:
             # No sessions.json to clean up - config is now in .agentwire.yml per project
 
             # Reload agent backend to pick up changes
-            if self.agent and hasattr(self.agent, '_load_machines'):
-                self.agent._load_machines()
+            if self.agent and hasattr(self.agent, 'reload_machines'):
+                self.agent.reload_machines()
 
             return web.json_response({
                 "success": True,
@@ -2661,6 +2676,8 @@ projects:
             if not success:
                 error_msg = result.get("error", "Failed to send to session")
                 return web.json_response({"error": error_msg})
+            # Sent by another process, so the backend didn't see it
+            self.agent.mark_active(name)
 
             return web.json_response({"success": True})
 
@@ -2910,15 +2927,15 @@ projects:
             # 3. Direct custom: just send text + Enter (free-form input without numbered option)
             if option_number:
                 # "Type something" flow: select option first (no Enter), then type
-                self.agent.send_keys(name, str(option_number))
+                await self.agent.send_keys_async(name, str(option_number))
                 await asyncio.sleep(0.5)  # Wait for Claude to show text input
-                success = self.agent.send_input(name, answer)  # text + Enter
+                success = await self.agent.send_input_async(name, answer)  # text + Enter
             elif is_custom:
                 # Direct custom answer: type the text and press Enter
-                success = self.agent.send_input(name, answer)
+                success = await self.agent.send_input_async(name, answer)
             else:
                 # Just send the number key - AskUserQuestion responds to single keypress
-                success = self.agent.send_keys(name, str(answer))
+                success = await self.agent.send_keys_async(name, str(answer))
 
             if not success:
                 return web.json_response({"error": "Failed to send answer"}, status=500)
@@ -2984,6 +3001,7 @@ projects:
                                 ["agentwire", "send-keys", "-s", session_target, "1"],
                                 check=True, capture_output=True
                             )
+                            self.agent.mark_active(name)
                         except Exception as e:
                             logger.error(f"[{name}] Failed to send allow keystroke: {e}")
                     return web.json_response({"decision": "allow_always"})
@@ -2997,6 +3015,7 @@ projects:
                             ["agentwire", "send-keys", "-s", session_target, "Escape"],
                             check=True, capture_output=True
                         )
+                        self.agent.mark_active(name)
                     except Exception as e:
                         logger.error(f"[{name}] Failed to send deny keystroke: {e}")
                     return web.json_response({
@@ -3084,6 +3103,7 @@ projects:
                             ["agentwire", "send-keys", "-s", name, "3", custom_message, "Enter"],
                             check=True, capture_output=True
                         )
+                        self.agent.mark_active(name)
                         logger.info(f"[{name}] Sent custom feedback: {custom_message[:50]}...")
                 else:
                     # Map decision to keystroke: allow=1, allow_always=2, deny=Escape
@@ -3097,6 +3117,7 @@ projects:
                         ["agentwire", "send-keys", "-s", name, keystroke],
                         check=True, capture_output=True
                     )
+                    self.agent.mark_active(name)
                     logger.info(f"[{name}] Sent keystroke '{keystroke}' to session")
             except Exception as e:
                 logger.error(f"[{name}] Failed to send keystroke: {e}")
@@ -3266,7 +3287,7 @@ projects:
                 candidate = f"{project}-fork-{fork_num}"
                 if machine:
                     candidate = f"{candidate}@{machine}"
-                if not self.agent.session_exists(candidate):
+                if not await self.agent.session_exists_async(candidate):
                     break
                 fork_num += 1
 
@@ -3378,12 +3399,12 @@ projects:
 
             elif base_name == main_session:
                 # Restart the agentwire session - kill Claude and restart it
-                self.agent.send_keys(name, "/exit")
+                await self.agent.send_keys_async(name, "/exit")
                 await asyncio.sleep(1)
 
                 # Send the agent command to restart Claude
                 agent_cmd = self.agent.agent_command
-                self.agent.send_input(name, agent_cmd)
+                await self.agent.send_input_async(name, agent_cmd)
 
                 return web.json_response({
                     "success": True,
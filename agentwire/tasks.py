@@ -11,6 +11,8 @@ from typing import Any
 
 import yaml
 
+from agentwire.utils.file_io import read_yaml
+
 
 class TaskError(Exception):
     """Base exception for task-related errors."""
@@ -204,8 +206,7 @@ def load_task(project_path: Path, task_name: str) -> TaskConfig:
         raise TaskNotFound(f"No .agentwire.yml found in {project_path}")
 
     try:
-        with open(config_file) as f:
-            config = yaml.safe_load(f) or {}
+        config = read_yaml(config_file)
     except yaml.YAMLError as e:
         raise TaskValidationError(f"Invalid YAML in .agentwire.yml: {e}")
 
@@ -238,8 +239,7 @@ def list_tasks(project_path: Path) -> list[dict[str, Any]]:
         return []
 
     try:
-        with open(config_file) as f:
-            config = yaml.safe_load(f) or {}
+        config = read_yaml(config_file)
     except yaml.YAMLError:
         return []
 
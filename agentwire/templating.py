@@ -11,6 +11,11 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 
+# {{ var_name }} with optional whitespace
+_VAR_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+# ${VAR_NAME}
+_ENV_RE = re.compile(r"\$\{(\w+)\}")
+
 
 class TemplateError(Exception):
     """Raised when template expansion fails."""
@@ -58,13 +63,12 @@ class TemplateContext:
             Variable value as string, or None if not found
         """
         # Built-in date/time variables (computed on access)
-        now = datetime.now()
         if key == "date":
-            return now.strftime("%Y-%m-%d")
+            return datetime.now().strftime("%Y-%m-%d")
         if key == "time":
-            return now.strftime("%H:%M:%S")
+            return datetime.now().strftime("%H:%M:%S")
         if key == "datetime":
-            return now.isoformat()
+            return datetime.now().isoformat()
 
         # Dataclass attributes
         if hasattr(self, key) and key != "pre_outputs":
@@ -100,9 +104,6 @@ def expand_template(text: str, ctx: TemplateContext) -> str:
     Raises:
         TemplateError: If a {{ var }} variable is undefined
     """
-    # Pattern: {{ var_name }} with optional whitespace
-    pattern = r"\{\{\s*(\w+)\s*\}\}"
-
     def replace(match: re.Match) -> str:
         var_name = match.group(1)
         value = ctx.get(var_name)
@@ -110,7 +111,7 @@ def expand_template(text: str, ctx: TemplateContext) -> str:
             raise TemplateError(f"Undefined variable: {{{{{var_name}}}}}")
         return value
 
-    return re.sub(pattern, replace, text)
+    return _VAR_RE.sub(replace, text)
 
 
 def expand_env_vars(text: str) -> str:
@@ -125,9 +126,6 @@ def expand_env_vars(text: str) -> str:
     Returns:
         Expanded string
     """
-    # Pattern: ${VAR_NAME}
-    pattern = r"\$\{(\w+)\}"
-
     def replace(match: re.Match) -> str:
         var_name = match.group(1)
         value = os.environ.get(var_name)
@@ -136,7 +134,7 @@ def expand_env_vars(text: str) -> str:
         # Pass through undefined - shell will handle
         return match.group(0)
 
-    return re.sub(pattern, replace, text)
+    return _ENV_RE.sub(replace, text)
 
 
 def expand_all(text: str, ctx: TemplateContext) -> str:
@@ -179,9 +177,6 @@ def preview_template(text: str, ctx: TemplateContext | None = None) -> str:
     if ctx is None:
         ctx = TemplateContext()
 
-    # Pattern: {{ var_name }} with optional whitespace
-    pattern = r"\{\{\s*(\w+)\s*\}\}"
-
     def replace(match: re.Match) -> str:
         var_name = match.group(1)
         value = ctx.get(var_name)
@@ -190,7 +185,7 @@ def preview_template(text: str, ctx: TemplateContext | None = None) -> str:
         # Show placeholder for undefined (likely pre-command output)
         return f"<pre:{var_name}>"
 
-    text = re.sub(pattern, replace, text)
+    text = _VAR_RE.sub(replace, text)
     # Also expand known env vars
     text = expand_env_vars(text)
     return text
@@ -3,11 +3,20 @@ AgentWire utility modules.
 
 Provides shared functionality across the codebase:
 - subprocess: Command execution with consistent error handling
+- certs: Self-signed TLS certificate generation
 - file_io: JSON/YAML loading and saving with error context
 - paths: Centralized path management for ~/.agentwire/
 """
 
-from agentwire.utils.file_io import load_json, load_yaml, save_json, save_yaml
+from agentwire.utils.certs import generate_self_signed_cert
+from agentwire.utils.file_io import (
+    load_json,
+    load_yaml,
+    read_yaml,
+    save_json,
+    save_yaml,
+    yaml_loader,
+)
 from agentwire.utils.paths import (
     agentwire_dir,
     config_path,
@@ -26,7 +35,11 @@ __all__ = [
     "load_json",
     "save_json",
     "load_yaml",
+    "read_yaml",
     "save_yaml",
+    "yaml_loader",
+    # certs
+    "generate_self_signed_cert",
     # paths
     "agentwire_dir",
     "config_path",
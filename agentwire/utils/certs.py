@@ -0,0 +1,116 @@
+"""
+Self-signed TLS certificate generation for the portal.
+
+Generates the certificate in-process with the `cryptography` package when
+it is installed (no fork/exec, works without the openssl CLI), and falls
+back to `openssl req` otherwise.
+
+Keys are ECDSA P-256 by default: generated in milliseconds and accepted by
+all browsers. RSA-2048 is available for clients that require RSA.
+"""
+
+import datetime
+import os
+import subprocess
+from pathlib import Path
+
+
+def generate_self_signed_cert(
+    cert_path: Path | str,
+    key_path: Path | str,
+    common_name: str = "localhost",
+    days: int = 365,
+    key_type: str = "ec",
+) -> None:
+    """Write a self-signed certificate and its unencrypted private key (PEM).
+
+    Args:
+        cert_path: Where to write the certificate.
+        key_path: Where to write the private key (created with mode 0600).
+        common_name: Certificate subject CN.
+        days: Validity period.
+        key_type: "ec" (ECDSA P-256) or "rsa" (RSA-2048).
+
+    Raises:
+        ValueError: If key_type is not "ec" or "rsa".
+        RuntimeError: If generation fails or no backend is available.
+
+    Example:
+        generate_self_signed_cert(Path("~/.agentwire/cert.pem").expanduser(),
+                                  Path("~/.agentwire/key.pem").expanduser())
+    """
+    if key_type not in ("ec", "rsa"):
+        raise ValueError(f"Unsupported key type: {key_type!r}")
+    cert_path = Path(cert_path)
+    key_path = Path(key_path)
+
+    try:
+        import cryptography  # noqa: F401
+    except ImportError:
+        _generate_with_openssl(cert_path, key_path, common_name, days, key_type)
+    else:
+        _generate_with_cryptography(cert_path, key_path, common_name, days, key_type)
+
+
+def _generate_with_cryptography(
+    cert_path: Path, key_path: Path, common_name: str, days: int, key_type: str
+) -> None:
+    """Generate the key and certificate in-process."""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+    from cryptography.x509.oid import NameOID
+
+    if key_type == "ec":
+        key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=days))
+        .sign(key, hashes.SHA256())
+    )
+
+    key_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with open(fd, "wb") as f:
+        f.write(key_pem)
+    cert_path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
+
+
+def _generate_with_openssl(
+    cert_path: Path, key_path: Path, common_name: str, days: int, key_type: str
+) -> None:
+    """Generate the key and certificate with the openssl CLI."""
+    if key_type == "ec":
+        newkey = ["-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:prime256v1"]
+    else:
+        newkey = ["-newkey", "rsa:2048"]
+    try:
+        subprocess.run(
+            [
+                "openssl", "req", "-x509", *newkey,
+                "-keyout", str(key_path),
+                "-out", str(cert_path),
+                "-days", str(days), "-nodes",
+                "-subj", f"/CN={common_name}",
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(e.stderr.strip() or "openssl failed") from e
+    except FileNotFoundError as e:
+        raise RuntimeError("openssl not found. Please install OpenSSL.") from e
@@ -13,8 +13,6 @@ import tempfile
 from pathlib import Path
 from typing import Optional
 
-import yaml
-
 
 def load_json(path: Path | str, default: Optional[dict] = None) -> dict:
     """Load JSON file with optional default for missing files.
@@ -64,6 +62,10 @@ def save_json(
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
 
+    # Serialize up front: json.dumps uses the C encoder in one shot, while
+    # json.dump streams many small chunks through the file object.
+    payload = json.dumps(data, indent=indent)
+
     if atomic:
         # Write to temp file then atomic rename
         fd, temp_path = tempfile.mkstemp(
@@ -72,7 +74,7 @@ def save_json(
         )
         try:
             with open(fd, "w") as f:
-                json.dump(data, f, indent=indent)
+                f.write(payload)
             shutil.move(temp_path, path)
         except Exception:
             # Clean up temp file on error
@@ -80,7 +82,7 @@ def save_json(
             raise
     else:
         with open(path, "w") as f:
-            json.dump(data, f, indent=indent)
+            f.write(payload)
 
 
 def load_yaml(path: Path | str, default: Optional[dict] = None) -> dict:
@@ -107,8 +109,43 @@ def load_yaml(path: Path | str, default: Optional[dict] = None) -> dict:
             return default
         raise FileNotFoundError(f"YAML file not found: {path}")
 
-    with open(path, "r") as f:
-        return yaml.safe_load(f) or {}
+    return read_yaml(path)
+
+
+def yaml_loader() -> type:
+    """PyYAML's safe loader: libyaml's CSafeLoader when PyYAML was built with it.
+
+    Example:
+        data = yaml.load(text, Loader=yaml_loader())
+    """
+    import yaml
+
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def read_yaml(path: Path | str) -> dict:
+    """Parse a YAML file ({} if empty), with libyaml's C loader when available.
+
+    Opens the file directly (no exists() check first) and in binary mode,
+    so libyaml decodes the bytes itself.
+
+    Args:
+        path: Path to YAML file.
+
+    Returns:
+        Parsed YAML as dict.
+
+    Raises:
+        OSError: If the file can't be opened (e.g. FileNotFoundError).
+        yaml.YAMLError: If file contains invalid YAML.
+
+    Example:
+        data = read_yaml(project_path / ".agentwire.yml")
+    """
+    import yaml
+
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=yaml_loader()) or {}
 
 
 def save_yaml(
@@ -126,6 +163,8 @@ def save_yaml(
     Example:
         save_yaml(config_path, {"server": {"port": 8765}})
     """
+    import yaml
+
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
 